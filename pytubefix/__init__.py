@@ -9,16 +9,58 @@ __license__ = "MIT License"
 __js__ = None
 __js_url__ = None
 
+import importlib
+from typing import TYPE_CHECKING
+
 from pytubefix.version import __version__
-from pytubefix.streams import Stream
-from pytubefix.captions import Caption
-from pytubefix.chapters import Chapter
-from pytubefix.keymoments import KeyMoment
-from pytubefix.query import CaptionQuery, StreamQuery
-from pytubefix.__main__ import YouTube
-from pytubefix.async_youtube import AsyncYouTube
-from pytubefix.contrib.playlist import Playlist
-from pytubefix.contrib.channel import Channel
-from pytubefix.contrib.search import Search
+# Imported eagerly, as a lazy import would let the pytubefix.info submodule
+# shadow the function once it is imported
 from pytubefix.info import info
-from pytubefix.buffer import Buffer
+
+# The public classes are imported on first access, so that ``import pytubefix``
+# doesn't load aiohttp, the SABR modules or the js interpreter until they are used.
+_lazy_imports = {
+    'Stream': 'pytubefix.streams',
+    'Caption': 'pytubefix.captions',
+    'Chapter': 'pytubefix.chapters',
+    'KeyMoment': 'pytubefix.keymoments',
+    'CaptionQuery': 'pytubefix.query',
+    'StreamQuery': 'pytubefix.query',
+    'YouTube': 'pytubefix.__main__',
+    'BatchFetcher': 'pytubefix.batch',
+    'BatchResult': 'pytubefix.batch',
+    'AsyncYouTube': 'pytubefix.async_youtube',
+    'Playlist': 'pytubefix.contrib.playlist',
+    'Channel': 'pytubefix.contrib.channel',
+    'Search': 'pytubefix.contrib.search',
+    'Buffer': 'pytubefix.buffer',
+}
+
+__all__ = ['__version__', 'info', *_lazy_imports]
+
+if TYPE_CHECKING:
+    from pytubefix.streams import Stream
+    from pytubefix.captions import Caption
+    from pytubefix.chapters import Chapter
+    from pytubefix.keymoments import KeyMoment
+    from pytubefix.query import CaptionQuery, StreamQuery
+    from pytubefix.__main__ import YouTube
+    from pytubefix.batch import BatchFetcher, BatchResult
+    from pytubefix.async_youtube import AsyncYouTube
+    from pytubefix.contrib.playlist import Playlist
+    from pytubefix.contrib.channel import Channel
+    from pytubefix.contrib.search import Search
+    from pytubefix.buffer import Buffer
+
+
+def __getattr__(name: str):
+    module_name = _lazy_imports.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_lazy_imports))
@@ -31,21 +31,48 @@ smaller peripheral modules and functions.
 """
 
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import partial
 from subprocess import CalledProcessError
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import pytubefix
 import pytubefix.exceptions as exceptions
 from pytubefix import extract, request
 from pytubefix import Stream, StreamQuery
+from pytubefix.cipher import get_cipher
 from pytubefix.helpers import install_proxy
 from pytubefix.innertube import InnerTube
 from pytubefix.metadata import YouTubeMetadata
 from pytubefix.monostate import Monostate
+from pytubefix.profiler import client_profiler
 from pytubefix.botGuard import bot_guard
+from pytubefix.visitor_pool import is_rejected, visitor_data_pool
+
+if TYPE_CHECKING:
+    from pytubefix.batch import BatchFetcher
 
 logger = logging.getLogger(__name__)
 
+# Keys of the raw responses still used once the video is loaded, the rest is
+# dropped in lean mode
+_lean_vid_info_keys = ('playabilityStatus', 'streamingData', 'videoDetails', 'microformat', 'playerConfig')
+_lean_vid_details_keys = ('contents', 'engagementPanels')
+_lean_initial_data_keys = ('contents', 'playerOverlays', 'frameworkUpdates', 'responseContext')
+
+
+def _pick(data: Dict, keys: Iterable[str]) -> Dict:
+    """Return a copy of a dict with only the given keys.
+
+    :param dict data:
+        The dict to copy.
+    :param Iterable[str] keys:
+        The keys to keep, when present.
+    :rtype: dict
+    """
+    return {key: data[key] for key in keys if key in data}
+
 
 class YouTube:
     """Core developer interface for pytubefix."""
@@ -53,7 +80,7 @@ class YouTube:
     def __init__(
             self,
             url: str,
-            client: str = InnerTube().client_name,
+            client: Optional[str] = None,
             on_progress_callback: Optional[Callable[[Any, bytes, int], None]] = None,
             on_complete_callback: Optional[Callable[[Any, Optional[str]], None]] = None,
             proxies: Optional[Dict[str, str]] = None,
@@ -63,13 +90,19 @@ class YouTube:
             oauth_verifier: Optional[Callable[[str, str], None]] = None,
             use_po_token: Optional[bool] = False,
             po_token_verifier: Optional[Callable[[None], Tuple[str, str]]] = None,
+            use_visitor_data_pool: bool = True,
+            race_clients: Optional[List[str]] = None,
+            lean: bool = False,
+            persist_client_profile: bool = False,
+            use_cache: bool = True,
     ):
         """Construct a :class:`YouTube <YouTube>`.
 
         :param str url:
             A valid YouTube watch URL.
         :param str client:
-            (Optional) A YouTube client,
+            (Optional) A YouTube client, by default the cheapest client that
+            currently works is chosen by the client profiler.
             Available:
                 WEB, WEB_EMBED, WEB_MUSIC, WEB_CREATOR, WEB_SAFARI,
                 ANDROID, ANDROID_MUSIC, ANDROID_CREATOR, ANDROID_VR, ANDROID_PRODUCER, ANDROID_TESTSUITE,
@@ -96,6 +129,24 @@ class YouTube:
             (optional) Verifier to be used for getting oauth tokens.
             Verification URL and User-Code will be passed to it respectively.
             (if passed, else default verifier will be used)
+        :param bool use_visitor_data_pool:
+            (Optional) Once the shared pool is full, reuse the visitorData
+            obtained for other videos instead of requesting a new one.
+            Defaults to True.
+        :param List[str] race_clients:
+            (Optional) Clients to race against the main client. The player request
+            is sent with all of them at the same time and the first response with
+            streams is used, instead of trying the fallback clients one after another.
+        :param bool lean:
+            (Optional) Keep only what is extracted from the watch html, the js player and
+            the innertube responses, instead of the raw content. Useful when iterating over
+            thousands of videos, accessing the raw content fetches it again.
+        :param bool persist_client_profile:
+            (Optional) Load the statistics of the client profiler saved by previous runs,
+            and save them when the interpreter exits, in the pytubefix/__cache__ directory.
+        :param bool use_cache:
+            (Optional) Reuse the innertube responses of identical requests made recently,
+            see :mod:`pytubefix.response_cache`. Defaults to True.
         """
         # js fetched by js_url
         self._js: Optional[str] = None
@@ -111,11 +162,19 @@ class YouTube:
         self._watch_html: Optional[str] = None
         self._embed_html: Optional[str] = None
 
+        # objects embedded in the watch html, parsed on first access
+        self._page_objects: Optional[extract.PageObjects] = None
+
+        # In lean mode the raw content is dropped once extracted
+        self.lean = lean
+        self._watch_page_extracted = False
+
         # inline js in the html containing
         self._player_config_args: Optional[Dict] = None
         self._age_restricted: Optional[bool] = None
 
         self._fmt_streams: Optional[List[Stream]] = None
+        self._stream_query: Optional[StreamQuery] = None
 
         self._initial_data = None
         self._metadata: Optional[YouTubeMetadata] = None
@@ -126,15 +185,20 @@ class YouTube:
         self.watch_url = f"https://youtube.com/watch?v={self.video_id}"
         self.embed_url = f"https://www.youtube.com/embed/{self.video_id}"
 
-        self.client = client
+        if persist_client_profile:
+            client_profiler.persist()
+        self.client = client or client_profiler.choose()
 
         # oauth can only be used by the TV and TV_EMBED client.
         self.client = 'TV' if use_oauth else self.client
 
         self.fallback_clients = ['TV', 'IOS']
+        self.race_clients = race_clients
 
         self._signature_timestamp: dict = {}
         self._visitor_data = None
+        self.use_visitor_data_pool = use_visitor_data_pool
+        self.use_cache = use_cache
 
         # Shared between all instances of `Stream` (Borg pattern).
         self.stream_monostate = Monostate(
@@ -177,19 +241,73 @@ class YouTube:
     def watch_html(self):
         if self._watch_html:
             return self._watch_html
-        self._watch_html = request.get(url=self.watch_url)
+        html = request.get(url=self.watch_url)
+        if self.lean:
+            if not self._watch_page_extracted:
+                self._extract_watch_page(html)
+            return html
+        self._watch_html = html
         return self._watch_html
 
+    def _extract_watch_page(self, html: str) -> None:
+        """Extract everything used from the watch html, so that it doesn't have to be kept.
+
+        :param str html:
+            The html contents of the watch page.
+        """
+        page_objects = extract.PageObjects(html)
+        self._age_restricted = extract.is_age_restricted(html)
+        self._publish_date = self._publish_date or extract.publish_date(html)
+        if not self._js_url and not self._age_restricted:
+            try:
+                self._js_url = page_objects.js_url
+            except pytubefix.exceptions.RegexMatchError:
+                pass
+        if not self._initial_data:
+            try:
+                self._initial_data = _pick(page_objects.initial_data, _lean_initial_data_keys)
+            except pytubefix.exceptions.RegexMatchError:
+                pass
+        # Only the extracted objects are kept, not the html
+        extracted = {'js_url': self._js_url, 'initial_data': self._initial_data}
+        self._page_objects = extract.PageObjects.from_objects(
+            **{name: value for name, value in extracted.items() if value}
+        )
+        self._watch_page_extracted = True
+
+    @property
+    def page_objects(self) -> extract.PageObjects:
+        """The javascript objects embedded in the watch html.
+
+        The page is scanned once and every object is parsed on first access.
+
+        :rtype: :class:`PageObjects <pytubefix.extract.PageObjects>`
+        """
+        if self._page_objects:
+            return self._page_objects
+        if self.lean:
+            # Only holds what was extracted from the watch html
+            self.watch_html
+            return self._page_objects
+        self._page_objects = extract.PageObjects(self.watch_html)
+        return self._page_objects
+
     @property
     def embed_html(self):
         if self._embed_html:
             return self._embed_html
-        self._embed_html = request.get(url=self.embed_url)
+        html = request.get(url=self.embed_url)
+        if self.lean:
+            return html
+        self._embed_html = html
         return self._embed_html
 
     @property
     def age_restricted(self):
-        if self._age_restricted:
+        if self._age_restricted is not None:
+            return self._age_restricted
+        if self.lean:
+            self.watch_html
             return self._age_restricted
         self._age_restricted = extract.is_age_restricted(self.watch_html)
         return self._age_restricted
@@ -201,8 +319,8 @@ class YouTube:
 
         if self.age_restricted:
             self._js_url = extract.js_url(self.embed_html)
-        else:
-            self._js_url = extract.js_url(self.watch_html)
+        elif not self._js_url:
+            self._js_url = self.page_objects.js_url
 
         return self._js_url
 
@@ -214,13 +332,17 @@ class YouTube:
         # If the js_url doesn't match the cached url, fetch the new js and update
         #  the cache; otherwise, load the cache.
         if pytubefix.__js_url__ != self.js_url:
-            self._js = request.get(self.js_url)
-            pytubefix.__js__ = self._js
+            js = request.get(self.js_url)
+            pytubefix.__js__ = js
             pytubefix.__js_url__ = self.js_url
         else:
-            self._js = pytubefix.__js__
+            js = pytubefix.__js__
 
-        return self._js
+        # In lean mode only the module keeps the js, so that videos don't hold on
+        #  to a player that was replaced
+        if not self.lean:
+            self._js = js
+        return js
 
     @property
     def visitor_data(self) -> str:
@@ -230,25 +352,38 @@ class YouTube:
         if self._visitor_data:
             return self._visitor_data
 
+        if self.use_visitor_data_pool and visitor_data_pool.is_full():
+            self._visitor_data = visitor_data_pool.get()
+            if self._visitor_data:
+                logger.debug('VisitorData obtained from the pool')
+                return self._visitor_data
+
+        self._visitor_data = self._fetch_visitor_data()
+        logger.debug('VisitorData obtained successfully')
+
+        if self.use_visitor_data_pool:
+            visitor_data_pool.put(self._visitor_data)
+        return self._visitor_data
+
+    def _fetch_visitor_data(self) -> str:
+        """Request a new visitorData from YouTube.
+
+        :rtype: str
+        """
         if InnerTube(self.client).require_po_token:
             try:
                 logger.debug("Looking for visitorData in initial_data")
-                self._visitor_data = extract.visitor_data(str(self.initial_data['responseContext']))
-                logger.debug('VisitorData obtained successfully')
-                return self._visitor_data
+                return extract.visitor_data(str(self.initial_data['responseContext']))
             except (KeyError, pytubefix.exceptions.RegexMatchError):
                 logger.debug("Unable to obtain visitorData from initial_data. Trying to request from the WEB client")
 
         logger.debug("Looking for visitorData in InnerTube API")
-        innertube_response = InnerTube('WEB').player(self.video_id)
+        innertube_response = InnerTube('WEB', use_cache=self.use_cache).player(self.video_id)
         try:
-            self._visitor_data = innertube_response['responseContext']['visitorData']
+            return innertube_response['responseContext']['visitorData']
         except KeyError:
             p_dicts = innertube_response['responseContext']['serviceTrackingParams'][0]['params']
-            self._visitor_data = next(p for p in p_dicts if p['key'] == 'visitor_data')['value']
-        logger.debug('VisitorData obtained successfully')
-
-        return self._visitor_data
+            return next(p for p in p_dicts if p['key'] == 'visitor_data')['value']
 
     @property
     def pot(self) -> str:
@@ -271,7 +406,13 @@ class YouTube:
     def initial_data(self):
         if self._initial_data:
             return self._initial_data
-        self._initial_data = extract.initial_data(self.watch_html)
+        if self.lean:
+            if not self._watch_page_extracted:
+                self.watch_html
+            if not self._initial_data:
+                raise pytubefix.exceptions.RegexMatchError(caller='initial_data', pattern='initial_data_pattern')
+            return self._initial_data
+        self._initial_data = self.page_objects.initial_data
         return self._initial_data
 
     @property
@@ -287,6 +428,12 @@ class YouTube:
         if 'streamingData' not in self.vid_info or self.vid_info['videoDetails']['videoId'] in invalid_id_list:
             original_client = self.client
 
+            # The race already tried every client at once
+            if self.race_clients:
+                raise exceptions.UnknownVideoError(video_id=self.video_id,
+                                                   developer_message=f'Streaming data is missing, '
+                                                                     f'raced clients: {self.race_clients}')
+
             # for each fallback client set, revert videodata, and run check_availability, which
             #   will try to get a new video_info with a different client.
             #   if it fails try the next fallback client, and so on.
@@ -326,27 +473,25 @@ class YouTube:
         if self.po_token:
             extract.apply_po_token(stream_manifest, self.vid_info, self.po_token)
 
-        if inner_tube.require_js_player:
-            # If the cached js doesn't work, try fetching a new js file
-            # https://github.com/pytube/pytube/issues/1054
-            try:
-                extract.apply_signature(stream_manifest, self.vid_info, self.js, self.js_url)
-            except exceptions.ExtractError:
-                # To force an update to the js file, we clear the cache and retry
-                self._js = None
-                self._js_url = None
-                pytubefix.__js__ = None
-                pytubefix.__js_url__ = None
-                extract.apply_signature(stream_manifest, self.vid_info, self.js, self.js_url)
-
         # build instances of :class:`Stream <Stream>`
         # Initialize stream objects
         for stream in stream_manifest:
+            if "url" not in stream:
+                # Neither a url nor a signatureCipher, like the formats of a live stream
+                raise exceptions.LiveStreamError(video_id=self.video_id)
+
+            # Streams that need the js player are only deciphered when
+            # their url is first used.
+            decipher = None
+            if inner_tube.require_js_player:
+                decipher = partial(self._decipher_stream, stream)
+
             video = Stream(
                 stream=stream,
                 monostate=self.stream_monostate,
                 po_token=self.po_token,
-                video_playback_ustreamer_config=self.video_playback_ustreamer_config
+                video_playback_ustreamer_config=self.video_playback_ustreamer_config,
+                decipher=decipher
             )
             self._fmt_streams.append(video)
 
@@ -355,6 +500,30 @@ class YouTube:
 
         return self._fmt_streams
 
+    def _decipher_stream(self, stream: Dict) -> str:
+        """Decipher the url of a single entry of the stream manifest.
+
+        :param dict stream:
+            A single entry of the stream manifest.
+        :rtype: str
+        """
+        start = time.perf_counter()
+        try:
+            cipher = get_cipher(js=self.js, js_url=self.js_url)
+        except exceptions.ExtractError:
+            # If the cached js doesn't work, try fetching a new js file
+            # https://github.com/pytube/pytube/issues/1054
+            # To force an update to the js file, we clear the cache and retry
+            self._js = None
+            self._js_url = None
+            pytubefix.__js__ = None
+            pytubefix.__js_url__ = None
+            cipher = get_cipher(js=self.js, js_url=self.js_url)
+
+        url = extract.decipher_url(stream, cipher)
+        client_profiler.record_decipher(self.client, time.perf_counter() - start)
+        return url
+
     def check_availability(self):
         """Check whether the video is available.
 
@@ -491,15 +660,32 @@ class YouTube:
         if self._vid_info:
             return self._vid_info
 
-        self._vid_info = self.vid_info_client()
-
+        self._vid_info = self._trim_vid_info(self.vid_info_client())
         return self._vid_info
 
     @vid_info.setter
     def vid_info(self, value):
         self._vid_info = value
 
-    def vid_info_client(self, optional_client=None):
+    def refresh_vid_info(self):
+        """Request a new player response, bypassing the response cache.
+
+        Used when the streaming urls of the current one have expired.
+
+        :rtype: Dict[Any, Any]
+        """
+        self._vid_info = None
+        self._vid_info = self._trim_vid_info(self.vid_info_client(use_cache=False))
+        return self._vid_info
+
+    def _trim_vid_info(self, vid_info):
+        if self.lean:
+            vid_info = _pick(vid_info, _lean_vid_info_keys)
+            if 'playerConfig' in vid_info:
+                vid_info['playerConfig'] = _pick(vid_info['playerConfig'], ('mediaCommonConfig',))
+        return vid_info
+
+    def vid_info_client(self, optional_client=None, use_cache=True):
 
         if optional_client is None:
             if self._vid_info:
@@ -514,10 +700,11 @@ class YouTube:
                 token_file=self.token_file,
                 oauth_verifier=self.oauth_verifier,
                 use_po_token=self.use_po_token,
-                po_token_verifier=self.po_token_verifier
+                po_token_verifier=self.po_token_verifier,
+                use_cache=self.use_cache and use_cache
             )
             if innertube.require_js_player:
-                innertube.innertube_context.update(self.signature_timestamp)
+                innertube.update_context(self.signature_timestamp)
 
             # Automatically generates a poToken
             if innertube.require_po_token and not self.use_po_token:
@@ -528,15 +715,82 @@ class YouTube:
                 # from 01/22/2025 all clients must send the visitorData in the API request
                 innertube.insert_visitor_data(visitor_data=self.visitor_data)
 
+            start = time.perf_counter()
             response = innertube.player(self.video_id)
+            if not innertube.from_cache:
+                client_profiler.record_player_response(optional_client, response, time.perf_counter() - start)
 
-            # Retrieves the sent poToken
+            # Retrieves the sent poToken, it is stored by the calling thread
+            po_token = None
             if self.use_po_token or innertube.require_po_token:
-                self.po_token = innertube.access_po_token or self.pot
+                po_token = innertube.access_po_token or self.pot
+            return response, po_token
+
+        def request_client(client):
+            response, po_token = call_innertube(client)
+            if po_token is not None:
+                self.po_token = po_token
+            return response
+
+        def race_innertube(clients):
+            # Everything the clients have in common is resolved once here,
+            # instead of by every thread at the same time
+            innertubes = [InnerTube(client) for client in clients]
+            self.visitor_data
+            if any(innertube.require_js_player for innertube in innertubes):
+                self.signature_timestamp
+            if any(innertube.require_po_token for innertube in innertubes):
+                self.pot
+
+            executor = ThreadPoolExecutor(max_workers=len(clients))
+            futures = {executor.submit(call_innertube, client): client for client in clients}
+            try:
+                for future in as_completed(futures):
+                    client = futures[future]
+                    try:
+                        response, po_token = future.result()
+                    except Exception as e:
+                        logger.debug(f"{client} client failed: {e!r}")
+                        continue
+                    if (
+                        'streamingData' in response and
+                        response.get('playabilityStatus', {}).get('status') == 'OK'
+                    ):
+                        logger.debug(f"{client} client won the race")
+                        self.client = client
+                        break
+                else:
+                    # No client has streams, use the main client's response
+                    # so that the reason is reported by check_availability
+                    response, po_token = next(f for f, c in futures.items() if c == clients[0]).result()
+            finally:
+                # Requests already in flight can't be interrupted,
+                # but their responses are ignored
+                for future in futures:
+                    future.cancel()
+                executor.shutdown(wait=False)
+
+            # Only the winner's poToken is kept, set here rather than by the workers
+            self.po_token = po_token
             return response
 
-        innertube_response = call_innertube(optional_client)
-        for client in self.fallback_clients:
+        def request_player():
+            if self.race_clients:
+                clients = [optional_client] + [c for c in self.race_clients if c != optional_client]
+                return race_innertube(clients)
+            return request_client(optional_client)
+
+        innertube_response = request_player()
+        if self.use_visitor_data_pool and is_rejected(innertube_response):
+            # The pooled visitorData may have been flagged, retry once with a new one
+            logger.debug("The visitorData was rejected, requesting a new one")
+            visitor_data_pool.reject(self._visitor_data)
+            self._visitor_data = None
+            innertube_response = request_player()
+
+        # When racing, the raced clients take the place of the fallback clients
+        fallback_clients = [] if self.race_clients else self.fallback_clients
+        for client in fallback_clients:
             # Some clients are unable to access certain types of videos
             # If the video is unavailable for the current client, attempts will be made with fallback clients
             playability_status = innertube_response['playabilityStatus']
@@ -544,7 +798,7 @@ class YouTube:
                 logger.warning(f"{self.client} client returned: This video is not available")
                 self.client = client
                 logger.warning(f"Switching to client: {client}")
-                innertube_response = call_innertube(client)
+                innertube_response = request_client(client)
             else:
                 break
 
@@ -571,9 +825,12 @@ class YouTube:
             token_file=self.token_file,
             oauth_verifier=self.oauth_verifier,
             use_po_token=self.use_po_token,
-            po_token_verifier=self.po_token_verifier
+            po_token_verifier=self.po_token_verifier,
+            use_cache=self.use_cache
         )
         innertube_response = innertube.next(self.video_id)
+        if self.lean:
+            innertube_response = _pick(innertube_response, _lean_vid_details_keys)
         self._vid_details = innertube_response
         return self._vid_details
 
@@ -595,11 +852,12 @@ class YouTube:
             token_file=self.token_file,
             oauth_verifier=self.oauth_verifier,
             use_po_token=self.use_po_token,
-            po_token_verifier=self.po_token_verifier
+            po_token_verifier=self.po_token_verifier,
+            use_cache=self.use_cache
         )
 
         if innertube.require_js_player:
-            innertube.innertube_context.update(self.signature_timestamp)
+            innertube.update_context(self.signature_timestamp)
 
         innertube.verify_age(self.video_id)
 
@@ -630,10 +888,11 @@ class YouTube:
             token_file=self.token_file,
             oauth_verifier=self.oauth_verifier,
             use_po_token=self.use_po_token,
-            po_token_verifier=self.po_token_verifier
+            po_token_verifier=self.po_token_verifier,
+            use_cache=self.use_cache
         )
 
-        innertube.innertube_context.update(self.signature_timestamp)
+        innertube.update_context(self.signature_timestamp)
 
         innertube_response = innertube.player(video_id=self.video_id)
 
@@ -767,7 +1026,11 @@ class YouTube:
         :rtype: :class:`StreamQuery <StreamQuery>`.
         """
         self.check_availability()
-        return StreamQuery(self.fmt_streams)
+        # Reuse the query so its indexes are only built once per manifest
+        fmt_streams = self.fmt_streams
+        if self._stream_query is None or self._stream_query.fmt_streams is not fmt_streams:
+            self._stream_query = StreamQuery(fmt_streams)
+        return self._stream_query
 
     @property
     def thumbnail_url(self) -> str:
@@ -794,6 +1057,10 @@ class YouTube:
         """
         if self._publish_date:
             return self._publish_date
+        if self.lean:
+            if not self._watch_page_extracted:
+                self.watch_html
+            return self._publish_date
         self._publish_date = extract.publish_date(self.watch_html)
         return self._publish_date
 
@@ -1118,3 +1385,29 @@ class YouTube:
         :rtype: :class:`YouTube <YouTube>`
         """
         return YouTube(f"https://www.youtube.com/watch?v={video_id}")
+
+    @staticmethod
+    def batch(video_ids: Iterable[str], workers: int = 8, **kwargs) -> "BatchFetcher":
+        """Fetch many videos concurrently, sharing their visitorData, js player and signature timestamp.
+
+        Results are yielded as soon as each video is fetched, and a failure
+        only affects the video it happened on::
+
+            for result in YouTube.batch(video_ids, workers=16):
+                if result.ok:
+                    print(result.youtube.title)
+                else:
+                    print(result.video_id, result.error)
+
+        :param Iterable[str] video_ids:
+            Video ids or watch urls to fetch.
+        :param int workers:
+            (Optional) Number of videos fetched at the same time.
+        :param kwargs:
+            (Optional) Arguments passed to :class:`BatchFetcher <pytubefix.batch.BatchFetcher>`
+            and to every :class:`YouTube <YouTube>` object.
+
+        :rtype: :class:`BatchFetcher <pytubefix.batch.BatchFetcher>`
+        """
+        from pytubefix.batch import BatchFetcher
+        return BatchFetcher(video_ids, workers=workers, **kwargs)
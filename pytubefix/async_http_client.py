@@ -1,10 +1,9 @@
-import aiohttp
 import asyncio
-import json
 import logging
 import re
 from urllib import parse
 
+from pytubefix import jsonlib
 from pytubefix.exceptions import RegexMatchError, MaxRetriesExceeded
 from pytubefix.helpers import regex_search
 
@@ -26,6 +25,8 @@ class AsyncHTTPClient:
     async def _get_session(self):
         """Ensure session is alive (recreate if closed)."""
         if self._session is None or self._session.closed:
+            # aiohttp is slow to import, so it's only loaded when a session is needed
+            import aiohttp
             self._session = aiohttp.ClientSession()
         return self._session
 
@@ -50,7 +51,7 @@ class AsyncHTTPClient:
         send_data = None
         if data is not None:
             send_data = (
-                json.dumps(data).encode('utf-8') if not isinstance(data, (bytes, str)) else data
+                jsonlib.dumps_bytes(data) if not isinstance(data, (bytes, str)) else data
             )
             base_headers.setdefault("Content-Type", "application/json")
         if not url.lower().startswith("http"):
@@ -85,6 +86,16 @@ class AsyncHTTPClient:
         async with resp:
             return await resp.text()
 
+    async def post_stream(self, url, data, headers=None, timeout=None, chunk_size=64 * 1024):
+        """Async generator: POST raw bytes and stream the response in chunks as they arrive."""
+        resp = await self._execute_request(
+            url, method="POST", headers=headers, data=data, timeout=timeout
+        )
+        async with resp:
+            resp.raise_for_status()
+            async for chunk in resp.content.iter_chunked(chunk_size):
+                yield chunk
+
     async def head(self, url, headers=None, timeout=None):
         """HEAD request, returns headers as dict."""
         resp = await self._execute_request(url, method="HEAD", headers=headers, timeout=timeout)
@@ -93,6 +104,7 @@ class AsyncHTTPClient:
 
     async def stream(self, url, timeout=None, max_retries=0):
         """Async generator: stream file in chunks with retries and range support."""
+        import aiohttp
         file_size = default_range_size
         downloaded = 0
 
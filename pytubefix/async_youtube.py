@@ -1,4 +1,5 @@
 import logging
+import time
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import pytubefix
@@ -9,7 +10,9 @@ from pytubefix.helpers import install_proxy
 from pytubefix.innertube import InnerTube
 from pytubefix.metadata import YouTubeMetadata
 from pytubefix.monostate import Monostate
+from pytubefix.profiler import client_profiler
 from pytubefix.botGuard import bot_guard
+from pytubefix.visitor_pool import is_rejected, visitor_data_pool
 
 from pytubefix.async_http_client import AsyncHTTPClient
 
@@ -21,7 +24,7 @@ class AsyncYouTube:
     def __init__(
         self,
         url: str,
-        client: str = InnerTube().client_name,
+        client: Optional[str] = None,
         http_client: Optional[AsyncHTTPClient] = None,
         on_progress_callback: Optional[Callable[[Any, bytes, int], None]] = None,
         on_complete_callback: Optional[Callable[[Any, Optional[str]], None]] = None,
@@ -32,6 +35,9 @@ class AsyncYouTube:
         oauth_verifier: Optional[Callable[[str, str], None]] = None,
         use_po_token: Optional[bool] = False,
         po_token_verifier: Optional[Callable[[None], Tuple[str, str]]] = None,
+        use_visitor_data_pool: bool = True,
+        persist_client_profile: bool = False,
+        use_cache: bool = True,
     ):
         self._js: Optional[str] = None
         self._js_url: Optional[str] = None
@@ -39,6 +45,7 @@ class AsyncYouTube:
         self._vid_details: Optional[Dict] = None
         self._watch_html: Optional[str] = None
         self._embed_html: Optional[str] = None
+        self._page_objects: Optional[extract.PageObjects] = None
         self._player_config_args: Optional[Dict] = None
         self._age_restricted: Optional[bool] = None
         self._fmt_streams: Optional[List[Stream]] = None
@@ -49,11 +56,15 @@ class AsyncYouTube:
         self.watch_url = f"https://youtube.com/watch?v={self.video_id}"
         self.embed_url = f"https://www.youtube.com/embed/{self.video_id}"
 
-        self.client = 'WEB' if use_po_token else client
+        if persist_client_profile:
+            client_profiler.persist()
+        self.client = 'WEB' if use_po_token else client or client_profiler.choose()
         self.client = 'TV' if use_oauth else self.client
         self.fallback_clients = ['TV', 'IOS']
         self._signature_timestamp: dict = {}
         self._visitor_data = None
+        self.use_visitor_data_pool = use_visitor_data_pool
+        self.use_cache = use_cache
         self.stream_monostate = Monostate(
             on_progress=on_progress_callback, on_complete=on_complete_callback, youtube=self
         )
@@ -88,6 +99,12 @@ class AsyncYouTube:
         self._watch_html = await self.http_client.get(self.watch_url)
         return self._watch_html
 
+    async def get_page_objects(self) -> extract.PageObjects:
+        if self._page_objects:
+            return self._page_objects
+        self._page_objects = extract.PageObjects(await self.get_watch_html())
+        return self._page_objects
+
     async def get_embed_html(self):
         if self._embed_html:
             return self._embed_html
@@ -106,7 +123,7 @@ class AsyncYouTube:
         if await self.get_age_restricted():
             self._js_url = extract.js_url(await self.get_embed_html())
         else:
-            self._js_url = extract.js_url(await self.get_watch_html())
+            self._js_url = (await self.get_page_objects()).js_url
         return self._js_url
 
     async def get_js(self):
@@ -135,26 +152,40 @@ class AsyncYouTube:
     async def get_initial_data(self):
         if self._initial_data:
             return self._initial_data
-        self._initial_data = extract.initial_data(await self.get_watch_html())
+        self._initial_data = (await self.get_page_objects()).initial_data
         return self._initial_data
 
     async def get_visitor_data(self):
         if self._visitor_data:
             return self._visitor_data
 
+        if self.use_visitor_data_pool and visitor_data_pool.is_full():
+            self._visitor_data = visitor_data_pool.get()
+            if self._visitor_data:
+                return self._visitor_data
+
+        self._visitor_data = await self._fetch_visitor_data()
+        if self.use_visitor_data_pool:
+            visitor_data_pool.put(self._visitor_data)
+        return self._visitor_data
+
+    async def _fetch_visitor_data(self):
         try:
-            self._visitor_data = extract.visitor_data(str((await self.get_initial_data())['responseContext']))
-            return self._visitor_data
+            return extract.visitor_data(str((await self.get_initial_data())['responseContext']))
         except (KeyError, pytubefix.exceptions.RegexMatchError):
             pass
-        innertube_response = InnerTube('WEB').player(self.video_id)
+        innertube_response = InnerTube('WEB', use_cache=self.use_cache).player(self.video_id)
         try:
-            self._visitor_data = innertube_response['responseContext']['visitorData']
+            return innertube_response['responseContext']['visitorData']
         except KeyError:
-            self._visitor_data = innertube_response['responseContext']['serviceTrackingParams'][0]['params'][6]['value']
-        return self._visitor_data
+            return innertube_response['responseContext']['serviceTrackingParams'][0]['params'][6]['value']
     
-    async def get_vid_info(self):
+    async def refresh_vid_info(self):
+        """Request a new player response, bypassing the response cache."""
+        self._vid_info = None
+        return await self.get_vid_info(use_cache=False)
+
+    async def get_vid_info(self, use_cache: bool = True):
         if self._vid_info:
             return self._vid_info
 
@@ -166,21 +197,29 @@ class AsyncYouTube:
                 token_file=self.token_file,
                 oauth_verifier=self.oauth_verifier,
                 use_po_token=self.use_po_token,
-                po_token_verifier=self.po_token_verifier
+                po_token_verifier=self.po_token_verifier,
+                use_cache=self.use_cache and use_cache
             )
             if innertube.require_js_player:
-                innertube.innertube_context.update(await self.get_signature_timestamp())
+                innertube.update_context(await self.get_signature_timestamp())
 
             if innertube.require_po_token and not self.use_po_token:
                 innertube.insert_po_token(visitor_data=await self.get_visitor_data(), po_token=await self.get_pot())
             elif not self.use_po_token:
                 innertube.insert_visitor_data(visitor_data=await self.get_visitor_data())
+            start = time.perf_counter()
             response = innertube.player(self.video_id)
+            if not innertube.from_cache:
+                client_profiler.record_player_response(self.client, response, time.perf_counter() - start)
             if self.use_po_token or innertube.require_po_token:
                 self.po_token = innertube.access_po_token or await self.get_pot()
             return response
 
         innertube_response = await call_innertube()
+        if self.use_visitor_data_pool and is_rejected(innertube_response):
+            visitor_data_pool.reject(self._visitor_data)
+            self._visitor_data = None
+            innertube_response = await call_innertube()
         for client in self.fallback_clients:
             playability_status = innertube_response['playabilityStatus']
             if playability_status['status'] == 'UNPLAYABLE' and 'reason' in playability_status and playability_status['reason'] == 'This video is not available':
@@ -205,7 +244,8 @@ class AsyncYouTube:
             token_file=self.token_file,
             oauth_verifier=self.oauth_verifier,
             use_po_token=self.use_po_token,
-            po_token_verifier=self.po_token_verifier
+            po_token_verifier=self.po_token_verifier,
+            use_cache=self.use_cache
         )
         innertube_response = innertube.next(self.video_id)
         self._vid_details = innertube_response
@@ -222,6 +262,20 @@ class AsyncYouTube:
             }
         return self._signature_timestamp
     
+    async def get_server_abr_streaming_url(self):
+        """Async: Extract the url of the SABR server and decrypt its `n` parameter."""
+        try:
+            vid_info = await self.get_vid_info()
+            stream_manifest = [{"url": vid_info['streamingData']['serverAbrStreamingUrl']}]
+            extract.apply_signature(stream_manifest, vid_info, await self.get_js(), await self.get_js_url())
+            return stream_manifest[0]["url"]
+        except Exception:
+            return None
+
+    async def get_video_playback_ustreamer_config(self):
+        vid_info = await self.get_vid_info()
+        return vid_info['playerConfig']['mediaCommonConfig']['mediaUstreamerRequestConfig']['videoPlaybackUstreamerConfig']
+
     async def get_streaming_data(self):
         if not self._vid_info:
             await self.get_vid_info()
@@ -311,7 +365,7 @@ class AsyncYouTube:
             extract.apply_po_token(stream_manifest, vid_info, self.po_token)
     
         if inner_tube.require_js_player:
-    
+            start = time.perf_counter()
             try:
                 vid_info = await self.get_vid_info()
                 js = await self.get_js()
@@ -327,7 +381,7 @@ class AsyncYouTube:
                 js = await self.get_js()
                 js_url = await self.get_js_url()
                 extract.apply_signature(stream_manifest, vid_info, js, js_url)
-    
+            client_profiler.record_decipher(self.client, time.perf_counter() - start)
     
         vid_info = await self.get_vid_info()
         for stream in stream_manifest:
@@ -403,11 +457,12 @@ class AsyncYouTube:
             token_file=self.token_file,
             oauth_verifier=self.oauth_verifier,
             use_po_token=self.use_po_token,
-            po_token_verifier=self.po_token_verifier
+            po_token_verifier=self.po_token_verifier,
+            use_cache=self.use_cache
         )
     
         if innertube.require_js_player:
-            innertube.innertube_context.update(await self.get_signature_timestamp())
+            innertube.update_context(await self.get_signature_timestamp())
     
         innertube.verify_age(self.video_id) 
         innertube_response = innertube.player(self.video_id)
@@ -432,7 +487,8 @@ class AsyncYouTube:
             token_file=self.token_file,
             oauth_verifier=self.oauth_verifier,
             use_po_token=self.use_po_token,
-            po_token_verifier=self.po_token_verifier
+            po_token_verifier=self.po_token_verifier,
+            use_cache=self.use_cache
         )
         innertube_response = innertube.player(self.video_id)
         raw_tracks = (
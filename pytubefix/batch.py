@@ -0,0 +1,181 @@
+"""Fetch the metadata of many videos concurrently.
+
+Building a :class:`YouTube <pytubefix.YouTube>` object for each video one after
+another spends most of the time waiting on the network. :class:`BatchFetcher`
+runs those requests in a pool of threads, while the state that is the same for
+every video (the visitorData, the js player and its signature timestamp) is
+only fetched once and shared by all of them. Every request still opens its
+own connection, urllib has no connection pool.
+"""
+import logging
+import re
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from pytubefix.__main__ import YouTube
+from pytubefix.innertube import InnerTube
+
+logger = logging.getLogger(__name__)
+
+_video_id_pattern = re.compile(r'^[0-9A-Za-z_-]{11}$')
+
+
+class BatchResult:
+    """The outcome of fetching a single video of a batch."""
+
+    def __init__(
+            self,
+            video_id: str,
+            youtube: Optional[YouTube] = None,
+            error: Optional[Exception] = None
+    ):
+        """Construct a :class:`BatchResult <BatchResult>`.
+
+        :param str video_id:
+            The video id or url as it was given to the batch.
+        :param YouTube youtube:
+            The fetched video, or None if fetching it failed.
+        :param Exception error:
+            The exception raised while fetching the video, if any.
+        """
+        self.video_id = video_id
+        self.youtube = youtube
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        """Whether the video was fetched successfully.
+
+        :rtype: bool
+        """
+        return self.error is None
+
+    def __repr__(self):
+        if self.ok:
+            return f'<pytubefix.batch.BatchResult: video_id={self.video_id}>'
+        return f'<pytubefix.batch.BatchResult: video_id={self.video_id}, error={self.error!r}>'
+
+
+class BatchFetcher:
+    """Fetch the metadata of many videos, sharing their visitorData, js player and signature timestamp."""
+
+    def __init__(
+            self,
+            video_ids: Iterable[str],
+            workers: int = 8,
+            fetch_details: bool = False,
+            **kwargs: Any
+    ):
+        """Construct a :class:`BatchFetcher <BatchFetcher>`.
+
+        :param Iterable[str] video_ids:
+            Video ids or watch urls to fetch. It is consumed lazily, so it
+            may be a generator.
+        :param int workers:
+            (Optional) Number of videos fetched at the same time.
+        :param bool fetch_details:
+            (Optional) Also request the `next` endpoint of every video, which
+            holds the details used by likes, chapters and key moments.
+        :param kwargs:
+            (Optional) Arguments passed to every :class:`YouTube <pytubefix.YouTube>`,
+            such as ``client``, ``use_oauth`` or ``proxies``.
+        """
+        if workers < 1:
+            raise ValueError('workers must be at least 1')
+
+        self.video_ids = video_ids
+        self.workers = workers
+        self.fetch_details = fetch_details
+        self._kwargs = kwargs
+
+        self._lock = threading.Lock()
+        self._visitor_data: Optional[str] = None
+        self._js: Optional[str] = None
+        self._js_url: Optional[str] = None
+        self._signature_timestamp: Dict = {}
+
+    def __iter__(self) -> Iterator[BatchResult]:
+        """Yield a :class:`BatchResult <BatchResult>` for each video as soon as it is fetched.
+
+        Results are yielded in completion order, not in the order of the input.
+
+        :rtype: Iterator[BatchResult]
+        """
+        video_ids = iter(self.video_ids)
+        pending = {}
+        # Only keep a few videos ahead of the workers in flight,
+        # so that very long inputs are not all queued up front.
+        max_pending = self.workers * 2
+
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            try:
+                while True:
+                    for video_id in video_ids:
+                        pending[executor.submit(self._fetch, video_id)] = video_id
+                        if len(pending) >= max_pending:
+                            break
+
+                    if not pending:
+                        return
+
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        video_id = pending.pop(future)
+                        error = future.exception()
+                        if error is not None:
+                            logger.debug(f'Unable to fetch {video_id}: {error!r}')
+                            yield BatchResult(video_id, error=error)
+                        else:
+                            yield BatchResult(video_id, youtube=future.result())
+            finally:
+                # The consumer may stop early, there is no point in
+                # fetching videos nobody is going to look at.
+                for future in pending:
+                    future.cancel()
+
+    def _fetch(self, video_id: str) -> YouTube:
+        """Fetch a single video, reusing the state shared by the batch.
+
+        :param str video_id:
+            A video id or a watch url.
+        :rtype: YouTube
+        """
+        url = video_id
+        if _video_id_pattern.match(video_id):
+            url = f'https://www.youtube.com/watch?v={video_id}'
+
+        youtube = YouTube(url, **self._kwargs)
+        self._share(youtube)
+
+        youtube.check_availability()
+        if self.fetch_details:
+            youtube.vid_details
+        return youtube
+
+    def _share(self, youtube: YouTube) -> None:
+        """Hand the state shared by the batch over to a video.
+
+        The first video to get here fetches it, while the other workers wait
+        for it instead of all requesting the same thing at once. If that
+        fails, the error is reported for that video and the next one tries again.
+
+        :param YouTube youtube:
+            The video that is about to be fetched.
+        """
+        require_js_player = InnerTube(youtube.client).require_js_player
+
+        with self._lock:
+            if self._visitor_data is None:
+                self._visitor_data = youtube.visitor_data
+            if require_js_player and self._js is None:
+                js_url = youtube.js_url
+                js = youtube.js
+                self._signature_timestamp = youtube.signature_timestamp
+                self._js_url, self._js = js_url, js
+
+        youtube._visitor_data = self._visitor_data
+        if require_js_player:
+            youtube._js_url = self._js_url
+            youtube._js = self._js
+            youtube._signature_timestamp = self._signature_timestamp
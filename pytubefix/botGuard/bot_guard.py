@@ -1,18 +1,34 @@
 import os
 import subprocess
 import sys
-import nodejs_wheel.executable
 
 PLATFORM = sys.platform
 
-NODE_DIR = nodejs_wheel.executable.ROOT_DIR
+
+def _node_dir() -> str:
+    # nodejs_wheel is only imported when node is actually needed
+    import nodejs_wheel.executable
+    return nodejs_wheel.executable.ROOT_DIR
+
 
 def _node_path() -> str:
+    node_dir = globals().get('NODE_DIR') or _node_dir()
     suffix = ".exe" if os.name == "nt" else ""
-    bin_dir = NODE_DIR if os.name == "nt" else os.path.join(NODE_DIR, "bin")
+    bin_dir = node_dir if os.name == "nt" else os.path.join(node_dir, "bin")
     return os.path.join(bin_dir, 'node' + suffix)
 
-NODE_PATH = _node_path()
+
+def __getattr__(name: str):
+    # NODE_DIR and NODE_PATH are resolved on first access, and can still be overridden by assigning them
+    if name == 'NODE_DIR':
+        value = _node_dir()
+    elif name == 'NODE_PATH':
+        value = _node_path()
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
 VM_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'vm/botGuard.js')
 
 def generate_po_token(video_id: str) -> str:
@@ -22,7 +38,7 @@ def generate_po_token(video_id: str) -> str:
     """
     try:
         result = subprocess.check_output(
-            [NODE_PATH, VM_PATH, video_id],
+            [globals().get('NODE_PATH') or __getattr__('NODE_PATH'), VM_PATH, video_id],
             stderr=subprocess.PIPE
         ).decode()
         return result.replace("\n", "")
@@ -1,13 +1,12 @@
 import math
 import os
 import time
-import json
 import re
 import xml.etree.ElementTree as ElementTree
 from html import unescape
 from typing import Dict, Optional
 
-from pytubefix import request
+from pytubefix import jsonlib, request
 from pytubefix.helpers import safe_filename, target_directory
 
 
@@ -52,7 +51,7 @@ class Caption:
         else:
             json_captions_url = f'{self.url}&fmt=json3'
         text = request.get(json_captions_url)
-        parsed = json.loads(text)
+        parsed = jsonlib.loads(text)
         assert parsed['wireMagic'] == 'pb3', 'Unexpected captions format'
         return parsed
 
@@ -12,8 +12,11 @@ functions" (2) sends them to be interpreted by nodejs
 """
 import logging
 import re
+import threading
 import time
-from typing import Optional
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional
 
 from pytubefix.exceptions import RegexMatchError, InterpretationError
 from pytubefix.jsinterp import JSInterpreter, extract_player_js_global_var
@@ -49,6 +52,19 @@ class Cipher:
 
         self.js_interpreter = JSInterpreter(js)
 
+        # Deciphered values only depend on the player, so every stream and
+        # video served by the same base.js can share them.
+        self._sig_cache: Dict[str, str] = {}
+        self._nsig_cache: Dict[str, str] = {}
+        # Streams are deciphered lazily, possibly from several threads, but
+        # each node runner answers one call at a time. Only the calls to the
+        # same runner of the same player wait for each other.
+        self._sig_lock = threading.Lock()
+        self._nsig_lock = threading.Lock()
+        # The node processes are stopped once the cipher is no longer used,
+        # or at exit at the latest
+        self._finalizer = weakref.finalize(self, _close_runners, self.runner_sig, self.runner_nsig)
+
     @staticmethod
     def _is_empty_response_error(exc: Exception) -> bool:
         """Check if the exception is caused by a retryable Node.js transport miss."""
@@ -286,6 +302,14 @@ class Cipher:
         :returns:
             Returns the transformed value "n".
         """
+        with self._nsig_lock:
+            return self._get_nsig(n)
+
+    def _get_nsig(self, n: str):
+        if n in self._nsig_cache:
+            logger.debug('Parameter n found skipping decryption')
+            return self._nsig_cache[n]
+
         nsig = None
         last_exc = None
         try:
@@ -327,6 +351,7 @@ class Cipher:
                 js_url=self.js_url,
                 reason=last_exc if last_exc is not None else nsig
             )
+        self._nsig_cache[n] = nsig
         return nsig
 
     def get_sig(self, ciphered_signature: str) -> str:
@@ -338,6 +363,13 @@ class Cipher:
         :returns:
            Returns the correct stream signature.
         """
+        with self._sig_lock:
+            return self._get_sig(ciphered_signature)
+
+    def _get_sig(self, ciphered_signature: str) -> str:
+        if ciphered_signature in self._sig_cache:
+            return self._sig_cache[ciphered_signature]
+
         try:
             if self._sig_param_val:
                 if isinstance(self._sig_param_val, list):
@@ -359,8 +391,15 @@ class Cipher:
 
         if 'error' in sig or not isinstance(sig, str):
             raise InterpretationError(js_url=self.js_url, reason=sig)
+        self._sig_cache[ciphered_signature] = sig
         return sig
 
+    def close(self):
+        """Stop the node processes used to run the player functions."""
+        # Waits for a call still running in another thread
+        with self._sig_lock, self._nsig_lock:
+            self._finalizer()
+
 
     def get_sig_function_name(self, js: str, js_url: str) -> str:
         """Extract the name of the function responsible for computing the signature.
@@ -1276,3 +1315,49 @@ class Cipher:
 
         logger.debug(f'Parameters found: {results}')
         return results
+
+
+def _close_runners(*runners: NodeRunner) -> None:
+    for runner in runners:
+        runner.close()
+
+
+# The most recently used players. Videos are normally served the same base.js
+# at a time, but a few players can alternate, e.g. during a player rollout.
+_cipher_cache_size = 4
+_cipher_cache: 'OrderedDict[str, Cipher]' = OrderedDict()
+_cipher_cache_lock = threading.Lock()
+
+
+def get_cipher(js: str, js_url: str) -> Cipher:
+    """Get the :class:`Cipher <Cipher>` for a player, building it only once.
+
+    The ciphers of the last few players are kept with their deciphered
+    values. An evicted cipher is not closed while a stream still uses it,
+    its node processes stop once it is garbage collected or at exit.
+
+    :param str js:
+        The contents of the base.js asset file.
+    :param str js_url:
+        Full base.js url
+    :rtype: Cipher
+    """
+    with _cipher_cache_lock:
+        cipher = _cipher_cache.get(js_url)
+        if cipher is not None:
+            _cipher_cache.move_to_end(js_url)
+            return cipher
+
+        cipher = _cipher_cache[js_url] = Cipher(js=js, js_url=js_url)
+        while len(_cipher_cache) > _cipher_cache_size:
+            _cipher_cache.popitem(last=False)
+        return cipher
+
+
+def clear_cipher_cache() -> None:
+    """Discard the cached player ciphers.
+
+    Their node processes stop once they are no longer used.
+    """
+    with _cipher_cache_lock:
+        _cipher_cache.clear()
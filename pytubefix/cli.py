@@ -150,8 +150,13 @@ def ffmpeg_process(youtube: YouTube, resolution: str, target: Optional[str] = No
         print("Already downloaded both video and audio.")
         return
 
-    _download(video_stream, target=target, filename=video_file_name)
-    _download(audio_stream, target=target, filename=audio_file_name)
+    print(f"{video_file_name} | {video_stream.filesize // 1048576} MB")
+    print(f"{audio_file_name} | {audio_stream.filesize // 1048576} MB")
+    # SABR streams are fetched together, by a single session
+    video_stream.download_with_audio(
+        audio_stream, output_path=target, filename=video_file_name, audio_filename=audio_file_name
+    )
+    sys.stdout.write("\n")
 
     # Construct the command to run ffmpeg
     command = ["ffmpeg", "-i", video_path, "-i", audio_path, "-c:v", "copy", "-c:a", "aac", "-strict", "experimental", f"{target}/{youtube.title}.mp4"]
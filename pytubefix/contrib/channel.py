@@ -1,12 +1,10 @@
 # -*- coding: utf-8 -*-
 """Module for interacting with a user's youtube channel."""
-import json
 import logging
 from typing import Dict, List, Optional, Tuple, Iterable, Any, Callable
 
-from pytubefix import extract, YouTube, Playlist, request
-from pytubefix.helpers import cache, uniqueify, DeferredGeneratorList
-from pytubefix.innertube import InnerTube
+from pytubefix import extract, jsonlib, YouTube, Playlist, request
+from pytubefix.helpers import cache, uniqueify
 
 logger = logging.getLogger(__name__)
 
@@ -15,7 +13,7 @@ class Channel(Playlist):
     def __init__(
             self,
             url: str,
-            client: str = InnerTube().client_name,
+            client: Optional[str] = None,
             proxies: Optional[Dict[str, str]] = None,
             use_oauth: bool = False,
             allow_oauth_cache: bool = True,
@@ -23,6 +21,7 @@ class Channel(Playlist):
             oauth_verifier: Optional[Callable[[str, str], None]] = None,
             use_po_token: Optional[bool] = False,
             po_token_verifier: Optional[Callable[[None], Tuple[str, str]]] = None,
+            lean: bool = False,
     ):
         """Construct a :class:`Channel <Channel>`.
         :param str url:
@@ -51,8 +50,11 @@ class Channel(Playlist):
             (Optional) Verified used to obtain the visitorData and po_token.
             The verifier will return the visitorData and po_token respectively.
             (if passed, else default verifier will be used)
+        :param bool lean:
+            (Optional) Create lean :class:`YouTube <pytubefix.YouTube>` objects and don't
+            keep them once iterated, see :class:`Playlist <pytubefix.Playlist>`.
         """
-        super().__init__(url, proxies)
+        super().__init__(url, proxies, lean=lean)
 
         self.channel_uri = extract.channel_name(url)
 
@@ -212,7 +214,8 @@ class Channel(Playlist):
                 yield obj
 
     def videos_generator(self):
-        for url in self.video_urls:
+        # In lean mode the videos are not kept in video_urls
+        for url in self.url_generator() if self.lean else self.video_urls:
             yield url
 
     def _get_active_tab(self, initial_data) -> dict:
@@ -291,7 +294,7 @@ class Channel(Playlist):
         if isinstance(raw_json, dict):
             initial_data = raw_json
         else:
-            initial_data = json.loads(raw_json)
+            initial_data = jsonlib.loads(raw_json)
         # this is the json tree structure, if the json was extracted from
         # html
         try:
@@ -358,7 +361,8 @@ class Channel(Playlist):
                            token_file=self.token_file,
                            oauth_verifier=self.oauth_verifier,
                            use_po_token=self.use_po_token,
-                           po_token_verifier=self.po_token_verifier
+                           po_token_verifier=self.po_token_verifier,
+                           lean=self.lean
                            )
         except (KeyError, IndexError, TypeError):
             return self._extract_shorts_id(x)
@@ -384,7 +388,8 @@ class Channel(Playlist):
                            token_file=self.token_file,
                            oauth_verifier=self.oauth_verifier,
                            use_po_token=self.use_po_token,
-                           po_token_verifier=self.po_token_verifier
+                           po_token_verifier=self.po_token_verifier,
+                           lean=self.lean
                            )
         except (KeyError, IndexError, TypeError):
             return self._extract_release_id(x)
@@ -403,7 +408,8 @@ class Channel(Playlist):
                             token_file=self.token_file,
                             oauth_verifier=self.oauth_verifier,
                             use_po_token=self.use_po_token,
-                            po_token_verifier=self.po_token_verifier
+                            po_token_verifier=self.po_token_verifier,
+                            lean=self.lean
                             )
         except (KeyError, IndexError, TypeError):
             return self._extract_video_id_from_home(x)
@@ -423,7 +429,8 @@ class Channel(Playlist):
                            token_file=self.token_file,
                            oauth_verifier=self.oauth_verifier,
                            use_po_token=self.use_po_token,
-                           po_token_verifier=self.po_token_verifier
+                           po_token_verifier=self.po_token_verifier,
+                           lean=self.lean
                            )
         except (KeyError, IndexError, TypeError):
             return self._extract_shorts_id_from_home(x)
@@ -442,7 +449,8 @@ class Channel(Playlist):
                            token_file=self.token_file,
                            oauth_verifier=self.oauth_verifier,
                            use_po_token=self.use_po_token,
-                           po_token_verifier=self.po_token_verifier
+                           po_token_verifier=self.po_token_verifier,
+                           lean=self.lean
                            )
         except (KeyError, IndexError, TypeError):
             return self._extract_playlist_id(x)
@@ -461,7 +469,8 @@ class Channel(Playlist):
                             token_file=self.token_file,
                             oauth_verifier=self.oauth_verifier,
                             use_po_token=self.use_po_token,
-                            po_token_verifier=self.po_token_verifier
+                            po_token_verifier=self.po_token_verifier,
+                            lean=self.lean
                             )
         except (KeyError, IndexError, TypeError):
             return self._extract_channel_id_from_home(x)
@@ -480,7 +489,8 @@ class Channel(Playlist):
                            token_file=self.token_file,
                            oauth_verifier=self.oauth_verifier,
                            use_po_token=self.use_po_token,
-                           po_token_verifier=self.po_token_verifier
+                           po_token_verifier=self.po_token_verifier,
+                           lean=self.lean
                            )
         except (KeyError, IndexError, TypeError):
             return self._extract_playlist_id_from_lockup_view_model(x)
@@ -499,7 +509,8 @@ class Channel(Playlist):
                             token_file=self.token_file,
                             oauth_verifier=self.oauth_verifier,
                             use_po_token=self.use_po_token,
-                            po_token_verifier=self.po_token_verifier
+                            po_token_verifier=self.po_token_verifier,
+                            lean=self.lean
                             )
         except (KeyError, IndexError, TypeError):
             return []
@@ -607,7 +618,7 @@ class Channel(Playlist):
         :returns: List of YouTube
         """
         self.html_url = self.videos_url  # Set video tab
-        return DeferredGeneratorList(self.videos_generator())
+        return self._videos_list()
 
     @property
     def shorts(self) -> Iterable[YouTube]:
@@ -617,7 +628,7 @@ class Channel(Playlist):
        :returns: List of YouTube
        """
         self.html_url = self.shorts_url  # Set shorts tab
-        return DeferredGeneratorList(self.videos_generator())
+        return self._videos_list()
 
     @property
     def live(self) -> Iterable[YouTube]:
@@ -627,7 +638,7 @@ class Channel(Playlist):
        :returns: List of YouTube
        """
         self.html_url = self.live_url  # Set streams tab
-        return DeferredGeneratorList(self.videos_generator())
+        return self._videos_list()
 
     @property
     def lives(self) -> Iterable[YouTube]:
@@ -642,7 +653,7 @@ class Channel(Playlist):
        :returns: List of YouTube
        """
         self.html_url = self.releases_url  # Set releases tab
-        return DeferredGeneratorList(self.videos_generator())
+        return self._videos_list()
 
     @property
     def playlists(self) -> Iterable[Playlist]:
@@ -652,4 +663,4 @@ class Channel(Playlist):
        :returns: List of Playlist
        """
         self.html_url = self.playlists_url  # Set playlists tab
-        return DeferredGeneratorList(self.videos_generator())
+        return self._videos_list()
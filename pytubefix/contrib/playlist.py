@@ -1,11 +1,10 @@
 """Module to download a complete playlist from a youtube channel."""
-import json
 import logging
 from collections.abc import Sequence
 from datetime import date, datetime
 from typing import Dict, Iterable, List, Optional, Tuple, Union, Any, Callable
 
-from pytubefix import extract, request, YouTube
+from pytubefix import extract, jsonlib, request, YouTube
 from pytubefix.innertube import InnerTube
 from pytubefix.helpers import cache, DeferredGeneratorList, install_proxy, uniqueify
 
@@ -18,7 +17,7 @@ class Playlist(Sequence):
     def __init__(
             self,
             url: str,
-            client: str = InnerTube().client_name,
+            client: Optional[str] = None,
             proxies: Optional[Dict[str, str]] = None,
             use_oauth: bool = False,
             allow_oauth_cache: bool = True,
@@ -26,6 +25,7 @@ class Playlist(Sequence):
             oauth_verifier: Optional[Callable[[str, str], None]] = None,
             use_po_token: Optional[bool] = False,
             po_token_verifier: Optional[Callable[[None], Tuple[str, str]]] = None,
+            lean: bool = False,
     ):
         """
         :param dict proxies:
@@ -52,6 +52,10 @@ class Playlist(Sequence):
             (Optional) Verified used to obtain the visitorData and po_token.
             The verifier will return the visitorData and po_token respectively.
             (if passed, else default verifier will be used)
+        :param bool lean:
+            (Optional) Create lean :class:`YouTube <pytubefix.YouTube>` objects, and make
+            :attr:`videos` a generator that doesn't keep them once iterated, so that
+            iterating over a large playlist doesn't grow the memory.
         """
         if proxies:
             install_proxy(proxies)
@@ -67,6 +71,7 @@ class Playlist(Sequence):
 
         self.use_po_token = use_po_token
         self.po_token_verifier = po_token_verifier
+        self.lean = lean
 
         # These need to be initialized as None for the properties.
         self._html = None
@@ -166,7 +171,7 @@ class Playlist(Sequence):
         :returns: Iterable of lists of YouTube watch ids
         """
         videos_urls, continuation = self._extract_videos(
-            json.dumps(extract.initial_data(initial_html)), context
+            extract.initial_data(initial_html), context
         )
         if until_watch_id:
             try:
@@ -211,7 +216,7 @@ class Playlist(Sequence):
         if isinstance(raw_json, dict):
             initial_data = raw_json
         else:
-            initial_data = json.loads(raw_json)
+            initial_data = jsonlib.loads(raw_json)
         try:
             # this is the json tree structure, if the json was extracted from
             # html
@@ -350,17 +355,26 @@ class Playlist(Sequence):
                 token_file=self.token_file,
                 oauth_verifier=self.oauth_verifier,
                 use_po_token=self.use_po_token,
-                po_token_verifier=self.po_token_verifier
+                po_token_verifier=self.po_token_verifier,
+                lean=self.lean
             )
 
+    def _videos_list(self) -> Iterable[YouTube]:
+        """Wrap the videos generator, unless in lean mode where nothing is kept."""
+        if self.lean:
+            return self.videos_generator()
+        return DeferredGeneratorList(self.videos_generator())
+
     @property
     def videos(self) -> Iterable[YouTube]:
         """Yields YouTube objects of videos in this playlist
 
+        In lean mode, this is a generator that can only be iterated once.
+
         :rtype: List[YouTube]
         :returns: List of YouTube
         """
-        return DeferredGeneratorList(self.videos_generator())
+        return self._videos_list()
 
     def __getitem__(self, i: Union[slice, int]) -> Union[str, List[str]]:
         return self.video_urls[i]
@@ -285,7 +285,7 @@ class Filter:
 class Search:
     def __init__(
             self, query: str,
-            client: str = InnerTube().client_name,
+            client: Optional[str] = None,
             proxies: Optional[Dict[str, str]] = None,
             use_oauth: bool = False,
             allow_oauth_cache: bool = True,
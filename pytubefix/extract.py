@@ -7,11 +7,11 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import parse_qs, quote, urlencode, urlparse
 
-from pytubefix.cipher import Cipher
+from pytubefix.cipher import Cipher, get_cipher
 from pytubefix.exceptions import HTMLParseError, LiveStreamError, RegexMatchError
 from pytubefix.helpers import regex_search
 from pytubefix.metadata import YouTubeMetadata
-from pytubefix.parser import parse_for_object, parse_for_all_objects
+from pytubefix.parser import parse_for_object, parse_for_all_objects, parse_for_object_from_startpoint
 
 logger = logging.getLogger(__name__)
 
@@ -446,6 +446,57 @@ def apply_po_token(stream_manifest: Dict, vid_info: Dict, po_token: str) -> None
         stream_manifest[i]["url"] = url
 
 
+def decipher_url(stream: Dict, cipher: Cipher) -> str:
+    """Return the url of a single stream with its signature and ``n`` deciphered.
+
+    :param dict stream:
+        A single entry of the stream manifest.
+    :param Cipher cipher:
+        The cipher built from the player that served the manifest.
+    :rtype: str
+    """
+    url: str = stream["url"]
+    parsed_url = urlparse(url)
+
+    # Convert query params off url to dict
+    query_params = parse_qs(parsed_url.query)
+    query_params = {
+        k: v[0] for k, v in query_params.items()
+    }
+
+    # 403 Forbidden fix.
+    if "signature" in url or (
+            "s" not in stream and ("&sig=" in url or "&lsig=" in url)
+    ):
+        # For certain videos, YouTube will just provide them pre-signed, in
+        # which case there's no real magic to download them and we can skip
+        # the whole signature descrambling entirely.
+        logger.debug("signature found, skip decipher")
+
+    else:
+        signature = cipher.get_sig(ciphered_signature=stream["s"])
+
+        logger.debug(
+            "finished descrambling signature for itag=%s", stream["itag"]
+        )
+
+        query_params['sig'] = signature
+
+    if 'n' in query_params.keys():
+        # For WEB-based clients, YouTube sends an "n" parameter that throttles download speed.
+        # To decipher the value of "n", we must interpret the player's JavaScript.
+        # The cipher remembers every value it has already deciphered.
+
+        initial_n = query_params['n']
+        logger.debug(f'Parameter n is: {initial_n}')
+
+        new_n = cipher.get_nsig(initial_n)
+        query_params['n'] = new_n
+        logger.debug(f'Parameter n deciphered: {new_n}')
+
+    return f'{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}?{urlencode(query_params)}'  # noqa:E501
+
+
 def apply_signature(stream_manifest: Dict, vid_info: Dict, js: str, url_js: str) -> None:
     """Apply the decrypted signature to the stream manifest.
 
@@ -457,12 +508,9 @@ def apply_signature(stream_manifest: Dict, vid_info: Dict, js: str, url_js: str)
         Full base.js url
 
     """
-    cipher = Cipher(js=js, js_url=url_js)
-    discovered_n = dict()
+    cipher = get_cipher(js=js, js_url=url_js)
     for i, stream in enumerate(stream_manifest):
-        try:
-            url: str = stream["url"]
-        except KeyError:
+        if "url" not in stream:
             live_stream = (
                 vid_info.get("playabilityStatus", {}, )
                 .get("liveStreamability")
@@ -470,55 +518,7 @@ def apply_signature(stream_manifest: Dict, vid_info: Dict, js: str, url_js: str)
             if live_stream:
                 raise LiveStreamError("UNKNOWN")
 
-        parsed_url = urlparse(url)
-
-        # Convert query params off url to dict
-        query_params = parse_qs(urlparse(url).query)
-        query_params = {
-            k: v[0] for k, v in query_params.items()
-        }
-
-        # 403 Forbidden fix.
-        if "signature" in url or (
-                "s" not in stream and ("&sig=" in url or "&lsig=" in url)
-        ):
-            # For certain videos, YouTube will just provide them pre-signed, in
-            # which case there's no real magic to download them and we can skip
-            # the whole signature descrambling entirely.
-            logger.debug("signature found, skip decipher")
-
-        else:
-            signature = cipher.get_sig(ciphered_signature=stream["s"])
-
-            logger.debug(
-                "finished descrambling signature for itag=%s", stream["itag"]
-            )
-
-            query_params['sig'] = signature
-
-        if 'n' in query_params.keys():
-            # For WEB-based clients, YouTube sends an "n" parameter that throttles download speed.
-            # To decipher the value of "n", we must interpret the player's JavaScript.
-
-            initial_n = query_params['n']
-            logger.debug(f'Parameter n is: {initial_n}')
-
-            # Check if any previous stream decrypted the parameter
-            if initial_n not in discovered_n:
-                discovered_n[initial_n] = cipher.get_nsig(initial_n)
-            else:
-                logger.debug('Parameter n found skipping decryption')
-
-            new_n = discovered_n[initial_n]
-            query_params['n'] = new_n
-            logger.debug(f'Parameter n deciphered: {new_n}')
-
-        url = f'{parsed_url.scheme}://{parsed_url.netloc}{parsed_url.path}?{urlencode(query_params)}'  # noqa:E501
-
-        stream_manifest[i]["url"] = url
-
-    cipher.runner_sig.close()
-    cipher.runner_nsig.close()
+        stream_manifest[i]["url"] = decipher_url(stream, cipher)
 
 
 def apply_descrambler(stream_data: Dict) -> Optional[List[Dict]]:
@@ -556,7 +556,7 @@ def apply_descrambler(stream_data: Dict) -> Optional[List[Dict]]:
             data['url'] = cipher_url['url'][0]
             data['s'] = cipher_url['s'][0]
             data['is_sabr'] = False
-        elif 'url' not in data and 'signatureCipher' not in data:
+        elif 'url' not in data and 'serverAbrStreamingUrl' in stream_data:
             data['url'] = stream_data['serverAbrStreamingUrl']
             data['is_sabr'] = True
         data['is_otf'] = data.get('type') == 'FORMAT_STREAM_TYPE_OTF'
@@ -612,6 +612,148 @@ def initial_player_response(watch_html: str) -> str:
     )
 
 
+class PageObjects:
+    """All the javascript objects embedded in a single page.
+
+    The page is scanned once with a combined regex that records where every
+    known assignment (``ytInitialData``, ``ytInitialPlayerResponse``,
+    ``ytplayer.config``, ``ytcfg``) starts. The objects themselves are only
+    parsed the first time they are accessed and are cached afterwards.
+
+    :param str html:
+        The html contents of the watch page.
+    """
+
+    # Every assignment starts with "yt", which lets the regex engine jump
+    # between candidates with a literal prefix search instead of trying
+    # each alternative at every position of the page.
+    _pattern = re.compile(
+        r"yt(?:(?P<initial_data>InitialData(?P<initial_data_quote>['\"]\])?\s*=\s*)"
+        r"|(?P<player_response>InitialPlayerResponse(?P<player_response_quote>['\"]\])?\s*=\s*)"
+        r"|(?P<player_config>player\.config\s*=\s*)"
+        r"|(?P<ytcfg_assign>cfg\s=\s)"
+        r"|(?P<ytcfg_set>cfg\.set\())"
+    )
+    _js_path_pattern = re.compile(r"(/s/player/[\w\d]+/[\w\d_/.]+/base\.js)")
+
+    def __init__(self, html: str):
+        self.html = html
+        self._offsets: Dict[str, List[int]] = {}
+        self._cache: Dict[str, Any] = {}
+
+        for match in self._pattern.finditer(html):
+            name = match.lastgroup
+            if name in ('initial_data', 'player_response') and match.group(f'{name}_quote'):
+                # Only the window['ytInitial...'] form is quoted
+                if html[max(match.start() - 8, 0):match.start() - 1] != 'window[':
+                    continue
+                name = f'{name}_window'
+            self._offsets.setdefault(name, []).append(match.end())
+
+    @classmethod
+    def from_objects(cls, **objects: Any) -> 'PageObjects':
+        """Build the objects of a page that was already parsed, without its html.
+
+        Objects that are not given behave as if they were not found in the page.
+
+        :param objects:
+            The parsed objects by property name, e.g. ``js_url``.
+        :rtype: :class:`PageObjects <PageObjects>`
+        """
+        page_objects = cls('')
+        page_objects._cache.update(objects)
+        return page_objects
+
+    def _first_object(self, *names: str) -> Any:
+        """Parse the first object found for each group name, in order.
+
+        Like :func:`parse_for_object <parse_for_object>`, only the first
+        match of each pattern is tried.
+        """
+        for name in names:
+            offsets = self._offsets.get(name)
+            if not offsets:
+                continue
+            try:
+                return parse_for_object_from_startpoint(self.html, offsets[0])
+            except HTMLParseError:
+                continue
+        raise HTMLParseError(f'No matches for {names}')
+
+    def _cached(self, key: str, loader) -> Any:
+        if key not in self._cache:
+            self._cache[key] = loader()
+        return self._cache[key]
+
+    @property
+    def initial_data(self) -> dict:
+        """The ytInitialData object, see :func:`initial_data <initial_data>`."""
+        def load():
+            try:
+                return self._first_object('initial_data_window', 'initial_data')
+            except HTMLParseError:
+                raise RegexMatchError(caller='initial_data', pattern='initial_data_pattern')
+        return self._cached('initial_data', load)
+
+    @property
+    def initial_player_response(self) -> dict:
+        """The ytInitialPlayerResponse object,
+        see :func:`initial_player_response <initial_player_response>`."""
+        def load():
+            try:
+                return self._first_object('player_response_window', 'player_response')
+            except HTMLParseError:
+                raise RegexMatchError(
+                    caller='initial_player_response',
+                    pattern='initial_player_response_pattern'
+                )
+        return self._cached('initial_player_response', load)
+
+    @property
+    def ytplayer_config(self) -> Any:
+        """The player config, see :func:`get_ytplayer_config <get_ytplayer_config>`."""
+        def load():
+            try:
+                return self._first_object('player_config', 'player_response')
+            except HTMLParseError:
+                # The setConfig() pattern is greedy and very rare, so it is
+                # not part of the combined scan.
+                return get_ytplayer_config(self.html)
+        return self._cached('ytplayer_config', load)
+
+    @property
+    def ytcfg(self) -> dict:
+        """The merged ytcfg object, see :func:`get_ytcfg <get_ytcfg>`."""
+        def load():
+            ytcfg = {}
+            # Like get_ytcfg, the ``ytcfg = {...}`` objects are merged first
+            # and the ``ytcfg.set(...)`` calls override them
+            start_points = self._offsets.get('ytcfg_assign', []) + self._offsets.get('ytcfg_set', [])
+            for start_point in start_points:
+                try:
+                    ytcfg.update(parse_for_object_from_startpoint(self.html, start_point))
+                except HTMLParseError:
+                    continue
+            if ytcfg:
+                return ytcfg
+            raise RegexMatchError(caller="get_ytcfg", pattern="ytcfg_pattenrs")
+        return self._cached('ytcfg', load)
+
+    @property
+    def js_url(self) -> str:
+        """The base JavaScript url, see :func:`js_url <js_url>`."""
+        def load():
+            try:
+                base_js = self.ytplayer_config['assets']['js']
+            except (KeyError, RegexMatchError):
+                match = self._js_path_pattern.search(self.html)
+                if not match:
+                    raise RegexMatchError(caller="get_ytplayer_js", pattern="js_url_patterns")
+                base_js = match.group(1)
+            return f"https://youtube.com{base_js}"
+        return self._cached('js_url', load)
+
+
 def metadata(initial_data) -> Optional[YouTubeMetadata]:
     """Get the informational metadata for the video.
 
@@ -5,15 +5,18 @@ interfaces returns raw results. These should instead be parsed to extract
 the useful information for the end user.
 """
 # Native python imports
-import json
 import os
 import pathlib
 import time
-from typing import Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Tuple
 from urllib import parse
 
-from pytubefix import request
+from pytubefix import jsonlib, request
 from pytubefix.helpers import reset_cache
+from pytubefix.response_cache import response_cache
+from pytubefix.token_store import token_store
 
 # YouTube on TV client secrets
 _client_id = '861556708454-d6dlm3lh05idd8npek18k6be8ba3oc68.apps.googleusercontent.com'
@@ -511,6 +514,8 @@ _default_clients = {
     }
 }
 _token_timeout = 1800
+# Bearer tokens are refreshed this many seconds before they expire
+_token_refresh_margin = 300
 _cache_dir = pathlib.Path(__file__).parent.resolve() / '__cache__'
 _token_file = os.path.join(_cache_dir, 'tokens.json')
 
@@ -531,6 +536,68 @@ def _default_po_token_verifier() -> Tuple[str, str]:
     return visitor_data, po_token
 
 
+def _is_cacheable(endpoint: str, response: dict) -> bool:
+    """Whether a response can be reused for identical requests.
+
+    Errors and unplayable videos are not cached, so that retrying with a
+    different visitorData or poToken is not answered from the cache.
+    """
+    if 'error' in response:
+        return False
+    if endpoint == 'player':
+        return response.get('playabilityStatus', {}).get('status') == 'OK'
+    return True
+
+
+class _ClientTemplate:
+    """Frozen request body of a client.
+
+    The static part of the body, the ``context.client`` object, is serialized
+    once, and every request body is built by appending the fields that change
+    from request to request. Nothing in the template is ever modified, so it
+    can be shared by any number of threads.
+    """
+    __slots__ = ('client', '_client_json')
+
+    def __init__(self, innertube_context: dict):
+        client = innertube_context['context']['client']
+        self.client = MappingProxyType(dict(client))
+        # Without the closing brace, so more fields can be appended
+        self._client_json = jsonlib.dumps(client)[:-1]
+
+    def body(self, client_fields: Dict, fields: Dict) -> str:
+        """Serialize a request body.
+
+        :param dict client_fields:
+            Fields added to ``context.client``, such as the visitorData.
+        :param dict fields:
+            Fields added next to ``context``, such as the videoId.
+        :rtype: str
+        """
+        if not self.client or any(key in self.client for key in client_fields):
+            client = dict(self.client, **client_fields)
+            return jsonlib.dumps({'context': {'client': client}, **fields})
+
+        parts = ['{"context":{"client":', self._client_json]
+        for key, value in client_fields.items():
+            parts.append(f',{jsonlib.dumps(key)}:{jsonlib.dumps(value)}')
+        parts.append('}}')
+        for key, value in fields.items():
+            parts.append(f',{jsonlib.dumps(key)}:{jsonlib.dumps(value)}')
+        parts.append('}')
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=None)
+def _client_template(client: str) -> _ClientTemplate:
+    """Return the frozen template of a client.
+
+    Templates are built from ``_default_clients`` the first time a client is
+    used, call ``_client_template.cache_clear()`` after changing it.
+    """
+    return _ClientTemplate(_default_clients[client]['innertube_context'])
+
+
 class InnerTube:
     """Object for interacting with the innertube API."""
 
@@ -542,7 +609,8 @@ class InnerTube:
             token_file=None,
             oauth_verifier=None,
             use_po_token=False,
-            po_token_verifier=None
+            po_token_verifier=None,
+            use_cache=True
 
     ):
         """Initialize an InnerTube object.
@@ -570,9 +638,18 @@ class InnerTube:
             (Optional) Verified used to obtain the visitorData and po_token.
             The verifier will return the visitorData and po_token respectively.
             (if passed, else default verifier will be used)
+        :param bool use_cache:
+            (Optional) Reuse the responses of identical requests made recently,
+            see :mod:`pytubefix.response_cache`. Requests authenticated with
+            oauth are never cached.
         """
         self.client_name = client
-        self.innertube_context = _default_clients[client]['innertube_context']
+        # Requests are built from a frozen template shared by every instance,
+        # only the fields inserted into this instance are kept here.
+        self._template = _client_template(client)
+        self._client_fields: Dict = {}
+        self._context_fields: Dict = {}
+        self._innertube_context = None
         self.header = _default_clients[client]['header']
         self.api_key = _default_clients[client]['api_key']
         self.require_js_player = _default_clients[client]['require_js_player']
@@ -584,6 +661,9 @@ class InnerTube:
         self.access_visitorData = None
 
         self.use_oauth = use_oauth
+        self.use_cache = use_cache
+        # Whether the last response was answered from the response cache
+        self.from_cache = False
         self.allow_cache = allow_cache
         self.oauth_verifier = oauth_verifier or _default_oauth_verifier
 
@@ -596,23 +676,34 @@ class InnerTube:
         if not self.allow_cache:
             reset_cache()
 
-        # Try to load from file if specified
+        # Try to load from file if specified, the file is shared by every
+        # instance through the same store and only read again when it changes
         self.token_file = token_file or _token_file
-        if self.use_oauth and self.allow_cache and os.path.exists(self.token_file):
-            with open(self.token_file) as f:
-                data = json.load(f)
-                if data['access_token']:
-                    self.access_token = data['access_token']
-                    self.refresh_token = data['refresh_token']
-                    self.expires = data['expires']
-                    self.refresh_bearer_token()
-
-        if self.use_po_token and self.allow_cache and os.path.exists(self.token_file):
-            with open(self.token_file) as f:
-                data = json.load(f)
+        self._token_store = token_store(self.token_file) if self.allow_cache else None
+        if self.use_oauth and self._token_store and self._load_oauth_tokens():
+            self.refresh_bearer_token()
+
+        if self.use_po_token and self._token_store:
+            data = self._token_store.read()
+            if data:
                 self.access_visitorData = data['visitorData']
                 self.access_po_token = data['po_token']
 
+    def _load_oauth_tokens(self) -> bool:
+        """Load the OAuth tokens from the token store.
+
+        :rtype: bool
+        :returns:
+            Whether the store has an access token.
+        """
+        data = self._token_store.read()
+        if not data.get('access_token'):
+            return False
+        self.access_token = data['access_token']
+        self.refresh_token = data['refresh_token']
+        self.expires = data['expires']
+        return True
+
     def cache_tokens(self):
         """Cache tokens to file if allowed."""
         if not self.allow_cache:
@@ -625,11 +716,7 @@ class InnerTube:
             'visitorData': self.access_visitorData,
             'po_token': self.access_po_token
         }
-        cacheDir = os.path.dirname(self.token_file)
-        if not os.path.exists(cacheDir):
-            os.makedirs(cacheDir, exist_ok=True)
-        with open(self.token_file, 'w') as f:
-            json.dump(data, f)
+        self._token_store.write(data)
 
     def refresh_bearer_token(self, force=False):
         """Refreshes the OAuth token if necessary.
@@ -639,10 +726,23 @@ class InnerTube:
         """
         if not self.use_oauth:
             return
-        # Skip refresh if it's not necessary and not forced
-        if self.expires > time.time() and not force:
+        # Skip refresh if it's not necessary and not forced.
+        # The token is refreshed a bit before it expires, so that it doesn't
+        # expire in the middle of a download.
+        if self.expires > time.time() + _token_refresh_margin and not force:
             return
 
+        if self._token_store:
+            with self._token_store.lock():
+                # Another instance or process may have refreshed it while waiting for the lock
+                if not force and self._load_oauth_tokens() and self.expires > time.time() + _token_refresh_margin:
+                    return
+                self._refresh_bearer_token()
+        else:
+            self._refresh_bearer_token()
+
+    def _refresh_bearer_token(self):
+        """Request a new access token with the refresh token."""
         # Subtracting 30 seconds is arbitrary to avoid potential time discrepencies
         start_time = int(time.time() - 30)
         data = {
@@ -659,7 +759,7 @@ class InnerTube:
             },
             data=data
         )
-        response_data = json.loads(response.read())
+        response_data = jsonlib.loads(response.read())
 
         self.access_token = response_data['access_token']
         self.expires = start_time + response_data['expires_in']
@@ -681,7 +781,7 @@ class InnerTube:
             },
             data=data
         )
-        response_data = json.loads(response.read())
+        response_data = jsonlib.loads(response.read())
         verification_url = response_data['verification_url']
         user_code = response_data['user_code']
         self.oauth_verifier(verification_url, user_code)
@@ -700,20 +800,44 @@ class InnerTube:
             },
             data=data
         )
-        response_data = json.loads(response.read())
+        response_data = jsonlib.loads(response.read())
 
         self.access_token = response_data['access_token']
         self.refresh_token = response_data['refresh_token']
         self.expires = start_time + response_data['expires_in']
         self.cache_tokens()
 
+    @property
+    def innertube_context(self) -> dict:
+        """The json context sent with every request of this instance.
+
+        It is only built when accessed. Changes made to it are sent with the
+        following requests, but prefer :meth:`update_context` and
+        :meth:`insert_visitor_data`, which don't need it.
+
+        :rtype: dict
+        """
+        if self._innertube_context is None:
+            self._innertube_context = jsonlib.loads(
+                self._template.body(self._client_fields, self._context_fields)
+            )
+        return self._innertube_context
+
+    def update_context(self, fields: dict) -> None:
+        """
+        Add fields to the body of every request of this instance, such as the signature timestamp
+        """
+        self._context_fields.update(fields)
+        if self._innertube_context is not None:
+            self._innertube_context.update(fields)
+
     def insert_visitor_data(self, visitor_data: str) -> None:
         """
         Insert visitorData in the API request
         """
-        self.innertube_context['context']['client'].update({
-            "visitorData": visitor_data
-        })
+        self._client_fields["visitorData"] = visitor_data
+        if self._innertube_context is not None:
+            self._innertube_context['context']['client']["visitorData"] = visitor_data
 
     def insert_po_token(self, visitor_data:str=None, po_token:str=None) -> None:
         """
@@ -721,7 +845,7 @@ class InnerTube:
         """
         self.insert_visitor_data(self.access_visitorData or visitor_data)
 
-        self.innertube_context.update({
+        self.update_context({
             "serviceIntegrityDimensions": {
                 "poToken": self.access_po_token or po_token
             }
@@ -753,6 +877,21 @@ class InnerTube:
             'prettyPrint': "false"
         }
 
+    def _build_body(self, data: dict) -> bytes:
+        """Serialize the body of a request.
+
+        :param dict data:
+            The fields of this request, added next to the context.
+            A complete body, containing its own context, is sent as is.
+        :rtype: bytes
+        """
+        if 'context' in data:
+            return jsonlib.dumps_bytes(data)
+        if self._innertube_context is not None:
+            return jsonlib.dumps_bytes({**self._innertube_context, **data})
+        body = self._template.body(self._client_fields, {**self._context_fields, **data})
+        return bytes(body, encoding="utf-8")
+
     def _call_api(self, endpoint, query, data):
         """Make a request to a given endpoint with the provided query parameters and data."""
         # When YouTube used an API key, it was necessary to remove it when using oauth
@@ -781,13 +920,30 @@ class InnerTube:
 
         headers.update(self.header)
 
+        body = self._build_body(data)
+        endpoint_name = endpoint.rsplit('/', 1)[-1]
+
+        # Responses to authenticated requests are specific to the account
+        cache_key = None
+        self.from_cache = False
+        if self.use_cache and not self.use_oauth and response_cache.ttl(endpoint_name) > 0:
+            cache_key = response_cache.key(endpoint_url, self.client_name, body)
+            cached = response_cache.get(endpoint_name, cache_key)
+            if cached is not None:
+                self.from_cache = True
+                return jsonlib.loads(cached)
+
         response = request._execute_request(
             endpoint_url,
             'POST',
             headers=headers,
-            data=data
+            data=body
         )
-        return json.loads(response.read())
+        raw_response = response.read()
+        result = jsonlib.loads(raw_response)
+        if cache_key is not None and _is_cacheable(endpoint_name, result):
+            response_cache.set(endpoint_name, cache_key, raw_response)
+        return result
 
     def browse(self, continuation=None, visitor_data=None):
         """Make a request to the browse endpoint.
@@ -803,13 +959,14 @@ class InnerTube:
         endpoint = f'{self.base_url}/browse'
 
         query = self.base_params
+        data = {}
 
         if continuation:
-            self.base_data.update({"continuation": continuation})
+            data["continuation"] = continuation
         if visitor_data:
-            self.base_data['context']['client'].update({"visitorData": visitor_data})
+            self.insert_visitor_data(visitor_data)
 
-        return self._call_api(endpoint, query, self.base_data)
+        return self._call_api(endpoint, query, data)
 
     def reel(self):
         """Make a request to the reel endpoint.
@@ -850,16 +1007,17 @@ class InnerTube:
             Raw player details results.
         """
 
+        data = {}
         if continuation:
-            self.base_data.update({"continuation": continuation})
+            data["continuation"] = continuation
 
         if video_id:
-            self.base_data.update({'videoId': video_id, 'contentCheckOk': "true"})
+            data.update({'videoId': video_id, 'contentCheckOk': "true"})
 
         endpoint = f'{self.base_url}/next'
         query = self.base_params
 
-        return self._call_api(endpoint, query, self.base_data)
+        return self._call_api(endpoint, query, data)
 
     def player(self, video_id):
         """Make a request to the player endpoint.
@@ -873,8 +1031,8 @@ class InnerTube:
         endpoint = f'{self.base_url}/player'
         query = self.base_params
 
-        self.base_data.update({'videoId': video_id, 'contentCheckOk': "true"})
-        return self._call_api(endpoint, query, self.base_data)
+        data = {'videoId': video_id, 'contentCheckOk': "true"}
+        return self._call_api(endpoint, query, data)
 
     def search(self, search_query, continuation=None, data=None):
         """Make a request to the search endpoint.
@@ -891,12 +1049,11 @@ class InnerTube:
         """
         endpoint = f'{self.base_url}/search'
         query = self.base_params
-        data = data if data else {}
-   
-        self.base_data.update({'query': search_query})
+        data = dict(data) if data else {}
+
+        data['query'] = search_query
         if continuation:
             data['continuation'] = continuation
-        data.update(self.base_data)
         return self._call_api(endpoint, query, data)
 
     def verify_age(self, video_id):
@@ -923,7 +1080,6 @@ class InnerTube:
             },
             'setControvercy': True
         }
-        data.update(self.base_data)
         result = self._call_api(endpoint, self.base_params, data)
         return result
 
@@ -937,5 +1093,5 @@ class InnerTube:
             'videoId': video_id,
         }
         query.update(self.base_params)
-        result = self._call_api(endpoint, query, self.base_data)
+        result = self._call_api(endpoint, query, {})
         return result
@@ -0,0 +1,62 @@
+"""JSON encoding and decoding for the hot paths.
+
+Player, browse and search responses are large, and they are decoded for every
+video. When `orjson <https://github.com/ijl/orjson>`_ is installed it is used
+to do it, otherwise the standard library is. Both accept the raw ``bytes`` of a
+response, so there is no need to decode them to ``str`` first.
+"""
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Name of the library in use, ``orjson`` or ``json``
+backend = 'orjson' if orjson is not None else 'json'
+
+# orjson.JSONDecodeError is a subclass of it, so it catches the errors of both
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Deserialize a JSON document.
+
+    :param data:
+        The document, as text or as the raw bytes of a response.
+    :rtype: Any
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def dumps_bytes(obj: Any) -> bytes:
+    """Serialize an object to UTF-8 encoded JSON, ready to be sent.
+
+    :param obj:
+        The object to serialize.
+    :rtype: bytes
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # Integers larger than 64 bits, for example, are only handled by json
+            pass
+    return json.dumps(obj).encode('utf-8')
+
+
+def dumps(obj: Any) -> str:
+    """Serialize an object to a JSON string.
+
+    :param obj:
+        The object to serialize.
+    :rtype: str
+    """
+    if orjson is not None:
+        return dumps_bytes(obj).decode('utf-8')
+    return json.dumps(obj)
@@ -1,8 +1,13 @@
 import ast
 import json
 import re
+from pytubefix import jsonlib
 from pytubefix.exceptions import HTMLParseError
 
+# Shared decoder so ``raw_decode`` can be pointed at an offset inside the
+# page without slicing a copy of the (often megabyte sized) html.
+_json_decoder = json.JSONDecoder()
+
 
 def parse_for_all_objects(html, preceding_regex):
     """Parses input html to find all matches for the input starting point.
@@ -132,9 +137,20 @@ def parse_for_object_from_startpoint(html, start_point):
     :returns:
         A dict created from parsing the object.
     """
+    if html[start_point:start_point + 1] not in ('{', '['):
+        raise HTMLParseError(f'Invalid start point. Start of HTML:\n{html[start_point:start_point + 20]}')
+
+    # Most embedded objects are plain JSON, so decode them in place first and
+    # only fall back to the character scanner for javascript-flavoured objects.
+    try:
+        obj, _ = _json_decoder.raw_decode(html, start_point)
+        return obj
+    except json.decoder.JSONDecodeError:
+        pass
+
     full_obj = find_object_from_startpoint(html, start_point)
     try:
-        return json.loads(full_obj)
+        return jsonlib.loads(full_obj)
     except json.decoder.JSONDecodeError:
         try:
             return ast.literal_eval(full_obj)
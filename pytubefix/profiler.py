@@ -0,0 +1,377 @@
+"""Keep track of how well each client performs.
+
+Clients differ a lot in how expensive they are: some need the js player to
+decipher the signature and the throttling parameter, others need a poToken,
+and some of them stop working for a while. :class:`ClientProfiler` records
+the success rate, latency, decipher cost and download throughput of every
+client, and uses them to pick the cheapest client that currently works.
+Clients that haven't been measured enough are only tried first when no
+measured client works, or now and then to measure them when exploration is
+enabled.
+"""
+import atexit
+import json
+import logging
+import math
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pytubefix.innertube import _cache_dir, _default_clients
+
+logger = logging.getLogger(__name__)
+
+_default_client = 'ANDROID_VR'
+_profile_file = os.path.join(_cache_dir, 'client_profile.json')
+
+
+class ClientStats:
+    """Counters recorded for a single client."""
+
+    def __init__(
+            self,
+            requests: int = 0,
+            successes: int = 0,
+            unavailable: int = 0,
+            latency: float = 0.0,
+            deciphers: int = 0,
+            decipher_time: float = 0.0,
+            downloaded_bytes: int = 0,
+            download_time: float = 0.0
+    ):
+        self.requests = requests
+        self.successes = successes
+        self.unavailable = unavailable
+        self.latency = latency
+        self.deciphers = deciphers
+        self.decipher_time = decipher_time
+        self.downloaded_bytes = downloaded_bytes
+        self.download_time = download_time
+
+    @property
+    def success_rate(self) -> float:
+        """Fraction of the player requests with an OK status that returned streams.
+
+        A client whose every response was unavailable has a rate of 0.
+        """
+        available = self.requests - self.unavailable
+        return self.successes / available if available > 0 else 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Mean duration of a player request, in seconds."""
+        return self.latency / self.requests if self.requests else 0.0
+
+    @property
+    def mean_decipher_time(self) -> float:
+        """Mean time spent deciphering a stream url, in seconds."""
+        return self.decipher_time / self.deciphers if self.deciphers else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Mean download speed, in bytes per second."""
+        return self.downloaded_bytes / self.download_time if self.download_time else 0.0
+
+    def to_dict(self) -> Dict:
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ClientStats':
+        return cls(**{k: v for k, v in data.items() if k in vars(cls())})
+
+    def __repr__(self):
+        return (
+            f'<pytubefix.profiler.ClientStats: requests={self.requests}, '
+            f'success_rate={self.success_rate:.2f}, mean_latency={self.mean_latency:.3f}s, '
+            f'mean_decipher_time={self.mean_decipher_time:.3f}s, throughput={self.throughput:.0f}B/s>'
+        )
+
+
+class ClientProfiler:
+    """Records the performance of each client and picks the cheapest one that works."""
+
+    def __init__(
+            self,
+            min_samples: int = 3,
+            min_success_rate: float = 0.5,
+            explore_every: int = 0,
+            download_size: int = 10 * 1024 * 1024
+    ):
+        """Construct a :class:`ClientProfiler <ClientProfiler>`.
+
+        :param int min_samples:
+            (Optional) Number of player requests needed before a client is
+            ranked by its recorded statistics.
+        :param float min_success_rate:
+            (Optional) Clients with a lower success rate are considered broken.
+        :param int explore_every:
+            (Optional) One in this many choices picks a client that hasn't been
+            measured yet instead of the cheapest measured one. Disabled by default.
+        :param int download_size:
+            (Optional) Size of a typical download in bytes, the time to download
+            it at the recorded throughput is part of the cost of a client.
+        """
+        self.min_samples = min_samples
+        self.min_success_rate = min_success_rate
+        self.explore_every = explore_every
+        self.download_size = download_size
+        self._choices = 0
+        self._stats: Dict[str, ClientStats] = {}
+        self._lock = threading.Lock()
+        self._persist_path: Optional[str] = None
+
+    def _client_stats(self, client: str) -> ClientStats:
+        if client not in self._stats:
+            self._stats[client] = ClientStats()
+        return self._stats[client]
+
+    def record_request(self, client: str, latency: float, success: bool, unavailable: bool = False) -> None:
+        """Record a player request.
+
+        :param str client:
+            Client used for the request.
+        :param float latency:
+            Duration of the request, in seconds.
+        :param bool success:
+            Whether the response had usable streams.
+        :param bool unavailable:
+            (Optional) Whether the response didn't have an OK status.
+        """
+        with self._lock:
+            stats = self._client_stats(client)
+            stats.requests += 1
+            stats.successes += int(success)
+            stats.unavailable += int(unavailable)
+            stats.latency += latency
+
+    def record_player_response(self, client: str, response: Dict, latency: float) -> None:
+        """Record a player request from its response.
+
+        The other statuses than OK, such as a login required, an unplayable,
+        private or age-restricted video, mostly depend on the video or the
+        account rather than the client. They are recorded as unavailable: they
+        count as samples but not in the success rate, so a client that never
+        gets an OK response ends up with a rate of 0 instead of staying
+        unmeasured.
+
+        :param str client:
+            Client used for the request.
+        :param dict response:
+            Content of the player's response.
+        :param float latency:
+            Duration of the request, in seconds.
+        """
+        if response.get('playabilityStatus', {}).get('status') != 'OK':
+            self.record_request(client, latency, False, unavailable=True)
+            return
+        self.record_request(client, latency, 'streamingData' in response)
+
+    def record_decipher(self, client: str, seconds: float) -> None:
+        """Record the time spent deciphering a stream url.
+
+        :param str client:
+            Client the stream was obtained with.
+        :param float seconds:
+            Time spent deciphering.
+        """
+        with self._lock:
+            stats = self._client_stats(client)
+            stats.deciphers += 1
+            stats.decipher_time += seconds
+
+    def record_download(self, client: str, downloaded_bytes: int, seconds: float) -> None:
+        """Record a finished download.
+
+        :param str client:
+            Client the stream was obtained with.
+        :param int downloaded_bytes:
+            Number of bytes downloaded.
+        :param float seconds:
+            Duration of the download.
+        """
+        with self._lock:
+            stats = self._client_stats(client)
+            stats.downloaded_bytes += downloaded_bytes
+            stats.download_time += seconds
+
+    def stats(self) -> Dict[str, ClientStats]:
+        """Return a copy of the statistics of every client seen so far.
+
+        :rtype: Dict[str, ClientStats]
+        """
+        with self._lock:
+            return {client: ClientStats(**stats.to_dict()) for client, stats in self._stats.items()}
+
+    def cost(self, client: str) -> Optional[float]:
+        """Measured cost of getting and downloading streams with a client, in seconds.
+
+        The latency and decipher time of the player requests are scaled by how
+        often they fail, and the time to download ``download_size`` bytes at the
+        recorded throughput is added. Clients without downloads are assumed to
+        have the mean throughput of the others.
+
+        :param str client:
+            Name of the client.
+        :rtype: float
+        :returns:
+            The cost, infinite for a broken client, or None while the client
+            has fewer than ``min_samples`` requests.
+        """
+        with self._lock:
+            return self._cost(self._stats.get(client), self._mean_throughput())
+
+    def _cost(self, stats: Optional[ClientStats], default_throughput: float) -> Optional[float]:
+        if stats is None or stats.requests < self.min_samples:
+            return None
+        if stats.success_rate < self.min_success_rate:
+            return math.inf
+        cost = (stats.mean_latency + stats.mean_decipher_time) / stats.success_rate
+        throughput = stats.throughput or default_throughput
+        if throughput:
+            cost += self.download_size / throughput
+        return cost
+
+    def _mean_throughput(self) -> float:
+        throughputs = [stats.throughput for stats in self._stats.values() if stats.throughput]
+        return sum(throughputs) / len(throughputs) if throughputs else 0.0
+
+    def _partition(self, clients: Iterable[str]) -> Tuple[List[str], List[str], List[str]]:
+        # Working measured clients from the cheapest, unmeasured clients from
+        # the cheapest estimate, then broken clients
+        clients = list(clients)
+        with self._lock:
+            default_throughput = self._mean_throughput()
+            costs = {client: self._cost(self._stats.get(client), default_throughput) for client in clients}
+        measured = sorted((c for c in clients if costs[c] is not None and costs[c] < math.inf), key=costs.get)
+        unmeasured = sorted((c for c in clients if costs[c] is None), key=_estimated_cost)
+        broken = [c for c in clients if costs[c] == math.inf]
+        return measured, unmeasured, broken
+
+    def rank(self, clients: Iterable[str]) -> List[str]:
+        """Sort clients from the cheapest to the most expensive.
+
+        Only the clients with ``min_samples`` requests are compared by their
+        measured cost. The clients not measured yet come after the working
+        ones, ordered by what they require, and the broken ones come last.
+        Clients with the same cost keep their order.
+
+        :param Iterable[str] clients:
+            Names of the clients.
+        :rtype: List[str]
+        """
+        measured, unmeasured, broken = self._partition(clients)
+        return measured + unmeasured + broken
+
+    def choose(self, candidates: Optional[Iterable[str]] = None, default: str = _default_client) -> str:
+        """Pick the cheapest client that currently works.
+
+        Every ``explore_every`` choices, a client that hasn't been measured
+        yet is picked instead, so that it gets measured too.
+
+        :param Iterable[str] candidates:
+            (Optional) Clients to choose from, defaults to every known client.
+        :param str default:
+            (Optional) Client preferred when the costs are equal.
+        :rtype: str
+        """
+        candidates = list(candidates) if candidates is not None else list(_default_clients)
+        if default in candidates:
+            candidates.remove(default)
+        candidates.insert(0, default)
+        measured, unmeasured, broken = self._partition(candidates)
+
+        with self._lock:
+            self._choices += 1
+            explore = bool(self.explore_every) and self._choices % self.explore_every == 0
+        if measured and unmeasured and explore:
+            logger.debug(f'Exploring the {unmeasured[0]} client')
+            return unmeasured[0]
+
+        client = (measured + unmeasured + broken)[0]
+        if client != default:
+            logger.debug(f'Choosing the {client} client instead of {default}')
+        return client
+
+    def clear(self) -> None:
+        """Forget every recorded statistic."""
+        with self._lock:
+            self._stats.clear()
+            self._choices = 0
+
+    def load(self, path: str) -> None:
+        """Add the statistics saved in a file to the recorded ones.
+
+        :param str path:
+            Path to a file written by :meth:`save`.
+        """
+        with open(path) as f:
+            data = json.load(f)
+        with self._lock:
+            for client, values in data.items():
+                saved = ClientStats.from_dict(values)
+                stats = self._client_stats(client)
+                for name, value in saved.to_dict().items():
+                    setattr(stats, name, getattr(stats, name) + value)
+
+    def save(self, path: str) -> None:
+        """Write the recorded statistics to a file.
+
+        :param str path:
+            Path to the file.
+        """
+        with self._lock:
+            data = {client: stats.to_dict() for client, stats in self._stats.items()}
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def persist(self, path: Optional[str] = None) -> None:
+        """Keep the statistics across runs.
+
+        The statistics saved in the file are loaded now, and the file is
+        updated when the interpreter exits.
+
+        :param str path:
+            (Optional) Path to the file. Defaults to the pytubefix/__cache__ directory.
+        """
+        path = path or _profile_file
+        if path == self._persist_path:
+            return
+        if os.path.exists(path):
+            try:
+                self.load(path)
+            except (OSError, ValueError, TypeError) as e:
+                logger.warning(f'Unable to load the client profile from {path}: {e}')
+        if self._persist_path is None:
+            atexit.register(self._save_on_exit)
+        self._persist_path = path
+
+    def _save_on_exit(self) -> None:
+        try:
+            self.save(self._persist_path)
+        except OSError as e:
+            logger.warning(f'Unable to save the client profile to {self._persist_path}: {e}')
+
+
+def _estimated_cost(client: str) -> float:
+    """Estimated cost of a client, orders the clients that haven't been measured yet.
+
+    :param str client:
+        Name of the client.
+    :rtype: float
+    """
+    requirements = _default_clients.get(client, {})
+    cost = 1.0
+    if requirements.get('require_js_player'):
+        cost += 1.0
+    if requirements.get('require_po_token'):
+        cost += 1.0
+    return cost
+
+
+# Used by default by YouTube and AsyncYouTube
+client_profiler = ClientProfiler()
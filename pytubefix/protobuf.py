@@ -54,6 +54,9 @@ class WireType(enum.IntEnum):
     I32 = 5
 
 
+# Looking the wire type up is faster than building the enum member
+_wire_types = tuple(WireType)
+
 _float_struct = struct.Struct(b"<f")
 _double_struct = struct.Struct(b"<d")
 
@@ -67,14 +70,15 @@ def _encode(data) -> bytes:
 
 
 def _decode(data):
-    reader = data if isinstance(data, io.BufferedIOBase) else io.BytesIO(data)
+    # Records are read from the buffer in place instead of one byte at a time from a stream
+    data = data.read() if isinstance(data, io.BufferedIOBase) else data
     result = defaultdict(list)
 
-    record = _read_record(reader)
+    record = _read_record(data, 0)
     while record:
-        key, value = record
+        key, value, position = record
         result[key].append(value)
-        record = _read_record(reader)
+        record = _read_record(data, position)
 
     for key, values in result.items():
         for index, value in enumerate(values):
@@ -88,24 +92,28 @@ def _decode(data):
     return dict(result)
 
 
-def _read_record(reader: io.BufferedIOBase):
-    tag = _read_tag(reader)
+def _read_record(data: bytes, position: int):
+    tag, position = _read_tag(data, position)
     if tag is None:
         return None
     wire_id, wire_type = tag
     if wire_type == WireType.VARINT:
-        value = _read_varint(reader)
+        value, position = _read_varint(data, position)
     elif wire_type == WireType.I64:
-        value = reader.read(8)
+        value = data[position:position + 8]
+        position += 8
     elif wire_type == WireType.I32:
-        value = reader.read(4)
+        value = data[position:position + 4]
+        position += 4
     elif wire_type == WireType.LEN:
-        value = reader.read(_read_varint(reader))
+        length, position = _read_varint(data, position)
+        value = data[position:position + length]
+        position += length
     else:
         message = "Unknown wire type"
         raise TypeError(message)
 
-    return wire_id, value
+    return wire_id, value, position
 
 
 def _encode_record(data, wire_id) -> bytes:
@@ -129,20 +137,20 @@ def _encode_record(data, wire_id) -> bytes:
     return _encode_tag(wire_id, WireType.LEN) + _encode_varint(len(encoded)) + encoded
 
 
-def _read_varint(reader: io.BufferedIOBase):
+def _read_varint(data: bytes, position: int):
     shift = 0
-    data = 0
+    value = 0
 
     byte = 0b1000_0000
     while byte & 0b1000_0000:
-        result = reader.read(1)
-        if not result:
-            return None
-        (byte,) = result
-        data |= (byte & 0b0111_1111) << shift
+        if position >= len(data):
+            return None, position
+        byte = data[position]
+        position += 1
+        value |= (byte & 0b0111_1111) << shift
         shift += 7
 
-    return data
+    return value, position
 
 
 def _encode_varint(value: int) -> bytes:
@@ -156,11 +164,13 @@ def _encode_varint(value: int) -> bytes:
     return bytes(data)
 
 
-def _read_tag(reader: io.BufferedIOBase):
-    value = _read_varint(reader)
+def _read_tag(data: bytes, position: int):
+    value, position = _read_varint(data, position)
     if value is None:
-        return None
-    return value >> 3, WireType(value & 0b111)
+        return None, position
+    if value & 0b111 > WireType.I32:
+        raise ValueError(f"{value & 0b111} is not a valid WireType")
+    return (value >> 3, _wire_types[value & 0b111]), position
 
 
 def _encode_tag(wire_id, wire_type: WireType) -> bytes:
@@ -1,22 +1,118 @@
 """This module provides a query interface for media streams and captions."""
 from collections.abc import Mapping, Sequence
-from typing import Callable, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 
 from pytubefix import Caption, Stream
 from pytubefix.helpers import deprecated
 
 
+class _StreamIndex:
+    """Lookup tables over the streams of a single manifest.
+
+    A filter table is built the first time a query needs it, a sort key the
+    first time its stream is sorted. Both are shared by all the
+    :class:`StreamQuery <StreamQuery>` objects derived from the same manifest, so chained ``filter().order_by()`` calls only look up
+    streams instead of reading their attributes again.
+    """
+
+    # Value each filter criterion is indexed by
+    _keys: Dict[str, Callable[[Stream], Any]] = {
+        'resolution': lambda s: s.resolution,
+        'fps': lambda s: getattr(s, 'fps', None),
+        'mime_type': lambda s: s.mime_type,
+        'type': lambda s: s.type,
+        'subtype': lambda s: s.subtype,
+        'abr': lambda s: s.abr,
+        'video_codec': lambda s: s.video_codec,
+        'audio_codec': lambda s: s.audio_codec,
+        'only_audio': lambda s: s.includes_audio_track and not s.includes_video_track,
+        'only_video': lambda s: s.includes_video_track and not s.includes_audio_track,
+        'progressive': lambda s: s.is_progressive,
+        'adaptive': lambda s: s.is_adaptive,
+        'audio_track_name': lambda s: s.audio_track_name,
+        'is_dash': lambda s: s.is_dash,
+        'is_drc': lambda s: s.is_drc,
+    }
+
+    def __init__(self, fmt_streams: List[Stream]):
+        self.fmt_streams = fmt_streams
+        self._tables: Dict[str, Dict[Any, Set[Stream]]] = {}
+        self._sort_keys: Dict[str, Dict[Stream, Tuple[Any, Optional[int]]]] = {}
+
+    def lookup(self, key: str, *values) -> Set[Stream]:
+        """Get the streams whose ``key`` is equal to any of ``values``."""
+        table = self._tables.get(key)
+        if table is None:
+            table = {}
+            get_value = self._keys[key]
+            for stream in self.fmt_streams:
+                table.setdefault(get_value(stream), set()).add(stream)
+            self._tables[key] = table
+
+        if len(values) == 1:
+            return table.get(values[0], set())
+        return set().union(*(table.get(value, ()) for value in values))
+
+    def sort_keys(self, attribute_name: str, streams: List[Stream]) -> Tuple[Dict[Stream, Any], Dict[Stream, int]]:
+        """Get the sort keys of ``streams`` for ``attribute_name``.
+
+        Keys are only computed for the streams being sorted, since reading
+        attributes like ``filesize`` or ``url`` can request or decipher the
+        stream, and are then kept for the next queries.
+
+        :returns:
+            The raw attribute values, skipping streams where it is None, and
+            the integer form of the string values (e.g. "1080p" -> 1080) for
+            the ones that have digits.
+        """
+        cache = self._sort_keys.setdefault(attribute_name, {})
+        values = {}
+        numeric = {}
+        for stream in streams:
+            key = cache.get(stream)
+            if key is None:
+                key = cache[stream] = self._sort_key(stream, attribute_name)
+            value, number = key
+            if value is None:
+                continue
+            values[stream] = value
+            if number is not None:
+                numeric[stream] = number
+        return values, numeric
+
+    @staticmethod
+    def _sort_key(stream: Stream, attribute_name: str) -> Tuple[Any, Optional[int]]:
+        value = getattr(stream, attribute_name, None)
+        if isinstance(value, str):
+            try:
+                return value, int("".join(filter(str.isdigit, value)))
+            except ValueError:
+                pass
+        return value, None
+
+
 class StreamQuery(Sequence):
     """Interface for querying the available media streams."""
 
-    def __init__(self, fmt_streams):
+    def __init__(self, fmt_streams, _index: Optional[_StreamIndex] = None):
         """Construct a :class:`StreamQuery <StreamQuery>`.
 
         param list fmt_streams:
             list of :class:`Stream <Stream>` instances.
         """
         self.fmt_streams = fmt_streams
-        self.itag_index = {int(s.itag): s for s in fmt_streams}
+        self._index = _index or _StreamIndex(fmt_streams)
+        self._itag_index: Optional[Dict[int, Stream]] = None
+
+    @property
+    def itag_index(self) -> Dict[int, Stream]:
+        if self._itag_index is None:
+            self._itag_index = {int(s.itag): s for s in self.fmt_streams}
+        return self._itag_index
+
+    def _derive(self, fmt_streams: List[Stream]) -> "StreamQuery":
+        """Build a query over a subset of these streams sharing the index."""
+        return StreamQuery(fmt_streams, _index=self._index)
 
     def filter(
         self,
@@ -131,73 +227,71 @@ class StreamQuery(Sequence):
             list or None
 
         """
-        filters = []
+        index = self._index
+        matches = []
         if res or resolution:
             if isinstance(res, str) or isinstance(resolution, str):
-                filters.append(lambda s: s.resolution == (res or resolution))
+                matches.append(index.lookup('resolution', res or resolution))
             elif isinstance(res, list) or isinstance(resolution, list):
-                filters.append(lambda s: s.resolution in (res or resolution))
+                matches.append(index.lookup('resolution', *(res or resolution)))
 
         if fps:
-            filters.append(lambda s: s.fps == fps)
+            matches.append(index.lookup('fps', fps))
 
         if mime_type:
-            filters.append(lambda s: s.mime_type == mime_type)
+            matches.append(index.lookup('mime_type', mime_type))
 
         if type:
-            filters.append(lambda s: s.type == type)
+            matches.append(index.lookup('type', type))
 
         if subtype or file_extension:
-            filters.append(lambda s: s.subtype == (subtype or file_extension))
+            matches.append(index.lookup('subtype', subtype or file_extension))
 
         if abr or bitrate:
-            filters.append(lambda s: s.abr == (abr or bitrate))
+            matches.append(index.lookup('abr', abr or bitrate))
 
         if video_codec:
-            filters.append(lambda s: s.video_codec == video_codec)
+            matches.append(index.lookup('video_codec', video_codec))
 
         if audio_codec:
-            filters.append(lambda s: s.audio_codec == audio_codec)
+            matches.append(index.lookup('audio_codec', audio_codec))
 
         if only_audio:
-            filters.append(
-                lambda s: (
-                    s.includes_audio_track and not s.includes_video_track
-                ),
-            )
+            matches.append(index.lookup('only_audio', True))
 
         if only_video:
-            filters.append(
-                lambda s: (
-                    s.includes_video_track and not s.includes_audio_track
-                ),
-            )
+            matches.append(index.lookup('only_video', True))
 
         if progressive:
-            filters.append(lambda s: s.is_progressive)
+            matches.append(index.lookup('progressive', True))
 
         if adaptive:
-            filters.append(lambda s: s.is_adaptive)
+            matches.append(index.lookup('adaptive', True))
 
         if audio_track_name:
-            filters.append(lambda s: s.audio_track_name == audio_track_name)
-
-        if custom_filter_functions:
-            filters.extend(custom_filter_functions)
+            matches.append(index.lookup('audio_track_name', audio_track_name))
 
         if is_dash is not None:
-            filters.append(lambda s: s.is_dash == is_dash)
+            matches.append(index.lookup('is_dash', is_dash))
 
         if is_drc is not None:
-            filters.append(lambda s: s.is_drc == is_drc)
+            matches.append(index.lookup('is_drc', is_drc))
+
+        fmt_streams = self.fmt_streams
+        if matches:
+            matched = set.intersection(*sorted(matches, key=len))
+            fmt_streams = [s for s in fmt_streams if s in matched]
 
-        return self._filter(filters)
+        query = self._derive(fmt_streams)
+        if custom_filter_functions:
+            query = query._filter(custom_filter_functions)
+        return query
 
     def _filter(self, filters: List[Callable]) -> "StreamQuery":
         fmt_streams = self.fmt_streams
         for filter_lambda in filters:
             fmt_streams = filter(filter_lambda, fmt_streams)
-        return StreamQuery(list(fmt_streams))
+        return self._derive(list(fmt_streams))
 
     def order_by(self, attribute_name: str) -> "StreamQuery":
         """Apply a sort order. Filters out stream the do not have the attribute.
@@ -205,34 +299,16 @@ class StreamQuery(Sequence):
         :param str attribute_name:
             The name of the attribute to sort by.
         """
-        has_attribute = [
-            s
-            for s in self.fmt_streams
-            if getattr(s, attribute_name) is not None
-        ]
+        values, numeric = self._index.sort_keys(attribute_name, self.fmt_streams)
+        has_attribute = [s for s in self.fmt_streams if s in values]
         # Check that the attributes have string values.
-        if has_attribute and isinstance(
-            getattr(has_attribute[0], attribute_name), str
-        ):
+        if has_attribute and isinstance(values[has_attribute[0]], str):
             # Try to return a StreamQuery sorted by the integer representations
             # of the values.
-            try:
-                return StreamQuery(
-                    sorted(
-                        has_attribute,
-                        key=lambda s: int(
-                            "".join(
-                                filter(str.isdigit, getattr(s, attribute_name))
-                            )
-                        ),  # type: ignore  # noqa: E501
-                    )
-                )
-            except ValueError:
-                pass
+            if all(s in numeric for s in has_attribute):
+                return self._derive(sorted(has_attribute, key=numeric.__getitem__))
 
-        return StreamQuery(
-            sorted(has_attribute, key=lambda s: getattr(s, attribute_name))
-        )
+        return self._derive(sorted(has_attribute, key=values.__getitem__))
 
     def desc(self) -> "StreamQuery":
         """Sort streams in descending order.
@@ -240,7 +316,7 @@ class StreamQuery(Sequence):
         :rtype: :class:`StreamQuery <StreamQuery>`
 
         """
-        return StreamQuery(self.fmt_streams[::-1])
+        return self._derive(self.fmt_streams[::-1])
 
     def asc(self) -> "StreamQuery":
         """Sort streams in ascending order.
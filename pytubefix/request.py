@@ -1,6 +1,5 @@
 """Implements a simple wrapper around urlopen."""
 import http.client
-import json
 import logging
 import re
 import socket
@@ -9,6 +8,7 @@ from urllib import parse
 from urllib.error import URLError
 from urllib.request import Request, urlopen
 
+from pytubefix import jsonlib
 from pytubefix.exceptions import RegexMatchError, MaxRetriesExceeded
 from pytubefix.helpers import regex_search
 
@@ -27,7 +27,7 @@ def _execute_request(
     if headers:
         base_headers.update(headers)
     if data and not isinstance(data, bytes): # encode data for request
-            data = bytes(json.dumps(data), encoding="utf-8")
+            data = jsonlib.dumps_bytes(data)
     if url.lower().startswith("http"):
         request = Request(url, headers=base_headers, method=method, data=data)
     else:
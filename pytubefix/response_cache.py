@@ -0,0 +1,202 @@
+"""Cache the responses of the innertube API.
+
+Identical requests are often made a few seconds apart, for example the
+``next`` endpoint is requested for the likes, the chapters and the key moments
+of the same video. :class:`ResponseCache` keeps the raw responses for a time
+that depends on the endpoint: the stream urls of ``player`` expire, while the
+metadata returned by ``next`` or ``browse`` stays valid for longer.
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds a response is kept for, per endpoint. Endpoints that are not
+# listed here are never cached.
+_default_ttls = {
+    'player': 300,
+    'next': 3600,
+    'browse': 3600,
+    'search': 600,
+}
+
+
+class MemoryBackend:
+    """Least recently used in-memory storage."""
+
+    def __init__(self, max_size: int = 128):
+        """
+        :param int max_size:
+            (Optional) Maximum number of responses kept.
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, expires: float) -> None:
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteBackend:
+    """On-disk storage, shared between runs and processes."""
+
+    def __init__(self, path: str):
+        """
+        :param str path:
+            Path to the SQLite database, created if it doesn't exist.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                'CREATE TABLE IF NOT EXISTS responses '
+                '(key TEXT PRIMARY KEY, expires REAL NOT NULL, value BLOB NOT NULL)'
+            )
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT value FROM responses WHERE key = ? AND expires > ?', (key, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, expires: float) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO responses (key, expires, value) VALUES (?, ?, ?)',
+                (key, expires, value)
+            )
+            self._connection.execute('DELETE FROM responses WHERE expires <= ?', (time.time(),))
+
+    def clear(self) -> None:
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM responses')
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class ResponseCache:
+    """Time-to-live cache for the raw responses of the innertube API."""
+
+    def __init__(self, ttls: Optional[Dict[str, float]] = None, backend=None):
+        """Construct a :class:`ResponseCache <ResponseCache>`.
+
+        :param dict ttls:
+            (Optional) Seconds a response is kept for, per endpoint name.
+            Endpoints that are not listed are not cached.
+        :param backend:
+            (Optional) Where the responses are stored, a :class:`MemoryBackend <MemoryBackend>`
+            by default, or a :class:`SQLiteBackend <SQLiteBackend>` to keep them on disk.
+        """
+        self.ttls = dict(_default_ttls if ttls is None else ttls)
+        self.backend = backend or MemoryBackend()
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(endpoint_url: str, client: str, body: bytes) -> str:
+        """Build the key of a request.
+
+        :param str endpoint_url:
+            The url requested, including the query parameters.
+        :param str client:
+            Name of the client making the request.
+        :param bytes body:
+            The serialized body of the request.
+        :rtype: str
+        """
+        digest = hashlib.sha256(f'{endpoint_url}\0{client}\0'.encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def ttl(self, endpoint: str) -> float:
+        """Return the time to live of the responses of an endpoint.
+
+        :param str endpoint:
+            Name of the endpoint, such as ``player``.
+        :rtype: float
+        """
+        return self.ttls.get(endpoint, 0)
+
+    def get(self, endpoint: str, key: str) -> Optional[bytes]:
+        """Return a cached response and count the hit or miss.
+
+        :param str endpoint:
+            Name of the endpoint, such as ``player``.
+        :param str key:
+            Key built by :meth:`key`.
+        :rtype: bytes
+        """
+        value = self.backend.get(key)
+        counters = self.misses if value is None else self.hits
+        with self._lock:
+            counters[endpoint] = counters.get(endpoint, 0) + 1
+        return value
+
+    def set(self, endpoint: str, key: str, value: bytes) -> None:
+        """Store a response for the time to live of its endpoint.
+
+        :param str endpoint:
+            Name of the endpoint, such as ``player``.
+        :param str key:
+            Key built by :meth:`key`.
+        :param bytes value:
+            The raw response.
+        """
+        ttl = self.ttl(endpoint)
+        if ttl > 0:
+            self.backend.set(key, value, time.time() + ttl)
+
+    def hit_rate(self, endpoint: Optional[str] = None) -> float:
+        """Return the fraction of requests answered from the cache.
+
+        :param str endpoint:
+            (Optional) Only count the requests to this endpoint.
+        :rtype: float
+        """
+        with self._lock:
+            if endpoint is None:
+                hits, misses = sum(self.hits.values()), sum(self.misses.values())
+            else:
+                hits, misses = self.hits.get(endpoint, 0), self.misses.get(endpoint, 0)
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def clear(self) -> None:
+        """Remove every cached response and reset the counters."""
+        self.backend.clear()
+        with self._lock:
+            self.hits.clear()
+            self.misses.clear()
+
+
+# Used by default by InnerTube
+response_cache = ResponseCache()
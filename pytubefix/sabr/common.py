@@ -34,22 +34,23 @@ class FormatId:
         message = create_base_format_id()
         while reader.pos < end:
             tag = reader.uint32()
-            field_no = tag >> 3
-
-            if field_no == 1 and tag == 8:
-                message["itag"] = reader.int32()
-                continue
-            elif field_no == 2 and tag == 16:
-                message["lastModified"] = reader.uint64()
-                continue
-            elif field_no == 3 and tag == 26:
-                message["xtags"] = reader.string()
+            field = _format_id_fields.get(tag)
+            if field is not None:
+                message[field[0]] = field[1](reader)
                 continue
             if (tag & 7) == 4 or tag == 0:
                 break
             reader.skip(tag & 7)
         return message
 
+
+# Key and reader of every field of a FormatId, by tag
+_format_id_fields = {
+    8: ('itag', BinaryReader.int32),
+    16: ('lastModified', BinaryReader.uint64),
+    26: ('xtags', BinaryReader.string),
+}
+
 class InitRange:
     def __init__(self, start=0, end=0):
         self.start = start
@@ -11,36 +11,55 @@ class UMP:
     def parse(self, handle_part):
         """
        Parses parts of the buffer and calls the handler for each complete part.
+       The data of each part is a view on the buffer, nothing is copied.
         :param handle_part: Function called with each part complete.
         :return: Partial if parsing is incomplete, otherwise None.
         """
+        buffer = self.chunked_data_buffer
+        offset = 0
+        incomplete = None
         while True:
-            offset = 0
-            part_type, new_offset = self.read_varint(offset)
-            offset = new_offset
-            part_size, final_offset = self.read_varint(offset)
-            offset = final_offset
+            part_type, data_offset = self.read_varint(offset)
+            part_size, data_offset = self.read_varint(data_offset)
 
             if part_type < 0 or part_size < 0:
                 break
 
-            if not self.chunked_data_buffer.can_read_bytes(offset, part_size):
-                if not self.chunked_data_buffer.can_read_bytes(offset, 1):
-                    break
-                return {
-                    "type": part_type,
-                    "size": part_size,
-                    "data": self.chunked_data_buffer
-                }
+            if not buffer.can_read_bytes(data_offset, part_size):
+                if buffer.can_read_bytes(data_offset, 1):
+                    incomplete = (part_type, part_size)
+                break
 
-            split_result = self.chunked_data_buffer.split(offset)['remaining_buffer'].split(part_size)
-            offset = 0
             handle_part({
                 "type": part_type,
                 "size": part_size,
-                "data": split_result['extracted_buffer']
+                "data": buffer.slice(data_offset, data_offset + part_size)
             })
-            self.chunked_data_buffer = split_result['remaining_buffer']
+            offset = data_offset + part_size
+
+        # Only the unparsed bytes are kept
+        if offset:
+            self.chunked_data_buffer = buffer.slice(offset, buffer.get_length())
+
+        if incomplete is None:
+            return None
+        return {
+            "type": incomplete[0],
+            "size": incomplete[1],
+            "data": self.chunked_data_buffer
+        }
+
+    def feed(self, chunk, handle_part):
+        """
+        Appends data received from the network and handles every part it completes.
+        The bytes of an incomplete part are kept until the next chunk arrives.
+        :param chunk: Bytes received.
+        :param handle_part: Function called with each part complete.
+        :return: Partial if parsing is incomplete, otherwise None.
+        """
+        if chunk:
+            self.chunked_data_buffer.append(chunk)
+        return self.parse(handle_part)
 
     def read_varint(self, offset):
         """
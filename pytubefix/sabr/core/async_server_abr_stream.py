@@ -0,0 +1,116 @@
+"""Download a SABR stream without blocking an asyncio event loop.
+
+:class:`ServerAbrStream` sends its requests with blocking sockets and sleeps
+while YouTube forces an ad, so an :class:`AsyncYouTube
+<pytubefix.async_youtube.AsyncYouTube>` download would stop every other task of
+the loop. :class:`AsyncServerAbrStream` keeps the same session state and parser,
+but sends the requests with :class:`AsyncHTTPClient
+<pytubefix.async_http_client.AsyncHTTPClient>`, feeds the UMP parser as the
+chunks arrive and awaits the waits and the writers, so many downloads can share
+one loop.
+"""
+import asyncio
+import inspect
+import logging
+from collections.abc import Callable
+from typing import Optional
+
+from pytubefix.async_http_client import AsyncHTTPClient
+from pytubefix.monostate import Monostate
+from pytubefix.sabr.core.server_abr_stream import ServerAbrStream, _headers, _read_size
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncServerAbrStream(ServerAbrStream):
+    def __init__(self, stream, write_chunk: Callable, monostate: Monostate,
+                 audio_stream=None, write_audio_chunk: Optional[Callable] = None,
+                 start_ms: int = 0, end_ms: Optional[int] = None, checkpoint_path: Optional[str] = None,
+                 http_client: Optional[AsyncHTTPClient] = None):
+        """
+        :param stream:
+            The stream to download.
+        :param write_chunk:
+            Called with the media of the stream and the number of bytes
+            remaining. It can be a coroutine function, it is then awaited.
+        :param monostate:
+            The shared state of the video, used to refresh the streaming url.
+        :param audio_stream:
+            (Optional) An audio stream downloaded in the same session as the video `stream`.
+        :param write_audio_chunk:
+            (Optional) Called with the media of `audio_stream`, like `write_chunk`.
+        :param start_ms:
+            (Optional) Player time the session starts from, in milliseconds.
+        :param end_ms:
+            (Optional) Player time the session stops at, the end of the video by default.
+        :param checkpoint_path:
+            (Optional) File the state of the session is saved to and resumed from.
+        :param http_client:
+            (Optional) The client sending the requests, the shared one by default.
+        """
+        super().__init__(
+            stream, write_chunk, monostate, audio_stream=audio_stream, write_audio_chunk=write_audio_chunk,
+            start_ms=start_ms, end_ms=end_ms, checkpoint_path=checkpoint_path
+        )
+        self.http_client = http_client or AsyncHTTPClient()
+        # Filled by the parser, which can't await, and emptied after every chunk
+        self.pending_writes = []
+        self.refresh_pending = False
+
+    async def start(self):
+        client_abr_state, audio_format, video_format = self.initial_state()
+        await self.fetch_window(client_abr_state, audio_format, video_format)
+        self.remove_checkpoint()
+
+    async def fetch_window(self, client_abr_state, audio_format, video_format):
+        while client_abr_state['playerTimeMs'] < self.end_ms:
+            if self.refresh_pending:
+                await self.refresh_streaming_url_async()
+            data = await self.fetch_media(client_abr_state, audio_format, video_format)
+            if not self.process_response(data, client_abr_state):
+                break
+
+    async def fetch_media(self, client_abr_state, audio_format, video_format):
+        body = self.build_request(client_abr_state, audio_format, video_format)
+        feed, result = self.response_parser()
+        async for chunk in self.http_client.post_stream(
+                self.server_abr_streaming_url, body, headers=dict(_headers), chunk_size=_read_size
+        ):
+            feed(chunk)
+            await self.flush_writes()
+        await self.flush_writes()
+        if self.pending_wait:
+            wait, self.pending_wait = self.pending_wait, 0
+            await asyncio.sleep(wait)
+        return result()
+
+    def write(self, writer, chunk, bytes_remaining):
+        self.pending_writes.append((writer, chunk, bytes_remaining))
+
+    async def flush_writes(self):
+        """Hand the media parsed from the last chunk to the writers, in order."""
+        writes, self.pending_writes = self.pending_writes, []
+        for writer, chunk, bytes_remaining in writes:
+            result = writer(chunk, bytes_remaining)
+            if inspect.isawaitable(result):
+                await result
+
+    def refresh_streaming_url(self):
+        # The player response is requested before the next request of the session
+        self.refresh_pending = True
+
+    async def refresh_streaming_url_async(self):
+        """Get a new streaming url and ustreamer config from a new player response."""
+        self.refresh_pending = False
+        if not hasattr(self.youtube, 'get_server_abr_streaming_url'):
+            # A synchronous YouTube object, its player request runs in a thread
+            await asyncio.get_running_loop().run_in_executor(
+                None, ServerAbrStream.refresh_streaming_url, self
+            )
+            return
+        await self.youtube.refresh_vid_info()
+        refresh_url = await self.youtube.get_server_abr_streaming_url()
+        if not refresh_url:
+            raise ValueError("Invalid SABR refresh")
+        self.server_abr_streaming_url = refresh_url
+        self.video_playback_ustreamer_config = await self.youtube.get_video_playback_ustreamer_config()
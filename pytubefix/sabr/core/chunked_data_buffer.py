@@ -4,6 +4,7 @@ class ChunkedDataBuffer:
     def __init__(self, chunks=None):
         """
         Initializes a new ChunkedDataBuffer with the given chunks.
+        The chunks are kept as memoryviews, appending, splitting and slicing never copy the data.
         """
         self.chunks = []
         self.current_chunk_index = 0
@@ -20,43 +21,62 @@ class ChunkedDataBuffer:
 
     def append(self, chunk):
         """
-        Adds a new chunk to the buffer, merging with the previous one if possible.
-        """
-        if self.can_merge_with_last_chunk(chunk):
-            last_chunk = self.chunks[-1]
-            merged = bytearray(last_chunk)
-            merged.extend(chunk)
-            self.chunks[-1] = bytes(merged)
-            self.reset_focus()
-        else:
-            self.chunks.append(chunk)
-        self.total_length += len(chunk)
+        Adds a new chunk to the end of the buffer.
+        """
+        view = chunk if isinstance(chunk, memoryview) else memoryview(chunk)
+        if view.format != 'B' or view.ndim != 1:
+            view = view.cast('B')
+        if not len(view):
+            return
+        self.chunks.append(view)
+        self.total_length += len(view)
 
-    def split(self, position):
+    def slice(self, start, end):
         """
-        Split the buffer at the specified position into two: extracted and remainder.
+        Returns the bytes between `start` and `end` as a new buffer sharing the memory of this one.
         """
-        extracted_buffer = ChunkedDataBuffer()
-        remaining_buffer = ChunkedDataBuffer()
-        remaining_pos = position
+        result = ChunkedDataBuffer()
+        end = min(end, self.total_length)
+        if start >= end:
+            return result
 
-        for chunk in self.chunks:
+        self.focus(start)
+        index = self.current_chunk_index
+        offset = self.current_chunk_offset
+        while offset < end:
+            chunk = self.chunks[index]
             chunk_len = len(chunk)
-            if remaining_pos >= chunk_len:
-                extracted_buffer.append(chunk)
-                remaining_pos -= chunk_len
-            elif remaining_pos > 0:
-                extracted_buffer.append(chunk[:remaining_pos])
-                remaining_buffer.append(chunk[remaining_pos:])
-                remaining_pos = 0
-            else:
-                remaining_buffer.append(chunk)
+            low = max(start - offset, 0)
+            high = min(end - offset, chunk_len)
+            result.chunks.append(chunk if low == 0 and high == chunk_len else chunk[low:high])
+            result.total_length += high - low
+            offset += chunk_len
+            index += 1
+        return result
 
+    def split(self, position):
+        """
+        Split the buffer at the specified position into two: extracted and remainder.
+        """
         return {
-            "extracted_buffer": extracted_buffer,
-            "remaining_buffer": remaining_buffer
+            "extracted_buffer": self.slice(0, position),
+            "remaining_buffer": self.slice(position, self.total_length)
         }
 
+    def view(self):
+        """
+        Returns the content as a single memoryview, only copying it when it spans several chunks.
+        """
+        if len(self.chunks) == 1:
+            return self.chunks[0]
+        return memoryview(self.to_bytes())
+
+    def to_bytes(self):
+        """
+        Returns a copy of the content.
+        """
+        return b''.join(self.chunks)
+
     def is_focused(self, position):
         """
         Checks if the position is within the currently focused chunk.
@@ -68,6 +88,8 @@ class ChunkedDataBuffer:
         """
         Moves the internal focus to the chunk containing the specified position.
         """
+        if not self.chunks:
+            return
         if not self.is_focused(position):
             if position < self.current_chunk_offset:
                 self.reset_focus()
@@ -91,19 +113,6 @@ class ChunkedDataBuffer:
         chunk = self.chunks[self.current_chunk_index]
         return chunk[position - self.current_chunk_offset]
 
-    def can_merge_with_last_chunk(self, chunk):
-        """
-        Checks if the new chunk can be merged with the last one.
-        """
-        if not self.chunks:
-            return False
-        last_chunk = self.chunks[-1]
-        return (
-            last_chunk is not None and
-            isinstance(last_chunk, (bytes, bytearray)) and
-            isinstance(chunk, (bytes, bytearray))
-        )
-
     def reset_focus(self):
         """
         Resets focus to the beginning of the buffer.
@@ -0,0 +1,158 @@
+"""A persistent HTTP connection for the requests of a SABR session.
+
+A SABR download sends hundreds of POST requests to the same streaming server.
+Opening a connection for each of them, with its TCP and TLS handshakes, costs
+more than a small request. :class:`SabrConnection` keeps the connection open
+between the requests of a session, and only opens a new one when the server
+changes, after a redirect for example, or when the server closed it.
+
+Like the other requests, it goes through the proxy installed with
+:func:`install_proxy <pytubefix.helpers.install_proxy>`, or the one of the
+environment (``HTTP_PROXY``, ``HTTPS_PROXY``, ``NO_PROXY``).
+"""
+import io
+import base64
+import http.client
+import logging
+import urllib.request
+from typing import Dict, Optional, Tuple
+from urllib.error import HTTPError
+from urllib.parse import unquote, urljoin, urlsplit
+
+logger = logging.getLogger(__name__)
+
+_max_redirects = 5
+
+# Raised when a connection kept open was closed by the server in the meantime
+_closed_connection_errors = (
+    http.client.RemoteDisconnected, http.client.CannotSendRequest, BrokenPipeError, ConnectionResetError
+)
+
+
+def get_proxy(scheme: str, host: str) -> Optional[str]:
+    """Return the proxy the requests to a server go through, like urlopen would.
+
+    :param str scheme:
+        The scheme of the url requested.
+    :param str host:
+        The host of the url requested.
+    :rtype: str
+    """
+    # The opener installed by install_proxy, or the environment as the default opener does
+    opener = urllib.request._opener
+    handlers = opener.handlers if opener is not None else [urllib.request.ProxyHandler()]
+    proxies = next((h.proxies for h in handlers if isinstance(h, urllib.request.ProxyHandler)), {})
+    proxy = proxies.get(scheme)
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    return proxy
+
+
+def _proxy_address(proxy: str) -> Tuple[str, Dict[str, str]]:
+    """Split a proxy url into its address and the headers authenticating to it."""
+    parts = urlsplit(proxy if '://' in proxy else f'http://{proxy}')
+    if parts.scheme != 'http':
+        raise ValueError(f"SABR unsupported proxy scheme: {parts.scheme}")
+    address = f'{parts.hostname}:{parts.port or 80}'
+    if parts.username is None:
+        return address, {}
+    credentials = f'{unquote(parts.username)}:{unquote(parts.password or "")}'
+    return address, {'Proxy-Authorization': 'Basic ' + base64.b64encode(credentials.encode()).decode()}
+
+
+class SabrConnection:
+    """Sends the requests of a session over a single kept-alive connection."""
+
+    def __init__(self, timeout: Optional[float] = None):
+        """
+        :param float timeout:
+            (Optional) Timeout of the socket operations, in seconds.
+        """
+        self.timeout = timeout
+        self.connections_opened = 0
+        self._connection: Optional[http.client.HTTPConnection] = None
+        self._origin = None
+        # Headers sent to a plain http proxy, which is sent the full url of every request
+        self._forward_headers: Optional[Dict[str, str]] = None
+
+    def _connect(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        if self._connection is None or self._origin != (scheme, netloc):
+            self.close()
+            connection_class = http.client.HTTPSConnection if scheme == 'https' else http.client.HTTPConnection
+            proxy = get_proxy(scheme, urlsplit(f'//{netloc}').hostname)
+            if proxy is None:
+                self._connection = connection_class(netloc, timeout=self.timeout)
+            else:
+                address, proxy_headers = _proxy_address(proxy)
+                self._connection = connection_class(address, timeout=self.timeout)
+                if scheme == 'https':
+                    # The TLS connection to the server goes through a CONNECT tunnel
+                    self._connection.set_tunnel(netloc, headers=proxy_headers)
+                else:
+                    self._forward_headers = proxy_headers
+            self._origin = (scheme, netloc)
+            self.connections_opened += 1
+        return self._connection
+
+    def post(self, url: str, body: bytes, headers: Dict[str, str]) -> http.client.HTTPResponse:
+        """Send a POST request and return its response.
+
+        The response must be read completely before the next request is sent.
+
+        :param str url:
+            The url requested.
+        :param bytes body:
+            The body of the request.
+        :param dict headers:
+            The headers of the request.
+        :rtype: http.client.HTTPResponse
+        :raises HTTPError:
+            If the server answered with an error status.
+        """
+        for _ in range(_max_redirects + 1):
+            response = self._send(url, body, headers)
+            location = response.getheader('Location')
+            if response.status in (301, 302, 303, 307, 308) and location:
+                response.read()
+                url = urljoin(url, location)
+                logger.debug(f'SABR request redirected to {url}')
+                continue
+            if response.status >= 400:
+                content = response.read()
+                raise HTTPError(url, response.status, response.reason, response.headers, io.BytesIO(content))
+            return response
+        raise HTTPError(url, response.status, 'Too many redirects', response.headers, None)
+
+    def _send(self, url: str, body: bytes, headers: Dict[str, str]) -> http.client.HTTPResponse:
+        parts = urlsplit(url)
+        reused = self._connection is not None and self._origin == (parts.scheme, parts.netloc)
+        try:
+            return self._request(parts, body, headers)
+        except _closed_connection_errors:
+            self.close()
+            if not reused:
+                raise
+            # The server closed the idle connection, send the request again over a new one
+            logger.debug('SABR connection closed by the server, reconnecting')
+            return self._request(parts, body, headers)
+        except Exception:
+            self.close()
+            raise
+
+    def _request(self, parts, body: bytes, headers: Dict[str, str]) -> http.client.HTTPResponse:
+        connection = self._connect(parts.scheme, parts.netloc)
+        if self._forward_headers is not None:
+            path = parts.geturl()
+            headers = {**headers, **self._forward_headers}
+        else:
+            path = f'{parts.path or "/"}?{parts.query}' if parts.query else (parts.path or '/')
+        connection.request('POST', path, body=body, headers=headers)
+        return connection.getresponse()
+
+    def close(self) -> None:
+        """Close the connection, the next request opens a new one."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+            self._origin = None
+            self._forward_headers = None
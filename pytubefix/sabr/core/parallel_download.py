@@ -0,0 +1,251 @@
+"""Download a SABR stream with several sessions in parallel.
+
+A SABR session moves forward one response at a time, so a long video is a long
+chain of requests. :func:`download_in_windows` splits the duration of the video
+into windows and starts a :class:`ServerAbrStream` at the beginning of each of
+them. Their segments are put back in order by a :class:`SegmentStitcher`,
+which writes each one as soon as all the segments before it were written.
+The segments received ahead of their turn are kept in memory up to a limit,
+and spilled to a temporary file beyond it.
+"""
+import logging
+import tempfile
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
+
+from pytubefix.exceptions import SABRError
+from pytubefix.monostate import Monostate
+from pytubefix.sabr.core.server_abr_stream import ServerAbrStream, clip_bytes_remaining
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentStitcher:
+    """Writes the segments of a format in sequence order, whichever session received them."""
+
+    def __init__(self, write_chunk: Callable, bytes_remaining: int, start_ms: int = 0,
+                 max_buffer_size: int = 32 * 1024 * 1024, end_ms: Optional[int] = None):
+        """
+        :param write_chunk:
+            Called with the media and the number of bytes remaining, in order.
+        :param int bytes_remaining:
+            Size of the stream.
+        :param int start_ms:
+            (Optional) Player time the download starts from, in milliseconds.
+        :param int max_buffer_size:
+            (Optional) Bytes of media received ahead of their turn kept in memory,
+            the rest is spilled to a temporary file until it can be written.
+        :param int end_ms:
+            (Optional) End of the clip downloaded, in milliseconds. The progress of a clip is
+            reported in time, see :func:`clip_bytes_remaining
+            <pytubefix.sabr.core.server_abr_stream.clip_bytes_remaining>`.
+        """
+        self.write_chunk = write_chunk
+        self.bytes_remaining = bytes_remaining
+        self.size = bytes_remaining
+        self.start_ms = start_ms
+        self.end_ms = end_ms
+        # Player time at the end of every complete segment, for the progress of a clip
+        self._end_times: Dict[int, int] = {}
+        # The init segment is numbered 0, the media segments start at 1, or at
+        # the segment holding `start_ms` once it is known
+        self.next_sequence = 0
+        self.first_sequence = 1
+        # Media in memory, or (offset, size) of the media in the spill file
+        self._chunks: Dict[int, List[Union[bytes, Tuple[int, int]]]] = {}
+        self.max_buffer_size = max_buffer_size
+        self.buffered_bytes = 0
+        self._spill_file = None
+        self._owners: Dict[int, object] = {}
+        self._complete = set()
+        self._lock = threading.Lock()
+
+    def add(self, session, sequence_number: int, chunk: bytes) -> None:
+        """Add media to a segment.
+
+        Windows overlap a little, the first session that receives a segment
+        owns it and the copies received by the others are dropped.
+        """
+        with self._lock:
+            if sequence_number < self.next_sequence or sequence_number in self._complete:
+                return
+            if self._owners.setdefault(sequence_number, session) is not session:
+                return
+            if sequence_number != self.next_sequence and self.buffered_bytes + len(chunk) > self.max_buffer_size:
+                self._chunks.setdefault(sequence_number, []).append(self._spill(chunk))
+                return
+            self.buffered_bytes += len(chunk)
+            self._chunks.setdefault(sequence_number, []).append(chunk)
+
+    def _spill(self, chunk: bytes) -> Tuple[int, int]:
+        if self._spill_file is None:
+            self._spill_file = tempfile.TemporaryFile()
+        offset = self._spill_file.seek(0, 2)
+        self._spill_file.write(chunk)
+        return offset, len(chunk)
+
+    def end(self, session, sequence_number: Optional[int], media_end_ms: int = 0) -> None:
+        """Mark a segment as complete, and write the segments that are now in order."""
+        with self._lock:
+            if sequence_number is None or self._owners.get(sequence_number) is not session:
+                return
+            del self._owners[sequence_number]
+            self._complete.add(sequence_number)
+            self._end_times[sequence_number] = media_end_ms
+            self._chunks.setdefault(sequence_number, [])
+            self._write_in_order()
+
+    def begin(self, sequence_number: int) -> None:
+        """Set the first media segment, the one holding the start of the download."""
+        with self._lock:
+            self.first_sequence = sequence_number
+            if 0 < self.next_sequence < sequence_number:
+                self.next_sequence = sequence_number
+            self._write_in_order()
+
+    def _write_in_order(self) -> None:
+        while self.next_sequence in self._complete:
+            self._write(self.next_sequence)
+            self.next_sequence = max(self.next_sequence + 1, self.first_sequence)
+
+    def release(self, session) -> None:
+        """Drop the incomplete segments of a session that stopped, so another one can own them."""
+        with self._lock:
+            for sequence_number in [n for n, owner in self._owners.items() if owner is session]:
+                del self._owners[sequence_number]
+                self._drop(self._chunks.pop(sequence_number, []))
+
+    def finish(self) -> None:
+        """Check that every segment was written once all the sessions stopped.
+
+        :raises SABRError:
+            Segments received after a missing one are still waiting for it.
+        """
+        with self._lock:
+            try:
+                if self.next_sequence == 0:
+                    # Without an init segment, the media segments start the stream
+                    self.next_sequence = self.first_sequence
+                    self._write_in_order()
+                if self._complete:
+                    raise SABRError(
+                        f"SABR segments {self.next_sequence} to {min(self._complete) - 1} are missing"
+                    )
+            finally:
+                self._close()
+
+    def close(self) -> None:
+        """Drop the buffered segments and remove the spill file."""
+        with self._lock:
+            self._close()
+
+    def _close(self) -> None:
+        self._chunks.clear()
+        self._complete.clear()
+        self._end_times.clear()
+        self.buffered_bytes = 0
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+
+    def _drop(self, chunks) -> None:
+        self.buffered_bytes -= sum(len(chunk) for chunk in chunks if isinstance(chunk, bytes))
+
+    def _write(self, sequence_number: int) -> None:
+        self._complete.discard(sequence_number)
+        media_end_ms = self._end_times.pop(sequence_number, 0)
+        chunks = self._chunks.pop(sequence_number)
+        self._drop(chunks)
+        for chunk in chunks:
+            if not isinstance(chunk, bytes):
+                offset, size = chunk
+                self._spill_file.seek(offset)
+                chunk = self._spill_file.read(size)
+            self.bytes_remaining -= len(chunk)
+            bytes_remaining = self.bytes_remaining
+            if self.end_ms is not None:
+                bytes_remaining = clip_bytes_remaining(self.size, self.start_ms, self.end_ms, media_end_ms)
+            self.write_chunk(chunk, bytes_remaining)
+
+
+def download_in_windows(
+        stream,
+        write_chunk: Callable,
+        monostate: Monostate,
+        connections: int = 4,
+        audio_stream=None,
+        write_audio_chunk: Optional[Callable] = None,
+        start_ms: int = 0,
+        end_ms: Optional[int] = None
+) -> Dict[int, SegmentStitcher]:
+    """Download a SABR stream with one session per window of its duration.
+
+    :param stream:
+        The stream to download.
+    :param write_chunk:
+        Called with the media of the stream, in order.
+    :param monostate:
+        The shared state of the video.
+    :param int connections:
+        (Optional) Number of windows downloaded in parallel.
+    :param audio_stream:
+        (Optional) An audio stream downloaded along with the video `stream`.
+    :param write_audio_chunk:
+        (Optional) Called with the media of `audio_stream`, in order.
+    :param int start_ms:
+        (Optional) Start of the downloaded time range, in milliseconds.
+    :param int end_ms:
+        (Optional) End of the downloaded time range, the end of the video by default.
+    :rtype: Dict[int, SegmentStitcher]
+    :returns:
+        The stitcher of every stream by itag, with the number of bytes remaining.
+    :raises SABRError:
+        Some segments are missing from the downloaded media.
+    """
+    duration = int(stream.durationMs)
+    if audio_stream is not None:
+        duration = max(duration, int(audio_stream.durationMs))
+    end = duration if end_ms is None else min(end_ms, duration)
+    if not 0 <= start_ms < end:
+        raise ValueError(f"SABR empty time range, {start_ms} ms to {end} ms")
+
+    # The progress of a clip is reported in time
+    clip_end_ms = end if start_ms > 0 or end_ms is not None else None
+    stitchers = {stream.itag: SegmentStitcher(write_chunk, stream.filesize, start_ms, end_ms=clip_end_ms)}
+    if audio_stream is not None:
+        stitchers[audio_stream.itag] = SegmentStitcher(
+            write_audio_chunk, audio_stream.filesize, start_ms, end_ms=clip_end_ms
+        )
+
+    connections = max(1, connections)
+    window = -(-(end - start_ms) // connections)
+    bounds = [(start, min(start + window, end)) for start in range(start_ms, end, window)]
+    # The last window runs to the end of the video unless a clip was asked for
+    bounds[-1] = (bounds[-1][0], end_ms)
+    logger.debug(f'SABR downloading {len(bounds)} windows of {window} ms in parallel')
+
+    def download_window(start_ms, end_ms):
+        ServerAbrStream(
+            stream, write_chunk, monostate, audio_stream=audio_stream, write_audio_chunk=write_audio_chunk,
+            start_ms=start_ms, end_ms=end_ms, stitchers=stitchers
+        ).start()
+
+    try:
+        with ThreadPoolExecutor(max_workers=connections) as executor:
+            futures = [executor.submit(download_window, start_ms, end_ms) for start_ms, end_ms in bounds]
+            for future in futures:
+                future.result()
+    except BaseException:
+        for stitcher in stitchers.values():
+            stitcher.close()
+        raise
+
+    try:
+        for stitcher in stitchers.values():
+            stitcher.finish()
+    finally:
+        for stitcher in stitchers.values():
+            stitcher.close()
+    return stitchers
@@ -1,15 +1,19 @@
 # All credits to https://github.com/LuanRT/googlevideo
 
+import os
 import enum
+import json
 import base64
 import logging
+import threading
 from enum import Enum
 from time import sleep
 from typing import Optional
 from collections.abc import Callable
-from urllib.request import Request, urlopen
 
 from pytubefix.sabr.core.UMP import UMP
+from pytubefix.sabr.proto import BinaryWriter
+from pytubefix.sabr.core.connection import SabrConnection
 from pytubefix.monostate import Monostate
 from pytubefix.exceptions import SABRError
 from pytubefix.sabr.video_streaming.sabr_error import SabrError
@@ -18,13 +22,75 @@ from pytubefix.sabr.core.chunked_data_buffer import ChunkedDataBuffer
 from pytubefix.sabr.video_streaming.sabr_redirect import SabrRedirect
 from pytubefix.sabr.video_streaming.playback_cookie import PlaybackCookie
 from pytubefix.sabr.video_streaming.next_request_policy import NextRequestPolicy
-from pytubefix.sabr.video_streaming.streamer_context import StreamerContextUpdate
+from pytubefix.sabr.video_streaming.streamer_context import (
+    StreamerContext, StreamerContext_ClientInfo, StreamerContextUpdate, StreamerContextUpdateValue
+)
 from pytubefix.sabr.video_streaming.stream_protection_status import StreamProtectionStatus
 from pytubefix.sabr.video_streaming.video_playback_abr_request import VideoPlaybackAbrRequest
 from pytubefix.sabr.video_streaming.format_initialization_metadata import FormatInitializationMetadata
 
 logger = logging.getLogger(__name__)
 
+# Size of the reads from the SABR response, media parts are written as soon as
+# they are complete instead of once the whole response has arrived
+_read_size = 64 * 1024
+
+# Held while a session requests a new player response, as its YouTube object is
+# shared with the other sessions of the video
+_refresh_lock = threading.Lock()
+
+_headers = {
+    "User-Agent": "Mozilla/5.0", "accept-language": "en-US,en", "Content-Type": "application/vnd.yt-ump",
+}
+
+_client_info = {
+    'clientName': 1,
+    'clientVersion': '2.20250523.01.00',
+    'osName': 'Windows',
+    'osVersion': '10.0',
+    'platform': 'DESKTOP'
+}
+
+
+def clip_bytes_remaining(size: int, start_ms: int, end_ms: int, media_end_ms: int) -> int:
+    """Return the bytes remaining reported to the writers of a clip.
+
+    The size of a clip is only known once all of its segments were received,
+    so its progress is measured in player time, on the scale of the whole
+    stream: it reaches 0 with the segment holding the end of the clip.
+
+    :param int size:
+        Size of the whole stream.
+    :param int start_ms:
+        Start of the clip, in milliseconds.
+    :param int end_ms:
+        End of the clip, in milliseconds.
+    :param int media_end_ms:
+        Player time at the end of the segment being written, in milliseconds.
+    :rtype: int
+    """
+    done = min(max(media_end_ms - start_ms, 0), end_ms - start_ms)
+    return size - size * done // (end_ms - start_ms)
+
+
+def read_checkpoint(path: str) -> Optional[dict]:
+    """Read the state saved by a SABR session that didn't finish.
+
+    :param str path:
+        Path to the checkpoint file.
+    :rtype: dict
+    :returns:
+        The saved state, or None if there is no usable checkpoint.
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError as e:
+        logger.warning(f'Unable to read the SABR checkpoint {path}: {e}')
+        return None
+
 
 # https://github.com/davidzeng0/innertube/blob/main/googlevideo/ump.md
 class PART(Enum):
@@ -81,170 +147,419 @@ class PoTokenStatus(enum.Enum):
 
 
 class ServerAbrStream:
-    def __init__(self, stream, write_chunk: Callable, monostate: Monostate):
-
+    def __init__(self, stream, write_chunk: Callable, monostate: Monostate,
+                 audio_stream=None, write_audio_chunk: Optional[Callable] = None,
+                 start_ms: int = 0, end_ms: Optional[int] = None, stitchers: Optional[dict] = None,
+                 checkpoint_path: Optional[str] = None):
+        """
+        :param stream:
+            The stream to download.
+        :param write_chunk:
+            Called with the media of the stream and the number of bytes remaining.
+        :param monostate:
+            The shared state of the video, used to refresh the streaming url.
+        :param audio_stream:
+            (Optional) An audio stream downloaded in the same session as the
+            video `stream`, so that both are fetched by the same requests.
+        :param write_audio_chunk:
+            (Optional) Called with the media of `audio_stream`.
+        :param start_ms:
+            (Optional) Player time the session starts from, in milliseconds.
+            The clip starts with the segment holding this time, after the init segment.
+        :param end_ms:
+            (Optional) Player time the session stops at, the end of the video by
+            default. The segments starting at or after it are dropped.
+        :param stitchers:
+            (Optional) :class:`SegmentStitcher` by itag, shared by the sessions
+            downloading windows of the same streams. The media is handed to
+            them instead of being written as soon as it is parsed.
+        :param checkpoint_path:
+            (Optional) File the state of the session is saved to after every
+            response. If it exists, the session resumes from it, after the
+            last complete segment, and the writers only receive what follows.
+            It is removed once the download is complete.
+        """
         self.stream = stream
+        self.audio_stream = audio_stream
         self.write_chunk = write_chunk
         self.youtube = monostate.youtube
         self.po_token = self.stream.po_token
         self.server_abr_streaming_url = self.stream.url
         self.video_playback_ustreamer_config = self.stream.video_playback_ustreamer_config
         self.totalDurationMs = int(self.stream.durationMs)
-        self.bytes_remaining = self.stream.filesize
+        # Writer and bytes remaining of every downloaded stream, by itag
+        self.outputs = {self.stream.itag: [write_chunk, self.stream.filesize]}
+        if audio_stream is not None:
+            if self.stream.type != 'video' or audio_stream.type != 'audio':
+                raise ValueError("SABR a joint download needs a video stream and an audio stream")
+            self.outputs[audio_stream.itag] = [write_audio_chunk, audio_stream.filesize]
+            self.totalDurationMs = max(self.totalDurationMs, int(audio_stream.durationMs))
+        self.start_ms = start_ms
+        self.end_ms = self.totalDurationMs if end_ms is None else min(end_ms, self.totalDurationMs)
+        # Only an end given by the caller drops segments, the durations of the streams are approximate
+        self.clip_end_ms = end_ms
+        if self.start_ms >= self.end_ms:
+            raise ValueError(f"SABR empty time range, {self.start_ms} ms to {self.end_ms} ms")
+        self.stitchers = stitchers or {}
+        self.checkpoint_path = checkpoint_path
+        # Every request of the session is sent over the same connection
+        self.connection = SabrConnection()
+        self._request_template = None
+        self.written_bytes = {itag: 0 for itag in self.outputs}
+        # The progress of a clip is reported in time, from the sizes of the whole streams
+        self.is_clip = self.start_ms > 0 or self.clip_end_ms is not None
+        self.sizes = {itag: output[1] for itag, output in self.outputs.items()}
+        # Bytes written when the last complete segment of each stream ended
+        self.segment_end_bytes = dict(self.written_bytes)
+        self.init_segment_itags = set()
+        self.completed_itags = set()
         self.initialized_formats = []
         self.formats_by_key = {}
         self.playback_cookie = None
         self.header_id_to_format_key_map = {}
+        self.header_id_to_sequence_map = {}
+        self.header_id_to_end_ms = {}
         self.previous_sequences = {}
         self.RELOAD = False
         self.maximum_reload_attempt = 4
+        # Redirects received in a row, without media
+        self.consecutive_redirects = 0
+        self.maximum_redirects = 10
+        # Seconds to wait once the response is consumed, before the next request
+        self.pending_wait = 0
         self.stream_protection_status = PoTokenStatus.UNKNOWN.name
         self.sabr_contexts_to_send = []
         self.sabr_context_updates = dict()
 
-    def emit(self, data):
-        for formatId in data['initialized_formats']:
-            if formatId['formatId']['itag'] == self.stream.itag:
-                media_chunks = formatId['mediaChunks']
-                for chunk in media_chunks:
-                    self.bytes_remaining -= len(chunk)
-                    self.write_chunk(chunk, self.bytes_remaining)
-
-    def start(self):
+    @property
+    def bytes_remaining(self):
+        return self.outputs[self.stream.itag][1]
+
+    def emit(self, current_format, media, media_end_ms: int = 0):
+        """Write the media of a part as soon as it is parsed, to the writer of its stream."""
+        itag = current_format['formatId']['itag']
+        output = self.outputs.get(itag)
+        if output is not None:
+            # The only copy of the media, made when it is handed to the writer
+            chunk = media.to_bytes()
+            self.written_bytes[itag] += len(chunk)
+            output[1] -= len(chunk)
+            bytes_remaining = output[1]
+            if self.is_clip:
+                bytes_remaining = clip_bytes_remaining(self.sizes[itag], self.start_ms, self.end_ms, media_end_ms)
+            self.write(output[0], chunk, bytes_remaining)
+
+    def write(self, writer, chunk, bytes_remaining):
+        """Hand a chunk of media to the writer of its stream."""
+        writer(chunk, bytes_remaining)
 
-        audio_format = [{'itag': self.stream.itag,
-                         'lastModified': int(self.stream.last_Modified),
-                         'xtags': self.stream.xtags}] if self.stream.type == 'audio' else []
+    @staticmethod
+    def selected_format(stream):
+        return [{'itag': stream.itag, 'lastModified': int(stream.last_Modified), 'xtags': stream.xtags}]
+
+    def main_format(self, data, enabled_track_types):
+        """Return the format whose segments advance the player time.
+
+        In a joint download it is the video, until all of its segments were
+        received, then the audio.
+        """
+        formats = data.get("initialized_formats", [])
+        if self.audio_stream is not None:
+            formats = [fmt for fmt in formats if fmt["formatId"]["itag"] not in self.completed_itags]
+            return (
+                next((fmt for fmt in formats if fmt.get("sequenceList") and "video" in (fmt.get("mimeType") or "")), None)
+                or next((fmt for fmt in formats if fmt.get("sequenceList")), None)
+            )
+        if enabled_track_types == 0:
+            return next((fmt for fmt in formats if "video" in (fmt.get("mimeType") or "")), None)
+        return formats[0] if formats else None
 
-        video_format = [{'itag': self.stream.itag,
-                         'lastModified': int(self.stream.last_Modified),
-                         'xtags': self.stream.xtags}] if self.stream.type == 'video' else []
+    def start(self):
+        client_abr_state, audio_format, video_format = self.initial_state()
+        try:
+            self.fetch_window(client_abr_state, audio_format, video_format)
+        finally:
+            self.connection.close()
+            for stitcher in self.stitchers.values():
+                stitcher.release(self)
+        self.remove_checkpoint()
+
+    def initial_state(self):
+        """Return the client state of the first request, and the formats selected for the session.
+
+        The state saved by a previous session is restored here when there is a checkpoint.
+        """
+        if self.audio_stream is not None:
+            audio_format = self.selected_format(self.audio_stream)
+            video_format = self.selected_format(self.stream)
+        else:
+            audio_format = self.selected_format(self.stream) if self.stream.type == 'audio' else []
+            video_format = self.selected_format(self.stream) if self.stream.type == 'video' else []
 
         client_abr_state = {
             'lastManualDirection': 0,
             'timeSinceLastManualFormatSelectionMs': 0,
             'lastManualSelectedResolution': int(self.stream.resolution.replace('p', '')) if video_format else 720,
             'stickyResolution': int(self.stream.resolution.replace('p', '')) if video_format else 720,
-            'playerTimeMs': 0,
+            'playerTimeMs': self.start_ms,
             'visibility': 0,
             'drcEnabled': self.stream.is_drc,
             # 0 = BOTH, 1 = AUDIO (video-only is no longer supported by YouTube)
             'enabledTrackTypesBitfield': 0 if video_format else 1
         }
-        while client_abr_state['playerTimeMs'] < self.totalDurationMs:
-            data = self.fetch_media(client_abr_state, audio_format, video_format)
-
-            if data.get("sabr_error"):
-                logger.debug("SABR error type: %s", data["sabr_error"].type)
-                self.reload()
+        if self.checkpoint_path is not None:
+            self.load_checkpoint(client_abr_state)
+        return client_abr_state, audio_format, video_format
 
-            self.emit(data)
+    def remove_checkpoint(self):
+        if self.checkpoint_path is not None and os.path.exists(self.checkpoint_path):
+            os.remove(self.checkpoint_path)
 
-            if data.get("sabr_context_update"):
-                if self.maximum_reload_attempt > 0:
-                    continue
-                else:
-                    raise SABRError("SABR failed to update context after exhausting reload attempts")
+    def fetch_window(self, client_abr_state, audio_format, video_format):
+        while client_abr_state['playerTimeMs'] < self.end_ms:
+            data = self.fetch_media(client_abr_state, audio_format, video_format)
+            if not self.process_response(data, client_abr_state):
+                break
 
-            # Determine main format
-            if client_abr_state["enabledTrackTypesBitfield"] == 0:
-                main_format = next(
-                    (fmt for fmt in data.get("initialized_formats", []) if "video" in (fmt.get("mimeType") or "")),
-                    None
-                )
+    def process_response(self, data, client_abr_state) -> bool:
+        """Update the state of the session from a parsed response.
+
+        :param dict data:
+            The response, parsed by :meth:`parse_ump_response`.
+        :param dict client_abr_state:
+            The client state sent with the requests, its player time is moved forward.
+        :rtype: bool
+        :returns:
+            False once all the segments were received, True while more requests are needed.
+        """
+        if data.get("sabr_error"):
+            logger.debug("SABR error type: %s", data["sabr_error"].type)
+            self.reload()
+
+        if data.get("sabr_context_update"):
+            if self.maximum_reload_attempt > 0:
+                return True
             else:
-                main_format = data['initialized_formats'][0] if data['initialized_formats'] else None
-
-            # Register sequence numbers
-            for fmt in data.get("initialized_formats", []):
-                format_key = fmt["formatKey"]
-                sequence_numbers = [seq.get("sequenceNumber", 0) for seq in fmt.get("sequenceList", [])]
-                self.previous_sequences[format_key] = sequence_numbers
-
-            # Check if server returned usable chunks
-            if not self.RELOAD and (
-                    main_format is None or
-                    not main_format.get("sequenceList")
-            ):
-                logger.debug("SABR No chunks returned by the ABR server, triggering reload")
-                self.reload()
-
-            # Handle reload attempts
-            if self.RELOAD:
-                if self.maximum_reload_attempt > 0:
-                    self.RELOAD = False
-                    continue
-                else:
-                    raise SABRError(
-                        f"SABR Maximum reload attempts reached. Stream protection status: PoToken {self.stream_protection_status}"
-                    )
-
-            # Check for end of media
-            if (
-                    not main_format or
-                    main_format["sequenceCount"] == main_format["sequenceList"][-1].get("sequenceNumber")
-            ):
-                break
+                raise SABRError("SABR failed to update context after exhausting reload attempts")
+
+        # A redirect has no media, the same request is sent again to the new url
+        if data.get("sabr_redirect") and not self.RELOAD:
+            self.consecutive_redirects += 1
+            if self.consecutive_redirects > self.maximum_redirects:
+                raise SABRError(f"SABR Maximum redirects reached ({self.maximum_redirects})")
+            return True
+        self.consecutive_redirects = 0
+
+        # Determine main format
+        main_format = self.main_format(data, client_abr_state["enabledTrackTypesBitfield"])
+
+        # Register sequence numbers
+        for fmt in data.get("initialized_formats", []):
+            format_key = fmt["formatKey"]
+            sequence_numbers = [seq.get("sequenceNumber", 0) for seq in fmt.get("sequenceList", [])]
+            self.previous_sequences[format_key] = sequence_numbers
+            if sequence_numbers and fmt["sequenceCount"] == sequence_numbers[-1]:
+                self.completed_itags.add(fmt["formatId"]["itag"])
+
+        # Check if server returned usable chunks
+        if not self.RELOAD and (
+                main_format is None or
+                not main_format.get("sequenceList")
+        ):
+            logger.debug("SABR No chunks returned by the ABR server, triggering reload")
+            self.reload()
+
+        # Handle reload attempts
+        if self.RELOAD:
+            if self.maximum_reload_attempt > 0:
+                self.RELOAD = False
+                return True
+            else:
+                raise SABRError(
+                    f"SABR Maximum reload attempts reached. Stream protection status: PoToken {self.stream_protection_status}"
+                )
 
-            # Update client player time
-            total_sequence_duration = sum(seq.get("durationMs", 0) for seq in main_format["sequenceList"])
-            client_abr_state["playerTimeMs"] += total_sequence_duration
+        # Check for end of media
+        if self.audio_stream is not None:
+            if self.completed_itags.issuperset(self.outputs):
+                return False
+        elif (
+                not main_format or
+                main_format["sequenceCount"] == main_format["sequenceList"][-1].get("sequenceNumber")
+        ):
+            return False
+
+        # Update client player time
+        total_sequence_duration = sum(seq.get("durationMs", 0) for seq in main_format["sequenceList"])
+        client_abr_state["playerTimeMs"] += total_sequence_duration
+
+        if self.checkpoint_path is not None:
+            self.save_checkpoint(client_abr_state)
+        return True
+
+    def save_checkpoint(self, client_abr_state):
+        """Save what is needed to resume the session after the last complete segment."""
+        state = {
+            'startMs': self.start_ms,
+            'endMs': self.clip_end_ms,
+            'playerTimeMs': client_abr_state['playerTimeMs'],
+            'written': {str(itag): written for itag, written in self.segment_end_bytes.items()},
+            'previousSequences': self.previous_sequences,
+            'initializedFormats': [
+                {key: value for key, value in fmt.items() if key != 'sequenceList'}
+                for fmt in self.initialized_formats
+            ],
+            'completedItags': sorted(self.completed_itags),
+            'initSegmentItags': sorted(self.init_segment_itags),
+            'playbackCookie': base64.b64encode(
+                PlaybackCookie.encode(self.playback_cookie).finish()
+            ).decode('ascii') if self.playback_cookie else None,
+            'sabrContextUpdates': [
+                dict(ctx, value=base64.b64encode(StreamerContextUpdateValue.encode(ctx['value']).finish()).decode('ascii'))
+                for ctx in self.sabr_context_updates.values()
+            ],
+            'sabrContextsToSend': self.sabr_contexts_to_send,
+        }
+        tmp_path = f'{self.checkpoint_path}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def load_checkpoint(self, client_abr_state):
+        """Restore the state saved by :meth:`save_checkpoint`, if there is one."""
+        state = read_checkpoint(self.checkpoint_path)
+        if state is None:
+            return
+        if set(state['written']) != {str(itag) for itag in self.outputs}:
+            logger.warning(f'The SABR checkpoint {self.checkpoint_path} is for other streams, ignoring it')
+            return
+        if (state.get('startMs', 0), state.get('endMs')) != (self.start_ms, self.clip_end_ms):
+            logger.warning(f'The SABR checkpoint {self.checkpoint_path} is for another time range, ignoring it')
+            return
 
-    def fetch_media(self, client_abr_state, audio_format, video_format):
-        body = VideoPlaybackAbrRequest.encode({
+        logger.debug(f"SABR resuming from {state['playerTimeMs']} ms")
+        client_abr_state['playerTimeMs'] = state['playerTimeMs']
+        for itag, output in self.outputs.items():
+            written = state['written'][str(itag)]
+            self.written_bytes[itag] = self.segment_end_bytes[itag] = written
+            output[1] -= written
+        self.previous_sequences = state['previousSequences']
+        for fmt in state['initializedFormats']:
+            fmt['sequenceList'] = []
+            self.initialized_formats.append(fmt)
+            self.formats_by_key[fmt['formatKey']] = fmt
+        self.completed_itags = set(state['completedItags'])
+        self.init_segment_itags = set(state['initSegmentItags'])
+        if state['playbackCookie']:
+            self.playback_cookie = PlaybackCookie.decode(base64.b64decode(state['playbackCookie']))
+        for ctx in state['sabrContextUpdates']:
+            ctx['value'] = StreamerContextUpdateValue.decode(base64.b64decode(ctx['value']))
+            self.sabr_context_updates[ctx['type']] = ctx
+        self.sabr_contexts_to_send = state['sabrContextsToSend']
+
+    def request_template(self, audio_format, video_format):
+        """Return the parts of the request that don't change between the requests of a session.
+
+        They are encoded once, and again only when the stream is reloaded.
+        """
+        key = (self.video_playback_ustreamer_config, self.po_token, repr(audio_format), repr(video_format))
+        if self._request_template is None or self._request_template[0] != key:
+            static_request = VideoPlaybackAbrRequest.encode({
+                'selectedAudioFormatIds': audio_format,
+                'selectedVideoFormatIds': video_format,
+                'videoPlaybackUstreamerConfig': self.base64_to_u8(self.video_playback_ustreamer_config),
+            }).finish()
+            # The first fields of the StreamerContext, the others change with every response
+            writer = BinaryWriter()
+            StreamerContext_ClientInfo.encode(_client_info, writer.uint32(10).fork()).join()
+            if self.po_token:
+                writer.uint32(18).bytes(self.base64_to_u8(self.po_token))
+            static_context = writer.finish()
+            self._request_template = (key, static_request, static_context)
+        return self._request_template[1:]
+
+    def build_request(self, client_abr_state, audio_format, video_format) -> bytes:
+        """Encode a VideoPlaybackAbrRequest from the template and the state of the session.
+
+        The fields are written in the order of their numbers, so the request is
+        the same as if the whole message was encoded at once.
+        """
+        static_request, static_context = self.request_template(audio_format, video_format)
+        head = VideoPlaybackAbrRequest.encode({
             'clientAbrState': client_abr_state,
-            'selectedAudioFormatIds': audio_format,
-            'selectedVideoFormatIds': video_format,
             'selectedFormatIds': [fmt["formatId"] for fmt in self.initialized_formats],
-            'videoPlaybackUstreamerConfig': self.base64_to_u8(self.video_playback_ustreamer_config),
-            'streamerContext': {
-                'sabrContexts': [
-                    ctx
-                    for ctx in self.sabr_context_updates.values() if ctx["type"] in self.sabr_contexts_to_send
-                ],
-                'field6': [],
-                'poToken': self.base64_to_u8(self.po_token) if self.po_token else None,
-                'playbackCookie': PlaybackCookie.encode(
-                    self.playback_cookie).finish() if self.playback_cookie else None,
-                'clientInfo': {
-                    'clientName': 1,
-                    'clientVersion': '2.20250523.01.00',
-                    'osName': 'Windows',
-                    'osVersion': '10.0',
-                    'platform': 'DESKTOP'
-                }
-            },
             'bufferedRanges': [fmt["_state"] for fmt in self.initialized_formats],
-            'field1000': []
         }).finish()
+        context = static_context + StreamerContext.encode({
+            'sabrContexts': [
+                ctx
+                for ctx in self.sabr_context_updates.values() if ctx["type"] in self.sabr_contexts_to_send
+            ],
+            'field6': [],
+            'playbackCookie': PlaybackCookie.encode(
+                self.playback_cookie).finish() if self.playback_cookie else None,
+        }).finish()
+        return head + static_request + BinaryWriter().uint32(154).bytes(context).finish()
 
-        base_headers = {
-            "User-Agent": "Mozilla/5.0", "accept-language": "en-US,en", "Content-Type": "application/vnd.yt-ump",
-        }
-        request = Request(self.server_abr_streaming_url, headers=base_headers, method="POST", data=bytes(body))
-        return self.parse_ump_response(bytes(urlopen(request).read()))
+    def fetch_media(self, client_abr_state, audio_format, video_format):
+        body = self.build_request(client_abr_state, audio_format, video_format)
+        response = self.connection.post(self.server_abr_streaming_url, body, _headers)
+        try:
+            data = self.parse_ump_response(iter(lambda: response.read(_read_size), b''))
+        except BaseException:
+            # The rest of the response would be read as the next one
+            self.connection.close()
+            raise
+        if self.pending_wait:
+            wait, self.pending_wait = self.pending_wait, 0
+            sleep(wait)
+        return data
 
     def parse_ump_response(self, response):
+        """Parse a UMP response as its chunks arrive.
+
+        :param response:
+            The whole response, or an iterable of the chunks read from the network.
+        """
+        if isinstance(response, (bytes, bytearray)):
+            response = [response]
+
+        feed, result = self.response_parser()
+        for chunk in response:
+            feed(chunk)
+        return result()
+
+    def response_parser(self):
+        """Start parsing a UMP response.
+
+        :rtype: tuple
+        :returns:
+            A function feeding the next chunk of the response to the parser,
+            and a function returning the parsed response once all were fed.
+        """
         self.header_id_to_format_key_map.clear()
+        self.header_id_to_sequence_map.clear()
+        self.header_id_to_end_ms.clear()
         for k, v in enumerate(self.initialized_formats):
             self.initialized_formats[k]['sequenceList'] = []
-            self.initialized_formats[k]['mediaChunks'] = []
 
         sabr_error: Optional[SabrError] = None
         sabr_redirect: Optional[SabrRedirect] = None
         sabr_context_update: bool = False
 
-        ump = UMP(ChunkedDataBuffer([response]))
+        ump = UMP(ChunkedDataBuffer())
 
         def callback(part):
-            data = list(part['data'].chunks[0] if part['data'].chunks else [])
+            # Media parts are the most frequent and don't need a contiguous view
+            if part['type'] == PART.MEDIA.value:
+                self.process_media_data(part['data'])
+                return
+
+            data = part['data'].view()
 
             if part['type'] == PART.MEDIA_HEADER.value:
                 self.process_media_header(data)
 
-            elif part['type'] == PART.MEDIA.value:
-                self.process_media_data(part['data'])
-
             elif part['type'] == PART.MEDIA_END.value:
                 self.process_end_of_media(part['data'])
 
@@ -285,14 +600,23 @@ class ServerAbrStream:
                 sabr_context_update = True
                 self.process_snackbar_message()
 
-        ump.parse(callback)
+        partial = None
 
-        return {
-            "initialized_formats": self.initialized_formats,
-            "sabr_redirect": sabr_redirect,
-            "sabr_error": sabr_error,
-            "sabr_context_update": sabr_context_update
-        }
+        def feed(chunk):
+            nonlocal partial
+            partial = ump.feed(chunk, callback)
+
+        def result():
+            if partial is not None:
+                logger.debug(f"SABR response ended in the middle of a part of type {partial['type']}")
+            return {
+                "initialized_formats": self.initialized_formats,
+                "sabr_redirect": sabr_redirect,
+                "sabr_error": sabr_error,
+                "sabr_context_update": sabr_context_update
+            }
+
+        return feed, result
 
     def process_media_header(self, data):
         media_header = MediaHeader.decode(data)
@@ -312,10 +636,29 @@ class ServerAbrStream:
                 if sequence_number in self.previous_sequences[format_key]:
                     return
 
+        if not media_header.isInitSeg and not self.in_time_range(media_header):
+            return
+
+        itag = current_format['formatId']['itag']
+        stitcher = self.stitchers.get(itag)
+        if (
+                stitcher is not None and not media_header.isInitSeg and
+                media_header.startMs <= stitcher.start_ms < media_header.startMs + media_header.durationMs
+        ):
+            stitcher.begin(sequence_number)
+        if media_header.isInitSeg and not self.stitchers:
+            # A resumed session must not append the init segment a second time
+            if itag in self.init_segment_itags:
+                return
+            self.init_segment_itags.add(itag)
+
         header_id = media_header.headerId
         if header_id is not None:
             if header_id not in self.header_id_to_format_key_map:
                 self.header_id_to_format_key_map[header_id] = format_key
+                # The init segment has no sequence number, it comes before the first one
+                self.header_id_to_sequence_map[header_id] = sequence_number or 0
+                self.header_id_to_end_ms[header_id] = (media_header.startMs or 0) + (media_header.durationMs or 0)
 
         if not any(seq.get("sequenceNumber") == (media_header.sequenceNumber or 0) for seq in
                    current_format["sequenceList"]):
@@ -332,12 +675,24 @@ class ServerAbrStream:
             })
 
             if isinstance(sequence_number, int):
-                current_format["_state"]["durationMs"] += media_header.durationMs
-                current_format["_state"]["endSegmentIndex"] += 1
+                state = current_format["_state"]
+                if not media_header.isInitSeg and state["durationMs"] == 0:
+                    # The buffered range starts at the first segment received, not at the beginning of the video
+                    state["startTimeMs"] = media_header.startMs
+                    state["startSegmentIndex"] = sequence_number
+                    state["endSegmentIndex"] = sequence_number - 1
+                state["durationMs"] += media_header.durationMs
+                state["endSegmentIndex"] += 1
+
+    def in_time_range(self, media_header) -> bool:
+        """Whether a media segment overlaps the time range of the session."""
+        start_ms = media_header.startMs
+        if start_ms + media_header.durationMs <= self.start_ms:
+            return False
+        return self.clip_end_ms is None or start_ms < self.clip_end_ms
 
     def process_media_data(self, data):
         header_id = data.get_uint8(0)
-        stream_data = data.split(1)['remaining_buffer']
         format_key = self.header_id_to_format_key_map.get(header_id)
         if not format_key:
             return
@@ -346,11 +701,26 @@ class ServerAbrStream:
         if not current_format:
             return
 
-        current_format['mediaChunks'].append(stream_data.chunks[0])
+        media = data.slice(1, data.get_length())
+        stitcher = self.stitchers.get(current_format['formatId']['itag'])
+        if stitcher is not None:
+            stitcher.add(self, self.header_id_to_sequence_map[header_id], media.to_bytes())
+        else:
+            self.emit(current_format, media, self.header_id_to_end_ms.get(header_id, 0))
 
     def process_end_of_media(self, data):
         header_id = data.get_uint8(0)
-        self.header_id_to_format_key_map.pop(header_id, None)
+        format_key = self.header_id_to_format_key_map.pop(header_id, None)
+        sequence_number = self.header_id_to_sequence_map.pop(header_id, None)
+        media_end_ms = self.header_id_to_end_ms.pop(header_id, 0)
+        current_format = self.formats_by_key.get(format_key)
+        if current_format is not None:
+            itag = current_format['formatId']['itag']
+            stitcher = self.stitchers.get(itag)
+            if stitcher is not None:
+                stitcher.end(self, sequence_number, media_end_ms)
+            elif itag in self.outputs:
+                self.segment_end_bytes[itag] = self.written_bytes[itag]
 
     def process_next_request_policy(self, data):
         next_request_policy = NextRequestPolicy.decode(data)
@@ -368,6 +738,11 @@ class ServerAbrStream:
         return sabr_redirect
 
     def process_snackbar_message(self):
+        # Waited for once the response is consumed, the server would time out the unread rest
+        self.pending_wait += self.snackbar_wait()
+
+    def snackbar_wait(self) -> float:
+        """Return how long to wait before the forced ad can be skipped, in seconds."""
         skip = self.sabr_context_updates[self.sabr_contexts_to_send[-1]].get("skip", 1000) / 1000
 
         if skip >= 60:
@@ -375,8 +750,8 @@ class ServerAbrStream:
 
         logger.warning(f"SABR YouTube is forcing ads, wait {skip} seconds to skip")
 
-        sleep(skip)
         self.maximum_reload_attempt -= 1
+        return skip
 
     # Reference https://github.com/coletdjnz/yt-dlp-dev/blob/5c0c296/yt_dlp/extractor/youtube/_streaming/sabr/stream.py
     def process_stream_protection_status(self, data):
@@ -448,10 +823,9 @@ class ServerAbrStream:
                 "mimeType": data.mimeType,
                 "sequenceCount": data.endSegmentNumber,
                 "sequenceList": [],
-                "mediaChunks": [],
                 "_state": {
                     "formatId": data.formatId,
-                    "startTimeMs": 0,
+                    "startTimeMs": self.start_ms,
                     "durationMs": 0,
                     "startSegmentIndex": 1,
                     "endSegmentIndex": 0
@@ -471,13 +845,18 @@ class ServerAbrStream:
         # ContextUpdate is bound to server url
         self.sabr_contexts_to_send = []
         self.sabr_context_updates = dict()
-
-        self.youtube.vid_info = None
-        refresh_url = self.youtube.server_abr_streaming_url
+        self.refresh_streaming_url()
+
+    def refresh_streaming_url(self):
+        """Get a new streaming url and ustreamer config from a new player response."""
+        with _refresh_lock:
+            self.youtube.refresh_vid_info()
+            refresh_url = self.youtube.server_abr_streaming_url
+            video_playback_ustreamer_config = self.youtube.video_playback_ustreamer_config
         if not refresh_url:
             raise ValueError("Invalid SABR refresh")
         self.server_abr_streaming_url = refresh_url
-        self.video_playback_ustreamer_config = self.youtube.video_playback_ustreamer_config
+        self.video_playback_ustreamer_config = video_playback_ustreamer_config
 
     @staticmethod
     def base64_to_u8(base64_str):
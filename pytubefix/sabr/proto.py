@@ -11,6 +11,9 @@ def assert_int32(value):
         raise ValueError("Value is not a valid int32")
 
 def varint32write(value, buf):
+    if value < 0x80:
+        buf.append(value)
+        return
     while value > 0x7F:
         buf.append((value & 0x7F) | 0x80)
         value >>= 7
@@ -27,7 +30,37 @@ def varint64write(lo, hi, buf):
         hi = hi >> 7
     buf.append(lo)
 
+def varint_write(value: int, buf):
+    """Write an unsigned varint of any size at once, most of them are a single byte."""
+    if value < 0x80:
+        buf.append(value)
+        return
+    encoded = bytearray()
+    while value > 0x7F:
+        encoded.append((value & 0x7F) | 0x80)
+        value >>= 7
+    encoded.append(value)
+    buf += encoded
+
+def read_varint(buf, pos: int):
+    """Read an unsigned varint of up to 64 bits as a single integer."""
+    b = buf[pos]
+    if b < 0x80:
+        return b, pos + 1
+    result = b & 0x7F
+    shift = 7
+    while True:
+        b = buf[pos + shift // 7]
+        result |= (b & 0x7F) << shift
+        if b < 0x80:
+            return result & 0xFFFFFFFFFFFFFFFF, pos + shift // 7 + 1
+        shift += 7
+        if shift > 63:
+            raise ValueError("invalid varint")
+
 def read_varint32(buf: bytes, pos: int):
+    if pos < len(buf) and buf[pos] < 0x80:
+        return buf[pos], pos + 1
     result = shift = 0
     while True:
         if pos >= len(buf):
@@ -100,46 +133,49 @@ class ProtoInt64:
 class BinaryWriter:
     def __init__(self, encode_utf8: Callable[[str], bytes] = lambda s: s.encode('utf-8')):
         self.encode_utf8 = encode_utf8
+        # Start of the forked messages, their length is inserted there when they are joined
         self.stack = []
-        self.chunks = []
         self.buf = bytearray()
 
     def finish(self) -> bytes:
-        if self.buf:
-            self.chunks.append(bytes(self.buf))
-            self.buf.clear()
-        return b''.join(self.chunks)
+        return bytes(self.buf)
 
     def fork(self):
-        self.stack.append((self.chunks, self.buf))
-        self.chunks = []
-        self.buf = bytearray()
+        self.stack.append(len(self.buf))
         return self
 
     def join(self):
-        chunk = self.finish()
         if not self.stack:
             raise RuntimeError("Invalid state, fork stack empty")
-        self.chunks, self.buf = self.stack.pop()
-        self.uint32(len(chunk))
-        return self.raw(chunk)
+        start = self.stack.pop()
+        length = len(self.buf) - start
+        if length < 0x80:
+            self.buf.insert(start, length)
+        else:
+            prefix = bytearray()
+            varint_write(length, prefix)
+            self.buf[start:start] = prefix
+        return self
 
     def tag(self, field_no: int, wire_type: int):
         return self.uint32((field_no << 3) | wire_type)
 
     def raw(self, chunk: bytes):
-        if self.buf:
-            self.chunks.append(bytes(self.buf))
-            self.buf.clear()
-        self.chunks.append(chunk)
+        self.buf += chunk
         return self
 
     def uint32(self, value: int):
+        if 0 <= value < 0x80:
+            self.buf.append(value)
+            return self
         assert_uint32(value)
         varint32write(value, self.buf)
         return self
 
     def int32(self, value: int):
+        if 0 <= value < 0x80:
+            self.buf.append(value)
+            return self
         assert_int32(value)
         varint32write(value & 0xFFFFFFFF, self.buf)
         return self
@@ -149,13 +185,12 @@ class BinaryWriter:
         return self
 
     def bytes(self, value: bytes):
-        self.uint32(len(value))
-        return self.raw(value)
+        varint_write(len(value), self.buf)
+        self.buf += value
+        return self
 
     def string(self, value: str):
-        encoded = self.encode_utf8(value)
-        self.uint32(len(encoded))
-        return self.raw(encoded)
+        return self.bytes(self.encode_utf8(value))
 
     def float(self, value: float):
         self.raw(struct.pack('<f', value))
@@ -177,7 +212,7 @@ class BinaryWriter:
 
     def sint32(self, value: int):
         assert_int32(value)
-        encoded = (value << 1) ^ (value >> 31)
+        encoded = ((value << 1) ^ (value >> 31)) & 0xFFFFFFFF
         varint32write(encoded, self.buf)
         return self
 
@@ -192,21 +227,15 @@ class BinaryWriter:
         return self
 
     def int64(self, value: int):
-        tc = ProtoInt64.enc(value)
-        varint64write(tc['lo'], tc['hi'], self.buf)
+        varint_write(value & 0xFFFFFFFFFFFFFFFF, self.buf)
         return self
 
     def sint64(self, value: int):
-        tc = ProtoInt64.enc(value)
-        sign = tc['hi'] >> 31
-        lo = (tc['lo'] << 1) ^ sign
-        hi = ((tc['hi'] << 1) | (tc['lo'] >> 31)) ^ sign
-        varint64write(lo, hi, self.buf)
+        varint_write(((value << 1) ^ (value >> 63)) & 0xFFFFFFFFFFFFFFFF, self.buf)
         return self
 
     def uint64(self, value: int):
-        tc = ProtoInt64.uEnc(value)
-        varint64write(tc['lo'], tc['hi'], self.buf)
+        varint_write(value & 0xFFFFFFFFFFFFFFFF, self.buf)
         return self
 
 
@@ -216,6 +245,10 @@ class BinaryReader:
             buf = bytes(buf)
         elif isinstance(buf, bytearray):
             buf = bytes(buf)
+        elif isinstance(buf, memoryview):
+            # Read in place, the messages of a UMP part are views on the response
+            if buf.format != 'B' or buf.ndim != 1:
+                buf = buf.cast('B')
         elif not isinstance(buf, bytes):
             raise TypeError(f"Unsupported buffer type: {type(buf)}")
 
@@ -263,7 +296,13 @@ class BinaryReader:
             raise EOFError("Premature EOF")
 
     def uint32(self):
-        value, self.pos = read_varint32(self.buf, self.pos)
+        pos = self.pos
+        if pos < self.len:
+            b = self.buf[pos]
+            if b < 0x80:
+                self.pos = pos + 1
+                return b
+        value, self.pos = read_varint32(self.buf, pos)
         return value
 
     def int32(self):
@@ -278,10 +317,12 @@ class BinaryReader:
         return lo, hi
 
     def int64(self):
-        return decode_int64(*self.varint64())
+        value, self.pos = read_varint(self.buf, self.pos)
+        return value - (1 << 64) if value >> 63 else value
 
     def uint64(self):
-        return decode_uint64(*self.varint64())
+        value, self.pos = read_varint(self.buf, self.pos)
+        return value
 
     def sint64(self):
         lo, hi = self.varint64()
@@ -291,8 +332,8 @@ class BinaryReader:
         return decode_int64(lo, hi)
 
     def bool(self):
-        lo, hi = self.varint64()
-        return lo != 0 or hi != 0
+        value, self.pos = read_varint(self.buf, self.pos)
+        return value != 0
 
     def fixed32(self):
         value = struct.unpack_from('<I', self.buf, self.pos)[0]
@@ -329,7 +370,8 @@ class BinaryReader:
         start = self.pos
         self.pos += length
         self.assert_bounds()
-        return self.buf[start:self.pos]
+        # A copy, so that decoded messages don't keep the whole response alive
+        return bytes(self.buf[start:self.pos])
 
     def string(self):
         return self.decode_utf8(self.bytes())
\ No newline at end of file
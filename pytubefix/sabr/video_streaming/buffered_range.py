@@ -201,7 +201,7 @@ class BufferedRange:
         return message
 
 def long_to_number(int64_value):
-    value = int(str(int64_value))
+    value = int(int64_value)
     if value > (2 ** 53 - 1):
         raise OverflowError("Value is larger than 9007199254740991")
     if value < -(2 ** 53 - 1):
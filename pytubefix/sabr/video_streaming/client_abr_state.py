@@ -59,94 +59,10 @@ class ClientAbrState:
         if writer is None:
             writer = BinaryWriter()
 
-        if message.get("timeSinceLastManualFormatSelectionMs", 0):
-            writer.uint32(104).int64(message["timeSinceLastManualFormatSelectionMs"])
-        if message.get("lastManualDirection", 0):
-            writer.uint32(112).sint32(message["lastManualDirection"])
-        if message.get("lastManualSelectedResolution", 0):
-            writer.uint32(128).int32(message["lastManualSelectedResolution"])
-        if message.get("detailedNetworkType", 0):
-            writer.uint32(136).int32(message["detailedNetworkType"])
-        if message.get("clientViewportWidth", 0):
-            writer.uint32(144).int32(message["clientViewportWidth"])
-        if message.get("clientViewportHeight", 0):
-            writer.uint32(152).int32(message["clientViewportHeight"])
-        if message.get("clientBitrateCapBytesPerSec", 0):
-            writer.uint32(160).int64(message["clientBitrateCapBytesPerSec"])
-        if message.get("stickyResolution", 0):
-            writer.uint32(168).int32(message["stickyResolution"])
-        if message.get("clientViewportIsFlexible", False):
-            writer.uint32(176).bool(message["clientViewportIsFlexible"])
-        if message.get("bandwidthEstimate", 0):
-            writer.uint32(184).int64(message["bandwidthEstimate"])
-        if message.get("minAudioQuality", 0):
-            writer.uint32(192).int32(message["minAudioQuality"])
-        if message.get("maxAudioQuality", 0):
-            writer.uint32(200).int32(message["maxAudioQuality"])
-        if message.get("videoQualitySetting", 0):
-            writer.uint32(208).int32(message["videoQualitySetting"])
-        if message.get("audioRoute", 0):
-            writer.uint32(216).int32(message["audioRoute"])
-        if message.get("playerTimeMs", 0):
-            writer.uint32(224).int64(message["playerTimeMs"])
-        if message.get("timeSinceLastSeek", 0):
-            writer.uint32(232).int64(message["timeSinceLastSeek"])
-        if message.get("dataSaverMode", False):
-            writer.uint32(240).bool(message["dataSaverMode"])
-        if message.get("networkMeteredState", 0):
-            writer.uint32(256).int32(message["networkMeteredState"])
-        if message.get("visibility", 0):
-            writer.uint32(272).int32(message["visibility"])
-        if message.get("playbackRate", 0):
-            writer.uint32(285).float(message["playbackRate"])
-        if message.get("elapsedWallTimeMs", 0):
-            writer.uint32(288).int64(message["elapsedWallTimeMs"])
-        if message.get("mediaCapabilities", b''):
-            writer.uint32(306).bytes(message["mediaCapabilities"])
-        if message.get("timeSinceLastActionMs", 0):
-            writer.uint32(312).int64(message["timeSinceLastActionMs"])
-        if message.get("enabledTrackTypesBitfield", 0):
-            writer.uint32(320).int32(message["enabledTrackTypesBitfield"])
-        if message.get("maxPacingRate", 0):
-            writer.uint32(344).int32(message["maxPacingRate"])
-        if message.get("playerState", 0):
-            writer.uint32(352).int64(message["playerState"])
-        if message.get("drcEnabled", False):
-            writer.uint32(368).bool(message["drcEnabled"])
-        if message.get("Jda", 0):
-            writer.uint32(384).int32(message["Jda"])
-        if message.get("qw", 0):
-            writer.uint32(400).int32(message["qw"])
-        if message.get("Ky", 0):
-            writer.uint32(408).int32(message["Ky"])
-        if message.get("sabrReportRequestCancellationInfo", 0):
-            writer.uint32(432).int32(message["sabrReportRequestCancellationInfo"])
-        if message.get("l", False):
-            writer.uint32(448).bool(message["l"])
-        if message.get("G7", 0):
-            writer.uint32(456).int64(message["G7"])
-        if message.get("preferVp9", False):
-            writer.uint32(464).bool(message["preferVp9"])
-        if message.get("qj", 0):
-            writer.uint32(472).int32(message["qj"])
-        if message.get("Hx", 0):
-            writer.uint32(480).int32(message["Hx"])
-        if message.get("isPrefetch", False):
-            writer.uint32(488).bool(message["isPrefetch"])
-        if message.get("sabrSupportQualityConstraints", 0):
-            writer.uint32(496).int32(message["sabrSupportQualityConstraints"])
-        if message.get("sabrLicenseConstraint", b''):
-            writer.uint32(506).bytes(message["sabrLicenseConstraint"])
-        if message.get("allowProximaLiveLatency", 0):
-            writer.uint32(512).int32(message["allowProximaLiveLatency"])
-        if message.get("sabrForceProxima", 0):
-            writer.uint32(528).int32(message["sabrForceProxima"])
-        if message.get("Tqb", 0):
-            writer.uint32(536).int32(message["Tqb"])
-        if message.get("sabrForceMaxNetworkInterruptionDurationMs", 0):
-            writer.uint32(544).int64(message["sabrForceMaxNetworkInterruptionDurationMs"])
-        if message.get("audioTrackId", ""):
-            writer.uint32(554).string(message["audioTrackId"])
+        # Only the fields that are set are looked at
+        encoders = sorted(_encoders[key] for key, value in message.items() if value and key in _encoders)
+        for _, key, tag, write in encoders:
+            write(writer.raw(tag), message[key])
 
         return writer
 
@@ -300,9 +216,61 @@ class ClientAbrState:
         return message
 
 def long_to_number(int64_value):
-    value = int(str(int64_value))
+    value = int(int64_value)
     if value > (2 ** 53 - 1):
         raise OverflowError("Value is larger than 9007199254740991")
     if value < -(2 ** 53 - 1):
         raise OverflowError("Value is smaller than -9007199254740991")
-    return value
\ No newline at end of file
+    return value
+
+
+# Tag and writer of every field, by key
+_fields = {
+    'timeSinceLastManualFormatSelectionMs': (104, BinaryWriter.int64),
+    'lastManualDirection': (112, BinaryWriter.sint32),
+    'lastManualSelectedResolution': (128, BinaryWriter.int32),
+    'detailedNetworkType': (136, BinaryWriter.int32),
+    'clientViewportWidth': (144, BinaryWriter.int32),
+    'clientViewportHeight': (152, BinaryWriter.int32),
+    'clientBitrateCapBytesPerSec': (160, BinaryWriter.int64),
+    'stickyResolution': (168, BinaryWriter.int32),
+    'clientViewportIsFlexible': (176, BinaryWriter.bool),
+    'bandwidthEstimate': (184, BinaryWriter.int64),
+    'minAudioQuality': (192, BinaryWriter.int32),
+    'maxAudioQuality': (200, BinaryWriter.int32),
+    'videoQualitySetting': (208, BinaryWriter.int32),
+    'audioRoute': (216, BinaryWriter.int32),
+    'playerTimeMs': (224, BinaryWriter.int64),
+    'timeSinceLastSeek': (232, BinaryWriter.int64),
+    'dataSaverMode': (240, BinaryWriter.bool),
+    'networkMeteredState': (256, BinaryWriter.int32),
+    'visibility': (272, BinaryWriter.int32),
+    'playbackRate': (285, BinaryWriter.float),
+    'elapsedWallTimeMs': (288, BinaryWriter.int64),
+    'mediaCapabilities': (306, BinaryWriter.bytes),
+    'timeSinceLastActionMs': (312, BinaryWriter.int64),
+    'enabledTrackTypesBitfield': (320, BinaryWriter.int32),
+    'maxPacingRate': (344, BinaryWriter.int32),
+    'playerState': (352, BinaryWriter.int64),
+    'drcEnabled': (368, BinaryWriter.bool),
+    'Jda': (384, BinaryWriter.int32),
+    'qw': (400, BinaryWriter.int32),
+    'Ky': (408, BinaryWriter.int32),
+    'sabrReportRequestCancellationInfo': (432, BinaryWriter.int32),
+    'l': (448, BinaryWriter.bool),
+    'G7': (456, BinaryWriter.int64),
+    'preferVp9': (464, BinaryWriter.bool),
+    'qj': (472, BinaryWriter.int32),
+    'Hx': (480, BinaryWriter.int32),
+    'isPrefetch': (488, BinaryWriter.bool),
+    'sabrSupportQualityConstraints': (496, BinaryWriter.int32),
+    'sabrLicenseConstraint': (506, BinaryWriter.bytes),
+    'allowProximaLiveLatency': (512, BinaryWriter.int32),
+    'sabrForceProxima': (528, BinaryWriter.int32),
+    'Tqb': (536, BinaryWriter.int32),
+    'sabrForceMaxNetworkInterruptionDurationMs': (544, BinaryWriter.int64),
+    'audioTrackId': (554, BinaryWriter.string),
+}
+
+# The tags are encoded once, the fields are written in the order of their tags
+_encoders = {key: (tag, key, BinaryWriter().uint32(tag).finish(), write) for key, (tag, write) in _fields.items()}
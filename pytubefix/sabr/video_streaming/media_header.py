@@ -31,57 +31,12 @@ class MediaHeader:
             reader = BinaryReader(reader)
         end = reader.len if length is None else reader.pos + length
         message = MediaHeader()
+        fields = _fields
         while reader.pos < end:
             tag = reader.uint32()
-            field = tag >> 3
-
-            if field == 1 and tag == 8:
-                message.headerId = reader.uint32()
-                continue
-            elif field == 2 and tag == 18:
-                message.videoId = reader.string()
-                continue
-            elif field == 3 and tag == 24:
-                message.itag = reader.int32()
-                continue
-            elif field == 4 and tag == 32:
-                message.lmt = long_to_number(reader.uint64())
-                continue
-            elif field == 5 and tag == 42:
-                message.xtags = reader.string()
-                continue
-            elif field == 6 and tag == 48:
-                message.startRange = long_to_number(reader.int64())
-                continue
-            elif field == 7 and tag == 56:
-                message.compressionAlgorithm = reader.int32()
-                continue
-            elif field == 8 and tag == 64:
-                message.isInitSeg = reader.bool()
-                continue
-            elif field == 9 and tag == 72:
-                message.sequenceNumber = long_to_number(reader.int64())
-                continue
-            elif field == 10 and tag == 80:
-                message.field10 = long_to_number(reader.int64())
-                continue
-            elif field == 11 and tag == 88:
-                message.startMs = long_to_number(reader.int64())
-                continue
-            elif field == 12 and tag == 96:
-                message.durationMs = long_to_number(reader.int64())
-                continue
-            elif field == 13 and tag == 106:
-                length = reader.uint32()
-                message.formatId = FormatId.decode(reader, length)
-                continue
-            elif field == 14 and tag == 112:
-                message.contentLength = long_to_number(reader.int64())
-                continue
-            elif field == 15 and tag == 122:
-                length = reader.uint32()
-                message.timeRange = TimeRange.decode(reader, length)
-                continue
+            field = fields.get(tag)
+            if field is not None:
+                setattr(message, field[0], field[1](reader))
             elif (tag & 7) == 4 or tag == 0:
                 break
             else:
@@ -127,9 +82,29 @@ class MediaHeader:
         return writer
 
 def long_to_number(int64_value):
-    value = int(str(int64_value))
+    value = int(int64_value)
     if value > (2 ** 53 - 1):
         raise OverflowError("Value is larger than 9007199254740991")
     if value < -(2 ** 53 - 1):
         raise OverflowError("Value is smaller than -9007199254740991")
-    return value
\ No newline at end of file
+    return value
+
+# Attribute and reader of every field, by tag. A media header is decoded for
+# every segment, looking the tag up is faster than comparing it to each field.
+_fields = {
+    8: ('headerId', BinaryReader.uint32),
+    18: ('videoId', BinaryReader.string),
+    24: ('itag', BinaryReader.int32),
+    32: ('lmt', lambda reader: long_to_number(reader.uint64())),
+    42: ('xtags', BinaryReader.string),
+    48: ('startRange', lambda reader: long_to_number(reader.int64())),
+    56: ('compressionAlgorithm', BinaryReader.int32),
+    64: ('isInitSeg', BinaryReader.bool),
+    72: ('sequenceNumber', lambda reader: long_to_number(reader.int64())),
+    80: ('field10', lambda reader: long_to_number(reader.int64())),
+    88: ('startMs', lambda reader: long_to_number(reader.int64())),
+    96: ('durationMs', lambda reader: long_to_number(reader.int64())),
+    106: ('formatId', lambda reader: FormatId.decode(reader, reader.uint32())),
+    112: ('contentLength', lambda reader: long_to_number(reader.int64())),
+    122: ('timeRange', lambda reader: TimeRange.decode(reader, reader.uint32())),
+}
@@ -15,7 +15,7 @@ class TimeRange:
     def decode(input_data, length=None):
         reader = input_data if isinstance(input_data, BinaryReader) else BinaryReader(input_data)
         end = reader.len if length is None else reader.pos + length
-        message = TimeRange
+        message = TimeRange()
 
         while reader.pos < end:
             tag = reader.uint32()
@@ -49,7 +49,7 @@ class TimeRange:
         return writer
 
 def long_to_number(int64_value):
-    value = int(str(int64_value))
+    value = int(int64_value)
     if value > (2 ** 53 - 1):
         raise OverflowError("Value is larger than 9007199254740991")
     if value < -(2 ** 53 - 1):
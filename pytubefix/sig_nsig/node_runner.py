@@ -1,11 +1,19 @@
 import os
 import json
 import subprocess
-import nodejs_wheel.executable
 
 
 RUNNER_PATH = os.path.join(os.path.dirname(__file__), "vm", "runner.js")
-NODE_DIR = nodejs_wheel.executable.ROOT_DIR
+
+
+def __getattr__(name: str):
+    # NODE_DIR is resolved on first access, so importing this module doesn't import nodejs_wheel
+    if name == 'NODE_DIR':
+        # nodejs_wheel is only imported when node is actually needed
+        import nodejs_wheel.executable
+        globals()[name] = nodejs_wheel.executable.ROOT_DIR
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class NodeRunnerError(Exception):
@@ -44,8 +52,9 @@ class NodeRunner:
 
     @staticmethod
     def _node_path() -> str:
+        node_dir = globals().get('NODE_DIR') or __getattr__('NODE_DIR')
         suffix = ".exe" if os.name == "nt" else ""
-        bin_dir = NODE_DIR if os.name == "nt" else os.path.join(NODE_DIR, "bin")
+        bin_dir = node_dir if os.name == "nt" else os.path.join(node_dir, "bin")
         return os.path.join(bin_dir, 'node' + suffix)
 
     @staticmethod
@@ -11,9 +11,10 @@ import logging
 import os
 from math import ceil
 import sys
+import time
 
 from datetime import datetime, timezone
-from typing import BinaryIO, Dict, Optional, Tuple, Iterator, Callable
+from typing import BinaryIO, Dict, List, Optional, Tuple, Iterator, Callable
 from urllib.error import HTTPError
 from urllib.parse import parse_qs
 from pathlib import Path
@@ -22,17 +23,65 @@ from pytubefix import extract, request
 from pytubefix.helpers import target_directory
 from pytubefix.itags import get_format_profile
 from pytubefix.monostate import Monostate
+from pytubefix.profiler import client_profiler
 from pytubefix.file_system import file_system_verify
-from pytubefix.sabr.core.server_abr_stream import ServerAbrStream
 
 logger = logging.getLogger(__name__)
 
 
+class _lazy_attribute:
+    """A :class:`Stream <Stream>` attribute derived from the raw manifest.
+
+    The value is computed on first access and kept in the ``_<name>`` slot.
+    Assigning to the attribute stores the new value in the same slot, so it
+    behaves like the plain instance attribute it replaces.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.slot = owner.__dict__[f'_{name}']
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return self.slot.__get__(instance, owner)
+        except AttributeError:
+            value = self.func(instance)
+            self.slot.__set__(instance, value)
+            return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, value)
+
+
 class Stream:
     """Container for stream manifest data."""
 
+    # Only the raw manifest entry is kept; everything else is derived from it
+    # on demand by a :class:`_lazy_attribute` backed by one of these slots.
+    __slots__ = (
+        '_monostate', '_stream', '_url', '_decipher', '_is_sabr', '_filesize',
+        'po_token', 'video_playback_ustreamer_config',
+        '_itag', '_xtags', '_mime_type', '_codecs', '_type', '_subtype',
+        '_video_codec', '_audio_codec', '_is_otf', '_bitrate', '_fps',
+        '_is_dash', '_abr', '_resolution', '_is_3d', '_is_hdr', '_is_live',
+        '_is_drc', '_durationMs', '_last_Modified',
+        '_includes_multiple_audio_tracks', '_is_default_audio_track',
+        '_audio_track_name_regionalized', '_audio_track_name',
+        '_audio_track_language_id_regionalized', '_audio_track_language_id',
+    )
+
     def __init__(
-        self, stream: Dict, monostate: Monostate, po_token: str, video_playback_ustreamer_config: str
+        self,
+        stream: Dict,
+        monostate: Monostate,
+        po_token: str,
+        video_playback_ustreamer_config: str,
+        decipher: Optional[Callable[[], str]] = None,
     ):
         """Construct a :class:`Stream <Stream>`.
 
@@ -41,82 +90,169 @@ class Stream:
         :param dict monostate:
             Dictionary of data shared across all instances of
             :class:`Stream <Stream>`.
+        :param Callable decipher:
+            (Optional) Returns the deciphered download url. When given, the
+            url in ``stream`` is still ciphered and is only deciphered the
+            first time :attr:`url <url>` is accessed.
         """
         # A dictionary shared between all instances of :class:`Stream <Stream>`
         # (Borg pattern).
         self._monostate = monostate
 
-        self.url = stream["url"]  # signed download url
-        self.itag = int(
-            stream["itag"]
-        )  # stream format id (youtube nomenclature)
+        # The manifest entry, every other attribute is derived from it.
+        self._stream = stream
 
-        self.xtags = stream["xtags"] if "xtags" in stream else None
+        self._url = stream["url"]  # download url, signed once deciphered
+        self._decipher = decipher
+        self._is_sabr = stream.get('is_sabr', False)
 
-        # set type and codec info
+        # filesize in bytes, None until known
+        self._filesize: Optional[int] = None
 
-        # 'video/webm; codecs="vp8, vorbis"' -> 'video/webm', ['vp8', 'vorbis']
-        self.mime_type, self.codecs = extract.mime_type_codec(stream["mimeType"])
+        self.po_token = po_token
+        self.video_playback_ustreamer_config = video_playback_ustreamer_config
 
-        # 'video/webm' -> 'video', 'webm'
-        self.type, self.subtype = self.mime_type.split("/")
+    @_lazy_attribute
+    def itag(self) -> int:
+        """Stream format id (youtube nomenclature)."""
+        return int(self._stream["itag"])
+
+    @_lazy_attribute
+    def xtags(self) -> Optional[str]:
+        return self._stream.get("xtags")
+
+    # 'video/webm; codecs="vp8, vorbis"' -> 'video/webm', ['vp8', 'vorbis']
+    @_lazy_attribute
+    def mime_type(self) -> str:
+        return extract.mime_type_codec(self._stream["mimeType"])[0]
+
+    @_lazy_attribute
+    def codecs(self) -> List[str]:
+        return extract.mime_type_codec(self._stream["mimeType"])[1]
+
+    # 'video/webm' -> 'video', 'webm'
+    @_lazy_attribute
+    def type(self) -> str:
+        return self.mime_type.split("/")[0]
+
+    @_lazy_attribute
+    def subtype(self) -> str:
+        return self.mime_type.split("/")[1]
+
+    # ['vp8', 'vorbis'] -> video_codec: vp8, audio_codec: vorbis. DASH
+    # streams return NoneType for audio/video depending.
+    @_lazy_attribute
+    def video_codec(self) -> Optional[str]:
+        return self.parse_codecs()[0]
+
+    @_lazy_attribute
+    def audio_codec(self) -> Optional[str]:
+        return self.parse_codecs()[1]
+
+    @_lazy_attribute
+    def is_otf(self) -> bool:
+        return self._stream["is_otf"]
+
+    @_lazy_attribute
+    def bitrate(self) -> Optional[int]:
+        return self._stream["bitrate"]
+
+    # Additional information about the stream format, such as resolution,
+    # frame rate, and whether the stream is live (HLS) or 3D.
+    @_lazy_attribute
+    def fps(self) -> int:
+        """Frames per second, video streams only."""
+        if 'fps' not in self._stream:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute 'fps'")
+        return self._stream['fps']
+
+    @_lazy_attribute
+    def is_dash(self) -> bool:
+        return get_format_profile(self.itag)["is_dash"]
+
+    @_lazy_attribute
+    def abr(self) -> Optional[str]:
+        """Average bitrate (audio streams only)."""
+        return get_format_profile(self.itag)["abr"]
+
+    @_lazy_attribute
+    def resolution(self) -> Optional[str]:
+        """Resolution (e.g.: "480p")."""
+        return get_format_profile(self.itag)["resolution"]
+
+    @_lazy_attribute
+    def is_3d(self) -> bool:
+        return get_format_profile(self.itag)["is_3d"]
+
+    @_lazy_attribute
+    def is_hdr(self) -> bool:
+        return get_format_profile(self.itag)["is_hdr"]
+
+    @_lazy_attribute
+    def is_live(self) -> bool:
+        return get_format_profile(self.itag)["is_live"]
+
+    @_lazy_attribute
+    def is_drc(self) -> bool:
+        return self._stream.get('isDrc', False)
+
+    @_lazy_attribute
+    def durationMs(self) -> str:
+        return self._stream['approxDurationMs']
+
+    @_lazy_attribute
+    def last_Modified(self) -> str:
+        return self._stream['lastModified']
+
+    @_lazy_attribute
+    def includes_multiple_audio_tracks(self) -> bool:
+        return 'audioTrack' in self._stream
+
+    @_lazy_attribute
+    def is_default_audio_track(self) -> bool:
+        if self.includes_multiple_audio_tracks:
+            return "original" in self._stream['audioTrack']['displayName']
+        return self.includes_audio_track and not self.includes_video_track
 
-        # ['vp8', 'vorbis'] -> video_codec: vp8, audio_codec: vorbis. DASH
-        # streams return NoneType for audio/video depending.
-        self.video_codec, self.audio_codec = self.parse_codecs()
+    @_lazy_attribute
+    def audio_track_name_regionalized(self) -> Optional[str]:
+        if self.includes_multiple_audio_tracks:
+            return str(self._stream['audioTrack']['displayName']).replace(" original", "")
+        return None
 
-        self.is_otf: bool = stream["is_otf"]
-        self.bitrate: Optional[int] = stream["bitrate"]
+    @_lazy_attribute
+    def audio_track_name(self) -> Optional[str]:
+        if self.includes_multiple_audio_tracks:
+            return self.audio_track_name_regionalized.split(" ")[0]
+        return None
 
-        # filesize in bytes
-        self._filesize: Optional[int] = int(stream.get('contentLength', 0))
-        
-        # filesize in kilobytes
-        self._filesize_kb: Optional[float] = float(ceil(float(stream.get('contentLength', 0)) / 1024 * 1000) / 1000)
-        
-        # filesize in megabytes
-        self._filesize_mb: Optional[float] = float(ceil(float(stream.get('contentLength', 0)) / 1024 / 1024 * 1000) / 1000)
-        
-        # filesize in gigabytes(fingers crossed we don't need terabytes going forward though)
-        self._filesize_gb: Optional[float] = float(ceil(float(stream.get('contentLength', 0)) / 1024 / 1024 / 1024 * 1000) / 1000)
-
-        # Additional information about the stream format, such as resolution,
-        # frame rate, and whether the stream is live (HLS) or 3D.
-        itag_profile = get_format_profile(self.itag)
-        self.is_dash = itag_profile["is_dash"]
-        self.abr = itag_profile["abr"]  # average bitrate (audio streams only)
-        if 'fps' in stream:
-            self.fps = stream['fps']  # Video streams only
-        self.resolution = itag_profile[
-            "resolution"
-        ]  # resolution (e.g.: "480p")
-
-        self._width = stream["width"] if 'width' in stream else None
-        self._height = stream["height"] if 'height' in stream else None
-
-        self.is_3d = itag_profile["is_3d"]
-        self.is_hdr = itag_profile["is_hdr"]
-        self.is_live = itag_profile["is_live"]
-        self.is_drc = stream.get('isDrc', False)
-        self._is_sabr = stream.get('is_sabr', False)
-        self.durationMs = stream['approxDurationMs']
-        self.last_Modified = stream['lastModified']
-        self.po_token = po_token
-        self.video_playback_ustreamer_config = video_playback_ustreamer_config
+    @_lazy_attribute
+    def audio_track_language_id_regionalized(self) -> Optional[str]:
+        if self.includes_multiple_audio_tracks:
+            return str(self._stream['audioTrack']['id']).split(".")[0]
+        return None
 
-        self.includes_multiple_audio_tracks: bool = 'audioTrack' in stream
+    @_lazy_attribute
+    def audio_track_language_id(self) -> Optional[str]:
         if self.includes_multiple_audio_tracks:
-            self.is_default_audio_track = "original" in stream['audioTrack']['displayName']
-            self.audio_track_name_regionalized = str(stream['audioTrack']['displayName']).replace(" original", "")
-            self.audio_track_name = self.audio_track_name_regionalized.split(" ")[0]
-            self.audio_track_language_id_regionalized= str(stream['audioTrack']['id']).split(".")[0]
-            self.audio_track_language_id= self.audio_track_language_id_regionalized.split("-")[0] 
-        else:
-            self.is_default_audio_track = self.includes_audio_track and not self.includes_video_track
-            self.audio_track_name_regionalized = None
-            self.audio_track_name = None
-            self.audio_track_language_id_regionalized = None
-            self.audio_track_language_id= None
+            return self.audio_track_language_id_regionalized.split("-")[0]
+        return None
+
+    @property
+    def url(self) -> str:
+        """The signed download url.
+
+        :rtype: str
+        """
+        if self._decipher is not None:
+            self._url = self._decipher()
+            self._decipher = None
+        return self._url
+
+    @url.setter
+    def url(self, value: str):
+        self._url = value
+        self._decipher = None
 
     @property
     def is_adaptive(self) -> bool:
@@ -195,7 +331,7 @@ class Stream:
         :returns:
             Returns an int of the video width
         """
-        return self._width
+        return self._stream.get("width")
 
     @property
     def height(self) -> int:
@@ -205,7 +341,7 @@ class Stream:
         :returns:
             Returns an int of the video height
         """
-        return self._height
+        return self._stream.get("height")
 
     @property
     def filesize(self) -> int:
@@ -215,6 +351,8 @@ class Stream:
         :returns:
             Filesize (in bytes) of the stream.
         """
+        if not self._filesize:
+            self._filesize = int(self._stream.get('contentLength', 0))
         if self._filesize == 0:
             try:
                 self._filesize = request.filesize(self.url)
@@ -223,7 +361,7 @@ class Stream:
                     raise
                 self._filesize = request.seq_filesize(self.url)
         return self._filesize
-    
+
     @property
     def filesize_kb(self) -> float:
         """File size of the media stream in kilobytes.
@@ -232,15 +370,8 @@ class Stream:
         :returns:
             Rounded filesize (in kilobytes) of the stream.
         """
-        if self._filesize_kb == 0:
-            try:
-                self._filesize_kb = float(ceil(request.filesize(self.url)/1024 * 1000) / 1000)
-            except HTTPError as e:
-                if e.code != 404:
-                    raise
-                self._filesize_kb = float(ceil(request.seq_filesize(self.url)/1024 * 1000) / 1000)
-        return self._filesize_kb
-    
+        return float(ceil(self.filesize / 1024 * 1000) / 1000)
+
     @property
     def filesize_mb(self) -> float:
         """File size of the media stream in megabytes.
@@ -249,14 +380,7 @@ class Stream:
         :returns:
             Rounded filesize (in megabytes) of the stream.
         """
-        if self._filesize_mb == 0:
-            try:
-                self._filesize_mb = float(ceil(request.filesize(self.url)/1024/1024 * 1000) / 1000)
-            except HTTPError as e:
-                if e.code != 404:
-                    raise
-                self._filesize_mb = float(ceil(request.seq_filesize(self.url)/1024/1024 * 1000) / 1000)
-        return self._filesize_mb
+        return float(ceil(self.filesize / 1024 / 1024 * 1000) / 1000)
 
     @property
     def filesize_gb(self) -> float:
@@ -266,15 +390,8 @@ class Stream:
         :returns:
             Rounded filesize (in gigabytes) of the stream.
         """
-        if self._filesize_gb == 0:
-            try:
-                self._filesize_gb = float(ceil(request.filesize(self.url)/1024/1024/1024 * 1000) / 1000)
-            except HTTPError as e:
-                if e.code != 404:
-                    raise
-                self._filesize_gb = float(ceil(request.seq_filesize(self.url)/1024/1024/1024 * 1000) / 1000)
-        return self._filesize_gb
-    
+        return float(ceil(self.filesize / 1024 / 1024 / 1024 * 1000) / 1000)
+
     @property
     def title(self,) -> str:
         """Get title of video
@@ -328,7 +445,11 @@ class Stream:
         skip_existing: bool = True,
         timeout: Optional[int] = None,
         max_retries: int = 0,
-        interrupt_checker: Optional[Callable[[], bool]] = None
+        interrupt_checker: Optional[Callable[[], bool]] = None,
+        connections: int = 1,
+        resume: bool = False,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
     ) -> Optional[str]:
         
         """
@@ -342,12 +463,17 @@ class Stream:
             timeout (Optional[int]): Maximum time, in seconds, to wait for the download request. Defaults to None for no timeout.
             max_retries (int): The number of times to retry the download if it fails. Defaults to 0 (no retries).
             interrupt_checker (Optional[Callable[[], bool]]): A callable function that is checked periodically during the download. If it returns True, the download will stop without errors.
+            connections (int): Number of SABR sessions downloading windows of the video in parallel. Only used by SABR streams. Defaults to 1.
+            resume (bool): Save the progress of a SABR download to a checkpoint file next to the output, and continue an interrupted download from it instead of starting again. Only used by single session SABR downloads. Defaults to False.
+            start_ms (Optional[int]): Start of the clip to download, in milliseconds. The clip starts at the beginning of the segment holding this time. Only SABR streams can be clipped. Defaults to the beginning of the video.
+            end_ms (Optional[int]): End of the clip to download, in milliseconds. Only SABR streams can be clipped. Defaults to the end of the video.
 
         Returns:
             Optional[str]: The full file path of the downloaded file, or None if the download was skipped or failed.
 
         Raises:
             HTTPError: Raised if there is an error with the HTTP request during the download process.
+            ValueError: Raised if a clip is asked for a stream that isn't SABR.
 
         Note:
             - The `skip_existing` flag avoids redownloading if the file already exists in the target location.
@@ -355,36 +481,21 @@ class Stream:
             - Download progress can be monitored using the `on_progress` callback, and the `on_complete` callback is triggered once the download is finished.
         """
    
-        kernel = sys.platform
-
-        if kernel == "linux":
-            file_system = "ext4"
-        elif kernel == "darwin":
-            file_system = "APFS"
-        else:
-            file_system = "NTFS"  
-                
-        translation_table = file_system_verify(file_system)
-
-        if filename is None:
-            filename = self.default_filename.translate(translation_table)
-
-        if filename:
-            filename = filename.translate(translation_table)
-
-        file_path = self.get_file_path(
-            filename=filename,
-            output_path=output_path,
-            filename_prefix=filename_prefix,
-            file_system=file_system
-        )
+        self._check_clip(start_ms, end_ms)
+        file_path = self._download_path(output_path, filename, filename_prefix)
 
         if skip_existing and self.exists_at_path(file_path):
             logger.debug(f'file {file_path} already exists, skipping')
             self.on_complete(file_path)
             return file_path
 
-        bytes_remaining = self.filesize
+        checkpoint_path = None
+        offsets = {self.itag: 0}
+        if resume and self.is_sabr and connections == 1:
+            checkpoint_path = f'{file_path}.sabr'
+            offsets = self._resume_offsets(checkpoint_path, {self.itag: file_path}, start_ms, end_ms)
+
+        bytes_remaining = self.filesize - offsets[self.itag]
         logger.debug(f'downloading ({self.filesize} total bytes) file to {file_path}')
 
         def write_chunk(chunk_, bytes_remaining_):
@@ -392,7 +503,8 @@ class Stream:
             self.on_progress(chunk_, fh, bytes_remaining_)
 
 
-        with open(file_path, "wb") as fh:
+        start = time.perf_counter()
+        with _open_output(file_path, offsets[self.itag]) as fh:
             try:
                 if not self.is_sabr:
                     for chunk in request.stream(
@@ -408,7 +520,9 @@ class Stream:
                         write_chunk(chunk, bytes_remaining)
                 else:
                     logger.debug('This stream is SABR. Starting ServerAbrStream')
-                    ServerAbrStream(stream=self, write_chunk=write_chunk, monostate=self._monostate).start()
+                    bytes_remaining = self._sabr_download(
+                        write_chunk, connections, checkpoint_path, start_ms=start_ms, end_ms=end_ms
+                    )[self.itag]
 
             except HTTPError as e:
                 if e.code != 404:
@@ -429,11 +543,316 @@ class Stream:
                         write_chunk(chunk, bytes_remaining)
                 else:
                     logger.debug('This stream is SABR. Starting ServerAbrStream')
-                    ServerAbrStream(stream=self, write_chunk=write_chunk, monostate=self._monostate).start()
+                    bytes_remaining = self._sabr_download(
+                        write_chunk, connections, checkpoint_path, start_ms=start_ms, end_ms=end_ms
+                    )[self.itag]
 
+            self._record_download(self.filesize - offsets[self.itag] - bytes_remaining, start)
             self.on_complete(file_path)
             return file_path
 
+    async def download_async(
+        self,
+        output_path: Optional[str] = None,
+        filename: Optional[str] = None,
+        filename_prefix: Optional[str] = None,
+        skip_existing: bool = True,
+        timeout: Optional[int] = None,
+        max_retries: int = 0,
+        resume: bool = False,
+        http_client=None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> str:
+        """Download the stream without blocking the event loop, for :class:`AsyncYouTube`.
+
+        SABR streams are fetched by an :class:`AsyncServerAbrStream`, the
+        others with the ranged requests of :meth:`AsyncHTTPClient.stream`.
+
+        :param str output_path:
+            (Optional) Directory the file is saved to, the current directory by default.
+        :param str filename:
+            (Optional) Name of the file.
+        :param str filename_prefix:
+            (Optional) Prefix added to the file name.
+        :param bool skip_existing:
+            (Optional) Don't download the stream if its file already exists.
+        :param int timeout:
+            (Optional) Timeout of the requests, in seconds.
+        :param int max_retries:
+            (Optional) Number of retries of a failed request, only used by the streams that aren't SABR.
+        :param bool resume:
+            (Optional) Save the progress of a SABR download, and continue it
+            from where it stopped if it was interrupted.
+        :param http_client:
+            (Optional) The :class:`AsyncHTTPClient` sending the requests.
+        :param int start_ms:
+            (Optional) Start of the clip to download, SABR streams only.
+        :param int end_ms:
+            (Optional) End of the clip to download, SABR streams only.
+        :rtype: str
+        :returns:
+            The path of the downloaded file.
+        """
+        from pytubefix.async_http_client import AsyncHTTPClient
+
+        self._check_clip(start_ms, end_ms)
+        http_client = http_client or AsyncHTTPClient()
+        file_path = self._download_path(output_path, filename, filename_prefix)
+
+        if skip_existing and self.exists_at_path(file_path):
+            logger.debug(f'file {file_path} already exists, skipping')
+            self.on_complete(file_path)
+            return file_path
+
+        checkpoint_path = None
+        offsets = {self.itag: 0}
+        if resume and self.is_sabr:
+            checkpoint_path = f'{file_path}.sabr'
+            offsets = self._resume_offsets(checkpoint_path, {self.itag: file_path}, start_ms, end_ms)
+
+        bytes_remaining = self.filesize - offsets[self.itag]
+        logger.debug(f'downloading ({self.filesize} total bytes) file to {file_path}')
+
+        start = time.perf_counter()
+        with _open_output(file_path, offsets[self.itag]) as fh:
+            if self.is_sabr:
+                from pytubefix.sabr.core.async_server_abr_stream import AsyncServerAbrStream
+                abr_stream = AsyncServerAbrStream(
+                    stream=self, write_chunk=lambda chunk, bytes_remaining_: self.on_progress(
+                        chunk, fh, bytes_remaining_
+                    ),
+                    monostate=self._monostate, start_ms=start_ms or 0, end_ms=end_ms,
+                    checkpoint_path=checkpoint_path, http_client=http_client
+                )
+                await abr_stream.start()
+                bytes_remaining = abr_stream.bytes_remaining
+            else:
+                async for chunk in http_client.stream(self.url, timeout=timeout, max_retries=max_retries):
+                    bytes_remaining -= len(chunk)
+                    self.on_progress(chunk, fh, bytes_remaining)
+
+        self._record_download(self.filesize - offsets[self.itag] - bytes_remaining, start)
+        self.on_complete(file_path)
+        return file_path
+
+    def download_with_audio(
+        self,
+        audio_stream: 'Stream',
+        output_path: Optional[str] = None,
+        filename: Optional[str] = None,
+        audio_filename: Optional[str] = None,
+        filename_prefix: Optional[str] = None,
+        skip_existing: bool = True,
+        connections: int = 1,
+        resume: bool = False,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> Tuple[str, str]:
+        """Download this video stream and an audio stream to two files.
+
+        When both are SABR streams they are fetched by a single SABR session:
+        every request asks for the video and the audio formats, and the media
+        parts are written to the file of their stream. Otherwise each stream is
+        downloaded with :meth:`download`.
+
+        :param Stream audio_stream:
+            The audio stream downloaded along with this video stream.
+        :param str output_path:
+            (Optional) Directory the files are saved to, the current directory by default.
+        :param str filename:
+            (Optional) Name of the video file.
+        :param str audio_filename:
+            (Optional) Name of the audio file.
+        :param str filename_prefix:
+            (Optional) Prefix added to both file names.
+        :param bool skip_existing:
+            (Optional) Don't download the streams whose file already exists.
+        :param int connections:
+            (Optional) Number of SABR sessions downloading windows of the video in parallel.
+        :param bool resume:
+            (Optional) Save the progress of a single session SABR download, and
+            continue it from where it stopped if it was interrupted.
+        :param int start_ms:
+            (Optional) Start of the clip to download, in milliseconds, SABR streams only.
+        :param int end_ms:
+            (Optional) End of the clip to download, in milliseconds, SABR streams only.
+        :rtype: Tuple[str, str]
+        :returns:
+            The paths of the video file and of the audio file.
+        """
+        if not (self.is_sabr and audio_stream.is_sabr):
+            return (
+                self.download(output_path, filename, filename_prefix, skip_existing,
+                              connections=connections, resume=resume, start_ms=start_ms, end_ms=end_ms),
+                audio_stream.download(output_path, audio_filename, filename_prefix, skip_existing,
+                                      connections=connections, resume=resume, start_ms=start_ms, end_ms=end_ms)
+            )
+
+        self._check_clip(start_ms, end_ms)
+        file_path = self._download_path(output_path, filename, filename_prefix)
+        audio_file_path = audio_stream._download_path(output_path, audio_filename, filename_prefix)
+        if skip_existing and self.exists_at_path(file_path) and audio_stream.exists_at_path(audio_file_path):
+            logger.debug(f'files {file_path} and {audio_file_path} already exist, skipping')
+            self.on_complete(file_path)
+            audio_stream.on_complete(audio_file_path)
+            return file_path, audio_file_path
+
+        checkpoint_path = None
+        offsets = {self.itag: 0, audio_stream.itag: 0}
+        if resume and connections == 1:
+            checkpoint_path = f'{file_path}.sabr'
+            offsets = self._resume_offsets(
+                checkpoint_path, {self.itag: file_path, audio_stream.itag: audio_file_path}, start_ms, end_ms
+            )
+
+        logger.debug(f'downloading {file_path} and {audio_file_path} in a single SABR session')
+        start = time.perf_counter()
+        with _open_output(file_path, offsets[self.itag]) as fh, \
+                _open_output(audio_file_path, offsets[audio_stream.itag]) as audio_fh:
+            bytes_remaining = self._sabr_download(
+                lambda chunk, bytes_remaining_: self.on_progress(chunk, fh, bytes_remaining_),
+                connections,
+                checkpoint_path,
+                audio_stream=audio_stream,
+                write_audio_chunk=lambda chunk, bytes_remaining_: audio_stream.on_progress(
+                    chunk, audio_fh, bytes_remaining_
+                ),
+                start_ms=start_ms,
+                end_ms=end_ms
+            )
+
+        downloaded_bytes = sum(
+            stream.filesize - offsets[stream.itag] - bytes_remaining[stream.itag] for stream in (self, audio_stream)
+        )
+        self._record_download(downloaded_bytes, start)
+        self.on_complete(file_path)
+        audio_stream.on_complete(audio_file_path)
+        return file_path, audio_file_path
+
+    def _sabr_download(
+        self,
+        write_chunk: Callable,
+        connections: int = 1,
+        checkpoint_path: Optional[str] = None,
+        audio_stream: Optional['Stream'] = None,
+        write_audio_chunk: Optional[Callable] = None,
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Download the stream, and optionally an audio stream, with SABR.
+
+        :param int connections:
+            (Optional) Number of windows of the video downloaded in parallel.
+        :param str checkpoint_path:
+            (Optional) File the progress of a single session is saved to and resumed from.
+        :param int start_ms:
+            (Optional) Start of the downloaded time range, in milliseconds.
+        :param int end_ms:
+            (Optional) End of the downloaded time range, the end of the video by default.
+        :rtype: Dict[int, int]
+        :returns:
+            The number of bytes remaining of every stream, by itag.
+        """
+        # The SABR modules are only loaded for the streams that need them
+        if connections > 1:
+            from pytubefix.sabr.core.parallel_download import download_in_windows
+            stitchers = download_in_windows(
+                self, write_chunk, self._monostate, connections,
+                audio_stream=audio_stream, write_audio_chunk=write_audio_chunk,
+                start_ms=start_ms or 0, end_ms=end_ms
+            )
+            return {itag: stitcher.bytes_remaining for itag, stitcher in stitchers.items()}
+
+        from pytubefix.sabr.core.server_abr_stream import ServerAbrStream
+        abr_stream = ServerAbrStream(
+            stream=self, write_chunk=write_chunk, monostate=self._monostate,
+            audio_stream=audio_stream, write_audio_chunk=write_audio_chunk,
+            start_ms=start_ms or 0, end_ms=end_ms, checkpoint_path=checkpoint_path
+        )
+        abr_stream.start()
+        return {itag: output[1] for itag, output in abr_stream.outputs.items()}
+
+    def _check_clip(self, start_ms: Optional[int], end_ms: Optional[int]) -> None:
+        """Raise a ValueError if a time range is empty or is asked for a stream that can't be clipped."""
+        if start_ms is None and end_ms is None:
+            return
+        if not self.is_sabr:
+            raise ValueError(f'Only SABR streams can be downloaded from {start_ms} ms to {end_ms} ms, itag {self.itag} is not')
+        if end_ms is not None and (start_ms or 0) >= end_ms:
+            raise ValueError(f'Empty time range, {start_ms or 0} ms to {end_ms} ms')
+
+    @staticmethod
+    def _resume_offsets(
+        checkpoint_path: str,
+        file_paths: Dict[int, str],
+        start_ms: Optional[int] = None,
+        end_ms: Optional[int] = None
+    ) -> Dict[int, int]:
+        """Return where each output of an interrupted SABR download continues from.
+
+        :param str checkpoint_path:
+            Path to the checkpoint of the download.
+        :param dict file_paths:
+            Path to the output of every stream, by itag.
+        :param int start_ms:
+            (Optional) Start of the time range being downloaded.
+        :param int end_ms:
+            (Optional) End of the time range being downloaded.
+        :rtype: Dict[int, int]
+        """
+        from pytubefix.sabr.core.server_abr_stream import read_checkpoint
+
+        offsets = {itag: 0 for itag in file_paths}
+        state = read_checkpoint(checkpoint_path)
+        if state is None:
+            return offsets
+        written = state.get('written', {})
+        if (
+                set(written) != {str(itag) for itag in file_paths} or
+                (state.get('startMs', 0), state.get('endMs')) != (start_ms or 0, end_ms) or
+                not all(os.path.isfile(path) and os.path.getsize(path) >= written[str(itag)]
+                        for itag, path in file_paths.items())
+        ):
+            logger.warning(f'The SABR checkpoint {checkpoint_path} doesn\'t match the files or the time range, starting again')
+            os.remove(checkpoint_path)
+            return offsets
+        return {itag: written[str(itag)] for itag in file_paths}
+
+    def _download_path(
+        self,
+        output_path: Optional[str] = None,
+        filename: Optional[str] = None,
+        filename_prefix: Optional[str] = None
+    ) -> str:
+        """Build the path a stream is downloaded to, with a file name valid on this system.
+
+        :rtype: str
+        """
+        kernel = sys.platform
+
+        if kernel == "linux":
+            file_system = "ext4"
+        elif kernel == "darwin":
+            file_system = "APFS"
+        else:
+            file_system = "NTFS"
+
+        translation_table = file_system_verify(file_system)
+
+        if filename is None:
+            filename = self.default_filename.translate(translation_table)
+
+        if filename:
+            filename = filename.translate(translation_table)
+
+        return self.get_file_path(
+            filename=filename,
+            output_path=output_path,
+            filename_prefix=filename_prefix,
+            file_system=file_system
+        )
+
     def get_file_path(
         self,
         filename: Optional[str] = None,
@@ -473,13 +892,28 @@ class Stream:
             "downloading (%s total bytes) file to buffer", self.filesize,
         )
 
+        start = time.perf_counter()
         for chunk in request.stream(self.url):
             # reduce the (bytes) remainder by the length of the chunk.
             bytes_remaining -= len(chunk)
             # send to the on_progress callback.
             self.on_progress(chunk, buffer, bytes_remaining)
+        self._record_download(self.filesize - bytes_remaining, start)
         self.on_complete(None)
 
+    def _record_download(self, downloaded_bytes: int, start: float) -> None:
+        """Record the throughput of a finished download in the client profiler.
+
+        :param int downloaded_bytes:
+            Number of bytes downloaded.
+        :param float start:
+            Value of :func:`time.perf_counter` when the download started.
+        """
+        youtube = self._monostate.youtube
+        if youtube is None or downloaded_bytes <= 0:
+            return
+        client_profiler.record_download(youtube.client, downloaded_bytes, time.perf_counter() - start)
+
     def on_progress(
         self, chunk: bytes, file_handler: BinaryIO, bytes_remaining: int
     ):
@@ -608,3 +1042,20 @@ class Stream:
             yield chunk
 
         self.on_complete(None)
+
+
+def _open_output(file_path: str, offset: int = 0) -> BinaryIO:
+    """Open the output of a download, keeping the first `offset` bytes of a previous attempt.
+
+    :param str file_path:
+        Path to the output.
+    :param int offset:
+        (Optional) Number of bytes already downloaded.
+    :rtype: BinaryIO
+    """
+    if not offset:
+        return open(file_path, "wb")
+    fh = open(file_path, "r+b")
+    fh.truncate(offset)
+    fh.seek(offset)
+    return fh
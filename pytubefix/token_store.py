@@ -0,0 +1,138 @@
+"""Share the OAuth and poToken cache file between InnerTube instances.
+
+A video builds several :class:`InnerTube <pytubefix.innertube.InnerTube>`
+objects, and each of them used to open and parse the token file. The
+:class:`TokenStore` keeps its content in memory and only reads the file again
+when it was changed, by another process for example. Writes are atomic and
+done under a file lock, so that processes sharing the file don't overwrite each
+other's tokens with a half written file.
+"""
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional, Tuple
+
+if os.name == 'nt':
+    import msvcrt
+else:
+    import fcntl
+
+logger = logging.getLogger(__name__)
+
+_stores: Dict[str, 'TokenStore'] = {}
+_stores_lock = threading.Lock()
+
+
+class TokenStore:
+    """In-memory view of a token file."""
+
+    def __init__(self, path: str):
+        """Construct a :class:`TokenStore <TokenStore>`.
+
+        Use :func:`token_store` instead, so that every instance using the same
+        file shares the same store.
+
+        :param str path:
+            Path to the token file.
+        """
+        self.path = path
+        self._data: Dict = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._lock = threading.RLock()
+        self._lock_file = None
+        self._lock_depth = 0
+
+    def _file_signature(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def read(self) -> Dict:
+        """Return the tokens, reading the file only if it changed.
+
+        :rtype: dict
+        """
+        with self._lock:
+            signature = self._file_signature()
+            if signature is None:
+                self._data, self._signature = {}, None
+            elif signature != self._signature:
+                try:
+                    with open(self.path) as f:
+                        self._data = json.load(f)
+                    self._signature = signature
+                except ValueError as e:
+                    logger.warning(f'Unable to read the tokens from {self.path}: {e}')
+            return dict(self._data)
+
+    def write(self, data: Dict) -> None:
+        """Replace the tokens, atomically and under the file lock.
+
+        :param dict data:
+            The tokens to save.
+        """
+        with self.lock():
+            tmp_path = f'{self.path}.{os.getpid()}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self._data = dict(data)
+            self._signature = self._file_signature()
+
+    @contextmanager
+    def lock(self):
+        """Hold the lock of the token file, between threads and between processes.
+
+        It can be acquired again by the thread holding it, so a refresh can
+        read and write the tokens while holding it.
+        """
+        with self._lock:
+            if self._lock_depth == 0:
+                directory = os.path.dirname(self.path)
+                if directory and not os.path.exists(directory):
+                    os.makedirs(directory, exist_ok=True)
+                self._lock_file = open(f'{self.path}.lock', 'a+')
+                _lock_file(self._lock_file)
+            self._lock_depth += 1
+            try:
+                yield
+            finally:
+                self._lock_depth -= 1
+                if self._lock_depth == 0:
+                    _unlock_file(self._lock_file)
+                    self._lock_file.close()
+                    self._lock_file = None
+
+
+def _lock_file(f) -> None:
+    if os.name == 'nt':
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+
+
+def _unlock_file(f) -> None:
+    if os.name == 'nt':
+        f.seek(0)
+        msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+    else:
+        fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def token_store(path: str) -> TokenStore:
+    """Return the store of a token file, shared by every InnerTube using it.
+
+    :param str path:
+        Path to the token file.
+    :rtype: TokenStore
+    """
+    path = os.path.abspath(path)
+    with _stores_lock:
+        if path not in _stores:
+            _stores[path] = TokenStore(path)
+        return _stores[path]
@@ -0,0 +1,155 @@
+"""A process-wide pool of visitorData.
+
+Since 01/22/2025 every client has to send a visitorData with the player request.
+It is not tied to a video, so instead of requesting a new one for every video,
+the first videos each request their own until the pool holds ``max_size`` of
+them, then every video takes one from the pool in turn until they expire or
+YouTube stops accepting them.
+"""
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# How long a visitorData is reused before a new one is requested, in seconds
+_visitor_data_ttl = 3600
+
+
+class VisitorDataPool:
+    """Thread safe pool of visitorData shared by all videos."""
+
+    def __init__(self, ttl: float = _visitor_data_ttl, max_size: int = 4):
+        """Construct a :class:`VisitorDataPool <VisitorDataPool>`.
+
+        :param float ttl:
+            (Optional) Seconds after which a visitorData is no longer handed out.
+        :param int max_size:
+            (Optional) Number of visitorData collected before they are
+            reused, the oldest ones are dropped first.
+        """
+        self.ttl = ttl
+        self.max_size = max_size
+        # visitorData -> time it was obtained, in insertion order
+        self._entries: Dict[str, float] = {}
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire()
+            return len(self._entries)
+
+    def is_full(self) -> bool:
+        """Check whether the pool holds enough visitorData to stop requesting new ones.
+
+        :rtype: bool
+        """
+        with self._lock:
+            self._expire()
+            return len(self._entries) >= self.max_size
+
+    def _expire(self) -> None:
+        deadline = time.time() - self.ttl
+        for visitor_data in [v for v, created in self._entries.items() if created <= deadline]:
+            logger.debug('visitorData expired, removing it from the pool')
+            del self._entries[visitor_data]
+
+    def get(self) -> Optional[str]:
+        """Return a valid visitorData from the pool.
+
+        When several are available they are handed out in turn.
+
+        :rtype: str
+        :returns:
+            A visitorData, or None if the pool is empty.
+        """
+        with self._lock:
+            self._expire()
+            if not self._entries:
+                return None
+            visitor_data = list(self._entries)
+            self._next = (self._next + 1) % len(visitor_data)
+            return visitor_data[self._next]
+
+    def put(self, visitor_data: str, created: Optional[float] = None) -> None:
+        """Add a visitorData to the pool.
+
+        :param str visitor_data:
+            The visitorData to add.
+        :param float created:
+            (Optional) Epoch time when it was obtained, defaults to now.
+        """
+        if not visitor_data:
+            return
+        with self._lock:
+            self._entries.pop(visitor_data, None)
+            self._entries[visitor_data] = time.time() if created is None else created
+            while len(self._entries) > self.max_size:
+                del self._entries[next(iter(self._entries))]
+
+    def reject(self, visitor_data: str) -> None:
+        """Remove a visitorData that YouTube no longer accepts.
+
+        :param str visitor_data:
+            The rejected visitorData.
+        """
+        with self._lock:
+            if self._entries.pop(visitor_data, None) is not None:
+                logger.debug('visitorData was rejected, removing it from the pool')
+
+    def clear(self) -> None:
+        """Remove every visitorData from the pool."""
+        with self._lock:
+            self._entries.clear()
+
+    def load(self, path: str) -> None:
+        """Seed the pool from a file.
+
+        The file has one visitorData per line, optionally followed by the
+        epoch time when it was obtained. Lines without a time are considered
+        to have just been obtained.
+
+        :param str path:
+            Path to the file.
+        """
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if not fields:
+                    continue
+                created = float(fields[1]) if len(fields) > 1 else None
+                self.put(fields[0], created)
+
+    def save(self, path: str) -> None:
+        """Write the valid visitorData of the pool to a file readable by :meth:`load`.
+
+        :param str path:
+            Path to the file.
+        """
+        with self._lock:
+            self._expire()
+            lines: List[str] = [f'{v} {created}\n' for v, created in self._entries.items()]
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            f.writelines(lines)
+
+
+def is_rejected(player_response: dict) -> bool:
+    """Check whether a player response was refused because of the visitorData.
+
+    :param dict player_response:
+        Content of the player's response.
+    :rtype: bool
+    """
+    status = player_response.get('playabilityStatus', {})
+    return status.get('status') == 'LOGIN_REQUIRED' and 'not a bot' in status.get('reason', '')
+
+
+# Used by default by YouTube and AsyncYouTube
+visitor_data_pool = VisitorDataPool()
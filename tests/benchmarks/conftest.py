@@ -0,0 +1,39 @@
+"""Helpers shared by the benchmark tests.
+
+The benchmarks are marked with ``benchmark`` and deselected by default, run
+them with ``pytest tests/benchmarks --benchmarks -s`` to see the timings. The
+timings are only reported: what the benchmarks assert is that the optimized
+code gives the same result as the code it replaced, or does less work.
+"""
+import time
+
+import pytest
+
+
+def best_of(func, *args, repeat=5, number=1, **kwargs):
+    """Return the best wall time in seconds of ``number`` calls to ``func``.
+
+    :param callable func:
+        The callable being measured.
+    :param int repeat:
+        How many measurements to take, the fastest one is returned.
+    :param int number:
+        How many calls are made per measurement.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func(*args, **kwargs)
+        timings.append((time.perf_counter() - start) / number)
+    return min(timings)
+
+
+@pytest.fixture
+def benchmark_report(request):
+    """Collect named timings and print them once the benchmark finishes."""
+    results = {}
+    yield results
+    if results:
+        lines = [f'  {name}: {value}' for name, value in results.items()]
+        print('\n' + request.node.name + '\n' + '\n'.join(lines))
@@ -0,0 +1,42 @@
+"""Benchmarks for extracting every embedded object from a watch page."""
+import pytest
+
+from pytubefix import extract
+from tests.benchmarks.conftest import best_of
+from tests.conftest import load_playback_file
+
+pytestmark = pytest.mark.benchmark
+
+
+def _separate_scans(html):
+    extract.initial_data(html)
+    extract.initial_player_response(html)
+    extract.get_ytcfg(html)
+    extract.js_url(html)
+
+
+def _single_scan(html):
+    page_objects = extract.PageObjects(html)
+    page_objects.initial_data
+    page_objects.initial_player_response
+    page_objects.ytcfg
+    page_objects.js_url
+
+
+@pytest.mark.parametrize("filename", [
+    "yt-video-2lAe1cqCOXo-html.json.gz",
+    "yt-video-WXxV9g7lsFE-html.json.gz",
+])
+def test_page_objects(filename, benchmark_report):
+    html = load_playback_file(filename)['watch_html']
+    page_objects = extract.PageObjects(html)
+    assert page_objects.initial_data == extract.initial_data(html)
+    assert page_objects.initial_player_response == extract.initial_player_response(html)
+    assert page_objects.ytcfg == extract.get_ytcfg(html)
+    assert page_objects.js_url == extract.js_url(html)
+
+    separate = best_of(_separate_scans, html, repeat=3)
+    single = best_of(_single_scan, html, repeat=3)
+
+    benchmark_report['separate scans'] = f'{separate * 1000:.2f} ms'
+    benchmark_report['PageObjects'] = f'{single * 1000:.2f} ms'
@@ -0,0 +1,39 @@
+"""Benchmark for the time taken by ``import pytubefix``."""
+import json
+import subprocess
+import sys
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+# Modules that are slow to import and only needed by some features
+_deferred_modules = ['aiohttp', 'nodejs_wheel', 'pytubefix.sabr', 'pytubefix.streams']
+
+_script = '''
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {modules!r} if m in sys.modules]}}))
+'''
+
+
+def _import(statement):
+    script = _script.format(statement=statement, modules=_deferred_modules)
+    output = subprocess.check_output([sys.executable, '-c', script])
+    return json.loads(output)
+
+
+def test_import_pytubefix(benchmark_report):
+    result = min((_import('import pytubefix') for _ in range(3)), key=lambda r: r['elapsed'])
+    benchmark_report['import pytubefix'] = f"{result['elapsed'] * 1e3:.1f} ms"
+    assert result['loaded'] == []
+
+
+def test_import_youtube(benchmark_report):
+    result = min((_import('from pytubefix import YouTube') for _ in range(3)), key=lambda r: r['elapsed'])
+    benchmark_report['from pytubefix import YouTube'] = f"{result['elapsed'] * 1e3:.1f} ms"
+    assert 'aiohttp' not in result['loaded']
+    assert 'nodejs_wheel' not in result['loaded']
+    assert 'pytubefix.sabr' not in result['loaded']
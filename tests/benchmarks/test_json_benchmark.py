@@ -0,0 +1,40 @@
+"""Benchmark for decoding and encoding the innertube responses."""
+import json
+
+import pytest
+
+from pytubefix import jsonlib
+from tests.benchmarks.conftest import best_of
+from tests.conftest import load_playback_file
+
+pytestmark = pytest.mark.benchmark
+
+PLAYBACK_FILES = [
+    "yt-video-2lAe1cqCOXo-html.json.gz",
+    "yt-video-QRS8MkLhQmM-html.json.gz",
+]
+
+
+def _stdlib_loads(raw):
+    """The previous implementation: decode the bytes, then load the text."""
+    return json.loads(raw.decode('utf-8'))
+
+
+@pytest.mark.parametrize("filename", PLAYBACK_FILES)
+def test_player_response(filename, benchmark_report):
+    vid_info = load_playback_file(filename)['vid_info']
+    raw = json.dumps(vid_info).encode('utf-8')
+    assert jsonlib.loads(raw) == _stdlib_loads(raw)
+    assert json.loads(jsonlib.dumps_bytes(vid_info)) == vid_info
+
+    stdlib_loads = best_of(_stdlib_loads, raw, number=10)
+    facade_loads = best_of(jsonlib.loads, raw, number=10)
+    stdlib_dumps = best_of(lambda obj: json.dumps(obj).encode('utf-8'), vid_info, number=10)
+    facade_dumps = best_of(jsonlib.dumps_bytes, vid_info, number=10)
+
+    benchmark_report['backend'] = jsonlib.backend
+    benchmark_report['response size'] = f'{len(raw) / 1024:.0f} KiB'
+    benchmark_report['json loads'] = f'{stdlib_loads * 1e3:.2f} ms'
+    benchmark_report[f'{jsonlib.backend} loads'] = f'{facade_loads * 1e3:.2f} ms'
+    benchmark_report['json dumps'] = f'{stdlib_dumps * 1e3:.2f} ms'
+    benchmark_report[f'{jsonlib.backend} dumps'] = f'{facade_dumps * 1e3:.2f} ms'
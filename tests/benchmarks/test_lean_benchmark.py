@@ -0,0 +1,46 @@
+"""Benchmark for the memory kept by loaded YouTube objects."""
+import gc
+import tracemalloc
+from unittest import mock
+
+import pytest
+
+from pytubefix import YouTube
+from pytubefix.innertube import InnerTube
+from tests.conftest import load_playback_file
+
+pytestmark = pytest.mark.benchmark
+
+VIDEOS = 20
+
+
+def _retained_bytes(pb, lean):
+    """Load videos like a playlist iteration that keeps them, return the memory kept per video."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        videos = []
+        # Every video gets its own copy of the page, as if it was fetched
+        with mock.patch('pytubefix.request.get', side_effect=lambda url, **kwargs: ''.join(pb['watch_html'])), \
+                mock.patch.object(InnerTube, 'player', side_effect=lambda video_id: dict(pb['vid_info'])):
+            for _ in range(VIDEOS):
+                youtube = YouTube(pb['url'], client='ANDROID_VR', lean=lean)
+                youtube.vid_info
+                youtube.initial_data
+                youtube.js_url
+                videos.append(youtube)
+        gc.collect()
+        return (tracemalloc.get_traced_memory()[0] - start) / VIDEOS
+    finally:
+        tracemalloc.stop()
+
+
+def test_lean_memory(benchmark_report):
+    pb = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    regular = _retained_bytes(pb, lean=False)
+    lean = _retained_bytes(pb, lean=True)
+
+    benchmark_report['regular'] = f'{regular / 1024:.0f} KiB per video'
+    benchmark_report['lean'] = f'{lean / 1024:.0f} KiB per video'
+    assert lean < regular / 2
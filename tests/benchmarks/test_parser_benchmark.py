@@ -0,0 +1,41 @@
+"""Benchmarks for extracting embedded JSON objects from watch pages."""
+import json
+from unittest import mock
+
+import pytest
+
+from pytubefix import parser
+from tests.benchmarks.conftest import best_of
+from tests.conftest import load_playback_file
+
+pytestmark = pytest.mark.benchmark
+
+PLAYBACK_FILES = [
+    "yt-video-2lAe1cqCOXo-html.json.gz",
+    "yt-video-QRS8MkLhQmM-html.json.gz",
+    "yt-video-WXxV9g7lsFE-html.json.gz",
+]
+
+
+def _scanner_parse(html, start_point):
+    """The previous implementation: scan the object, then load it."""
+    return json.loads(parser.find_object_from_startpoint(html, start_point))
+
+
+@pytest.mark.parametrize("filename", PLAYBACK_FILES)
+def test_parse_initial_player_response(filename, benchmark_report):
+    html = load_playback_file(filename)['watch_html']
+    start = html.index('ytInitialPlayerResponse = ') + len('ytInitialPlayerResponse = ')
+
+    expected = _scanner_parse(html, start)
+    with mock.patch.object(parser, 'find_object_from_startpoint', wraps=parser.find_object_from_startpoint) as scan:
+        assert parser.parse_for_object_from_startpoint(html, start) == expected
+    # The JSON object is decoded in place, the page is never scanned
+    scan.assert_not_called()
+
+    scanner = best_of(_scanner_parse, html, start, repeat=3)
+    raw_decode = best_of(parser.parse_for_object_from_startpoint, html, start, repeat=3)
+
+    benchmark_report['html size'] = f'{len(html)} chars'
+    benchmark_report['scanner'] = f'{scanner * 1000:.2f} ms'
+    benchmark_report['raw_decode'] = f'{raw_decode * 1000:.2f} ms'
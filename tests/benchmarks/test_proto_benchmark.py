@@ -0,0 +1,102 @@
+"""Micro-benchmarks for the protobuf codec of the SABR messages."""
+import pytest
+
+from pytubefix.sabr.proto import BinaryReader, BinaryWriter
+from pytubefix.sabr.video_streaming.media_header import MediaHeader
+from pytubefix.sabr.video_streaming.time_range import TimeRange
+from pytubefix.sabr.video_streaming.video_playback_abr_request import VideoPlaybackAbrRequest
+from tests.benchmarks.conftest import best_of
+from tests.conftest import FORMAT_ID
+
+pytestmark = pytest.mark.benchmark
+
+VIDEO_FORMAT_ID = dict(FORMAT_ID, itag=137)
+
+REQUEST = {
+    'clientAbrState': {
+        'lastManualDirection': 0, 'timeSinceLastManualFormatSelectionMs': 0,
+        'lastManualSelectedResolution': 1080, 'stickyResolution': 1080, 'playerTimeMs': 123456,
+        'visibility': 0, 'drcEnabled': False, 'enabledTrackTypesBitfield': 0,
+    },
+    'selectedAudioFormatIds': [FORMAT_ID],
+    'selectedVideoFormatIds': [VIDEO_FORMAT_ID],
+    'selectedFormatIds': [FORMAT_ID, VIDEO_FORMAT_ID],
+    'videoPlaybackUstreamerConfig': bytes(3000),
+    'streamerContext': {
+        'sabrContexts': [], 'field6': [], 'poToken': bytes(100), 'playbackCookie': bytes(20),
+        'clientInfo': {'clientName': 1, 'clientVersion': '2.20250523.01.00', 'osName': 'Windows',
+                       'osVersion': '10.0', 'platform': 'DESKTOP'},
+    },
+    'bufferedRanges': [
+        {'formatId': format_id, 'startTimeMs': 0, 'durationMs': 120000, 'startSegmentIndex': 1, 'endSegmentIndex': 24}
+        for format_id in (FORMAT_ID, VIDEO_FORMAT_ID)
+    ],
+    'field1000': [],
+}
+
+
+def _media_header():
+    time_range = TimeRange()
+    time_range.start, time_range.duration, time_range.timescale = 205000, 5000, 1000
+    return MediaHeader.encode({
+        'headerId': 3, 'videoId': 'abcdefghijk', 'itag': FORMAT_ID['itag'], 'lmt': FORMAT_ID['lastModified'],
+        'startRange': 123456, 'sequenceNumber': 42, 'startMs': 205000, 'durationMs': 5000,
+        'formatId': FORMAT_ID, 'contentLength': 81234, 'timeRange': time_range,
+    }).finish()
+
+
+def _bytewise_uint64(values):
+    """The previous implementation: each value split in two 32 bits halves, written byte by byte."""
+    buf = bytearray()
+    for value in values:
+        lo, hi = value & 0xFFFFFFFF, (value >> 32) & 0xFFFFFFFF
+        for _ in range(9):
+            if hi == 0 and lo < 0x80:
+                break
+            buf.append((lo & 0x7F) | 0x80)
+            lo = ((hi << 25) | (lo >> 7)) & 0xFFFFFFFF
+            hi = hi >> 7
+        buf.append(lo)
+    return bytes(buf)
+
+
+def _uint64(values):
+    writer = BinaryWriter()
+    for value in values:
+        writer.uint64(value)
+    return writer.finish()
+
+
+def test_video_playback_abr_request_encode(benchmark_report):
+    body = VideoPlaybackAbrRequest.encode(REQUEST).finish()
+    request = VideoPlaybackAbrRequest.decode(body)
+    assert request.client_abr_state['playerTimeMs'] == 123456
+    assert request.selected_video_format_ids == [VIDEO_FORMAT_ID]
+
+    encode = best_of(lambda: VideoPlaybackAbrRequest.encode(REQUEST).finish(), number=500)
+    benchmark_report['VideoPlaybackAbrRequest.encode'] = f'{encode * 1e6:.1f} us ({len(body)} bytes)'
+
+
+def test_media_header_decode(benchmark_report):
+    data = _media_header()
+    header = MediaHeader.decode(memoryview(data))
+    assert (header.sequenceNumber, header.contentLength, header.formatId) == (42, 81234, FORMAT_ID)
+    assert (header.timeRange.start, header.timeRange.duration) == (205000, 5000)
+
+    decode = best_of(MediaHeader.decode, memoryview(data), number=2000)
+    benchmark_report['MediaHeader.decode'] = f'{decode * 1e6:.1f} us'
+
+
+def test_varint_encode(benchmark_report):
+    values = [i * 7919 for i in range(2000)] + [FORMAT_ID['lastModified'] + i for i in range(2000)]
+    reader = BinaryReader(_uint64(values))
+    assert [reader.uint64() for _ in values] == values
+
+    bytewise = best_of(_bytewise_uint64, values)
+    bulk = best_of(_uint64, values)
+    benchmark_report['byte by byte'] = f'{bytewise * 1e3:.2f} ms'
+    benchmark_report['bulk'] = f'{bulk * 1e3:.2f} ms'
+
+    # Every varint length, including the boundaries between them
+    edges = [0, 1, 2 ** 64 - 1] + [2 ** (7 * n) + d for n in range(1, 10) for d in (-1, 0)]
+    assert _uint64(values + edges) == _bytewise_uint64(values + edges)
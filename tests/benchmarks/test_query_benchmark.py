@@ -0,0 +1,52 @@
+"""Benchmark for repeated stream selection on one manifest."""
+import pytest
+
+from pytubefix import Stream, StreamQuery, extract
+from pytubefix.monostate import Monostate
+from tests.benchmarks.conftest import best_of
+from tests.conftest import load_playback_file
+
+pytestmark = pytest.mark.benchmark
+
+SELECTIONS = 200
+
+
+def _scan_select(fmt_streams):
+    """Select the best mp4 video and audio by scanning every stream."""
+    video = [s for s in fmt_streams if s.type == "video" and s.subtype == "mp4" and s.is_adaptive]
+    video = sorted(
+        [s for s in video if s.resolution is not None],
+        key=lambda s: int("".join(filter(str.isdigit, s.resolution)))
+    )
+    audio = [s for s in fmt_streams if s.includes_audio_track and not s.includes_video_track]
+    audio = sorted(
+        [s for s in audio if s.abr is not None],
+        key=lambda s: int("".join(filter(str.isdigit, s.abr)))
+    )
+    return video[-1], audio[-1]
+
+
+def _query_select(query):
+    video = query.filter(type="video", subtype="mp4", adaptive=True).order_by("resolution").last()
+    audio = query.filter(only_audio=True).order_by("abr").last()
+    return video, audio
+
+
+def test_repeated_selection(benchmark_report):
+    playback = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    manifest = extract.apply_descrambler(playback['vid_info']['streamingData'])
+    monostate = Monostate(on_progress=None, on_complete=None)
+    fmt_streams = [
+        Stream(s, monostate, po_token=None, video_playback_ustreamer_config=None)
+        for s in manifest
+    ]
+    query = StreamQuery(fmt_streams)
+
+    assert _query_select(query) == _scan_select(fmt_streams)
+
+    scan = best_of(_scan_select, fmt_streams, number=SELECTIONS)
+    indexed = best_of(_query_select, query, number=SELECTIONS)
+
+    benchmark_report['streams'] = len(fmt_streams)
+    benchmark_report['scan'] = f'{scan * 1e6:.1f} us per selection'
+    benchmark_report['indexed'] = f'{indexed * 1e6:.1f} us per selection'
@@ -0,0 +1,67 @@
+"""Benchmarks for building the requests of a SABR session."""
+import base64
+from types import SimpleNamespace
+
+import pytest
+
+from pytubefix.sabr.core.server_abr_stream import ServerAbrStream, _client_info
+from pytubefix.sabr.video_streaming.playback_cookie import PlaybackCookie
+from pytubefix.sabr.video_streaming.video_playback_abr_request import VideoPlaybackAbrRequest
+from tests.benchmarks.conftest import best_of
+from tests.conftest import FORMAT_ID
+
+pytestmark = pytest.mark.benchmark
+
+# The ustreamer config and the poToken of real sessions are a few kilobytes
+USTREAMER_CONFIG = base64.urlsafe_b64encode(bytes(range(256)) * 12).decode()
+PO_TOKEN = base64.urlsafe_b64encode(bytes(range(128))).decode()
+
+
+def session():
+    stream = SimpleNamespace(
+        po_token=PO_TOKEN, url='https://rr1---sn.googlevideo.com/videoplayback', itag=FORMAT_ID['itag'],
+        video_playback_ustreamer_config=USTREAMER_CONFIG, durationMs='600000', filesize=0, type='audio',
+    )
+    abr_stream = ServerAbrStream(stream, None, SimpleNamespace(youtube=None))
+    abr_stream.initialized_formats = [{
+        'formatId': FORMAT_ID,
+        '_state': {'formatId': FORMAT_ID, 'startTimeMs': 0, 'durationMs': 30000,
+                   'startSegmentIndex': 1, 'endSegmentIndex': 3},
+    }]
+    abr_stream.playback_cookie = {'field1': 1, 'field2': 2, 'videoFmt': None, 'audioFmt': FORMAT_ID}
+    return abr_stream
+
+
+def _full_request(abr_stream, client_abr_state, audio_format, video_format):
+    """The previous implementation: the whole message is encoded for every request."""
+    return VideoPlaybackAbrRequest.encode({
+        'clientAbrState': client_abr_state,
+        'selectedAudioFormatIds': audio_format,
+        'selectedVideoFormatIds': video_format,
+        'selectedFormatIds': [fmt["formatId"] for fmt in abr_stream.initialized_formats],
+        'videoPlaybackUstreamerConfig': abr_stream.base64_to_u8(abr_stream.video_playback_ustreamer_config),
+        'streamerContext': {
+            'sabrContexts': [],
+            'field6': [],
+            'poToken': abr_stream.base64_to_u8(abr_stream.po_token),
+            'playbackCookie': PlaybackCookie.encode(abr_stream.playback_cookie).finish(),
+            'clientInfo': _client_info,
+        },
+        'bufferedRanges': [fmt["_state"] for fmt in abr_stream.initialized_formats],
+        'field1000': []
+    }).finish()
+
+
+def test_build_request(benchmark_report):
+    abr_stream = session()
+    client_abr_state = {'playerTimeMs': 30000, 'enabledTrackTypesBitfield': 1, 'stickyResolution': 720}
+    audio_format = [FORMAT_ID]
+    assert abr_stream.build_request(client_abr_state, audio_format, []) == bytes(
+        _full_request(abr_stream, client_abr_state, audio_format, [])
+    )
+
+    full = best_of(_full_request, abr_stream, client_abr_state, audio_format, [], number=200)
+    template = best_of(abr_stream.build_request, client_abr_state, audio_format, [], number=200)
+
+    benchmark_report['whole message'] = f'{full * 1e6:.1f} us'
+    benchmark_report['template'] = f'{template * 1e6:.1f} us'
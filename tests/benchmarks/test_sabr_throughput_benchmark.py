@@ -0,0 +1,39 @@
+"""Benchmark of a whole SABR download, against the local stand-in server."""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from pytubefix.sabr.core.server_abr_stream import ServerAbrStream
+from tests.sabr_server import SabrTestServer, SyntheticFormat
+
+pytestmark = pytest.mark.benchmark
+
+
+def download(server, fmt):
+    written = []
+    abr_stream = ServerAbrStream(
+        fmt.stream(server.url), lambda chunk, bytes_remaining: written.append(chunk),
+        SimpleNamespace(youtube=server.youtube())
+    )
+    abr_stream.start()
+    return b''.join(written)
+
+
+def test_sabr_throughput(benchmark_report):
+    # 16 MiB in 64 KiB segments, ten segments per response like a real session
+    fmt = SyntheticFormat(251, 'audio/webm; codecs="opus"', 256, 64 * 1024)
+    with SabrTestServer([fmt], segments_per_response=10) as server:
+        assert download(server, fmt) == fmt.content
+        timings = []
+        for _ in range(3):
+            start = time.perf_counter()
+            download(server, fmt)
+            timings.append(time.perf_counter() - start)
+        requests = len(server.requests) // 4
+
+    best = min(timings)
+    benchmark_report['download'] = f'{len(fmt.content) / 2 ** 20:.0f} MiB in {requests} requests'
+    benchmark_report['time'] = f'{best * 1e3:.0f} ms'
+    benchmark_report['throughput'] = f'{len(fmt.content) / best / 2 ** 20:.0f} MiB/s'
+    assert requests == 26
@@ -0,0 +1,52 @@
+"""Memory benchmark for holding many :class:`Stream <Stream>` objects."""
+import copy
+import tracemalloc
+
+import pytest
+
+from pytubefix import Stream, extract
+from pytubefix.monostate import Monostate
+from tests.conftest import load_playback_file
+
+pytestmark = pytest.mark.benchmark
+
+STREAM_COUNT = 1000
+
+
+def _traced_size(build):
+    """Return the objects built by ``build`` and the bytes they allocated."""
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        objects = build()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return objects, after - before
+
+
+def test_stream_memory_per_thousand(benchmark_report):
+    playback = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    manifest = extract.apply_descrambler(playback['vid_info']['streamingData'])
+    # The manifest entries are already held by the video info, so they are
+    # allocated before measuring.
+    raw = [copy.deepcopy(manifest[i % len(manifest)]) for i in range(STREAM_COUNT)]
+    monostate = Monostate(on_progress=None, on_complete=None)
+
+    streams, size = _traced_size(
+        lambda: [Stream(s, monostate, po_token=None, video_playback_ustreamer_config=None) for s in raw]
+    )
+
+    # Derive what StreamQuery.filter and order_by usually look at
+    _, derived = _traced_size(
+        lambda: [
+            (s.resolution, s.abr, s.type, s.subtype, s.video_codec, s.audio_codec, s.is_dash)
+            for s in streams
+        ]
+    )
+
+    benchmark_report['streams'] = STREAM_COUNT
+    benchmark_report['constructed'] = f'{size / 1024:.1f} KiB'
+    benchmark_report['derived attributes'] = f'{derived / 1024:.1f} KiB'
+    # A __dict__ based Stream used roughly 2 KiB per instance.
+    assert size < STREAM_COUNT * 512
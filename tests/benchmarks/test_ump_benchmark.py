@@ -0,0 +1,61 @@
+"""Benchmark for parsing the UMP responses of SABR streams."""
+import pytest
+
+from pytubefix.sabr.core.UMP import UMP
+from pytubefix.sabr.core.chunked_data_buffer import ChunkedDataBuffer
+from pytubefix.sabr.core.server_abr_stream import PART
+from tests.benchmarks.conftest import best_of
+from tests.conftest import sabr_response
+
+pytestmark = pytest.mark.benchmark
+
+SEGMENTS = 256
+SEGMENT_SIZE = 16 * 1024
+READ_SIZE = 64 * 1024
+
+
+def _copying_parse(response):
+    """The previous implementation: the rest of the response is copied after every
+    part, and every part is turned into a list of ints before being decoded."""
+    media = []
+    remaining = bytes(response)
+    while remaining:
+        ump = UMP(ChunkedDataBuffer([remaining]))
+        part_type, offset = ump.read_varint(0)
+        part_size, offset = ump.read_varint(offset)
+        data = remaining[offset:offset + part_size]
+        remaining = remaining[offset + part_size:]
+        list(data)
+        if part_type == PART.MEDIA.value:
+            media.append(data[1:])
+    return b''.join(media)
+
+
+def _streaming_parse(chunks):
+    media = []
+
+    def handle_part(part):
+        if part['type'] == PART.MEDIA.value:
+            media.append(part['data'].slice(1, part['size']).to_bytes())
+        else:
+            part['data'].view()
+
+    ump = UMP(ChunkedDataBuffer())
+    for chunk in chunks:
+        ump.feed(chunk, handle_part)
+    return b''.join(media)
+
+
+def test_ump_parse(benchmark_report):
+    segments = [bytes([i % 256]) * SEGMENT_SIZE for i in range(SEGMENTS)]
+    response = sabr_response(segments)
+    chunks = [response[i:i + READ_SIZE] for i in range(0, len(response), READ_SIZE)]
+    assert _streaming_parse(chunks) == _copying_parse(response) == b''.join(segments)
+
+    copying = best_of(_copying_parse, response, repeat=3)
+    streaming = best_of(_streaming_parse, chunks, repeat=3)
+
+    size = len(response) / 1024 / 1024
+    benchmark_report['response size'] = f'{size:.1f} MiB'
+    benchmark_report['copy per part'] = f'{copying * 1e3:.1f} ms ({size / copying:.0f} MiB/s)'
+    benchmark_report['memoryview'] = f'{streaming * 1e3:.1f} ms ({size / streaming:.0f} MiB/s)'
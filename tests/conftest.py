@@ -6,6 +6,32 @@ import pytest
 from unittest import mock
 
 from pytubefix import YouTube
+from pytubefix.profiler import client_profiler
+from pytubefix.response_cache import response_cache
+from pytubefix.sabr.core.server_abr_stream import PART
+from pytubefix.sabr.video_streaming.format_initialization_metadata import FormatInitializationMetadata
+from pytubefix.sabr.video_streaming.media_header import MediaHeader
+from pytubefix.visitor_pool import visitor_data_pool
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        '--benchmarks', action='store_true', default=False,
+        help='Also run the benchmarks of tests/benchmarks, they are deselected by default.'
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line('markers', 'benchmark: a benchmark, only run with --benchmarks')
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('--benchmarks'):
+        return
+    deselected = [item for item in items if item.get_closest_marker('benchmark')]
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if not item.get_closest_marker('benchmark')]
 
 
 def load_playback_file(filename):
@@ -18,6 +44,68 @@ def load_playback_file(filename):
         return json.loads(content)
 
 
+# Format of the synthetic SABR responses
+FORMAT_ID = {'itag': 251, 'lastModified': 1700000000000000, 'xtags': None}
+
+
+def ump_varint(value):
+    """Encode an integer the way UMP part types and sizes are."""
+    if value < 128:
+        return bytes([value])
+    if value < 1 << 14:
+        return bytes([0x80 | (value & 0x3F), value >> 6])
+    if value < 1 << 21:
+        return bytes([0xC0 | (value & 0x1F)]) + (value >> 5).to_bytes(2, 'little')
+    if value < 1 << 28:
+        return bytes([0xE0 | (value & 0x0F)]) + (value >> 4).to_bytes(3, 'little')
+    return bytes([0xF0]) + value.to_bytes(4, 'little')
+
+
+def ump_part(part_type, payload):
+    return ump_varint(part_type.value) + ump_varint(len(payload)) + bytes(payload)
+
+
+def sabr_parts(segments, header_id=1, format_id=FORMAT_ID, mime_type='audio/webm; codecs="opus"',
+               first_sequence=1, sequence_count=None):
+    """Build the UMP parts of a format: its metadata followed by three parts per segment.
+
+    Segments last one second, `sequence_count` is the number of segments of the
+    whole format when the response only holds some of them.
+    """
+    sequence_count = sequence_count or len(segments)
+    metadata = FormatInitializationMetadata()
+    metadata.formatId = format_id
+    metadata.endSegmentNumber = sequence_count
+    metadata.mimeType = mime_type
+    metadata.durationMs = 1000 * sequence_count
+    parts = [ump_part(PART.FORMAT_INITIALIZATION_METADATA, FormatInitializationMetadata.encode(metadata).finish())]
+    for number, segment in enumerate(segments, start=first_sequence):
+        header = MediaHeader.encode({
+            'headerId': header_id, 'itag': format_id['itag'], 'lmt': format_id['lastModified'],
+            'sequenceNumber': number, 'startMs': 1000 * (number - 1), 'durationMs': 1000, 'formatId': format_id,
+            'contentLength': len(segment),
+        }).finish()
+        parts.append(ump_part(PART.MEDIA_HEADER, header))
+        parts.append(ump_part(PART.MEDIA, bytes([header_id]) + segment))
+        parts.append(ump_part(PART.MEDIA_END, bytes([header_id])))
+    return parts
+
+
+def sabr_response(segments, header_id=1):
+    """Build a UMP response with the format metadata followed by one part per segment."""
+    return b''.join(sabr_parts(segments, header_id))
+
+
+@pytest.fixture(autouse=True)
+def clear_shared_state():
+    """Keep the process-wide pools, caches and statistics from leaking between tests."""
+    for shared in (visitor_data_pool, client_profiler, response_cache):
+        shared.clear()
+    yield
+    for shared in (visitor_data_pool, client_profiler, response_cache):
+        shared.clear()
+
+
 @mock.patch('pytubefix.request.urlopen')
 def load_and_init_from_playback_file(filename, mock_urlopen):
     """Load a gzip json playback file and create YouTube instance."""
@@ -2,6 +2,7 @@ import datetime
 from unittest import mock
 
 from pytubefix import Playlist
+from pytubefix.helpers import DeferredGeneratorList
 
 
 @mock.patch("pytubefix.request.get")
@@ -318,3 +319,15 @@ def test_playlist_owner_url(request_get, playlist_long_html):
     request_get.return_value = playlist_long_html
     p = Playlist(url)
     assert p.owner_url == 'https://www.youtube.com/channel/UCs6nmQViDpUw0nuIx9c_WvA'
+
+
+@mock.patch("pytubefix.request.get")
+@mock.patch("pytubefix.contrib.playlist.YouTube")
+def test_lean_videos_are_not_kept(youtube, request_get, playlist_html):
+    url = "https://www.fakeurl.com/playlist?list=whatever"
+    request_get.return_value = playlist_html
+    playlist = Playlist(url, lean=True)
+    videos = playlist.videos
+    assert not isinstance(videos, DeferredGeneratorList)
+    assert len(list(videos)) == 12
+    assert all(call.kwargs['lean'] for call in youtube.call_args_list)
@@ -0,0 +1,238 @@
+"""A local stand-in for a googlevideo SABR server.
+
+:class:`SabrTestServer` answers the ``VideoPlaybackAbrRequest`` of a
+:class:`ServerAbrStream <pytubefix.sabr.core.server_abr_stream.ServerAbrStream>`
+with UMP responses built from synthetic formats: the metadata of the formats,
+an init segment, then the media segments following the player time of the
+request. Redirects, SABR errors, context updates and reload directives can be
+injected at given requests, to exercise the recovery of the client without a
+network connection.
+"""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from pytubefix.sabr.core.server_abr_stream import PART
+from pytubefix.sabr.proto import BinaryWriter
+from pytubefix.sabr.video_streaming.format_initialization_metadata import FormatInitializationMetadata
+from pytubefix.sabr.video_streaming.media_header import MediaHeader
+from pytubefix.sabr.video_streaming.next_request_policy import NextRequestPolicy
+from pytubefix.sabr.video_streaming.sabr_error import SabrError
+from pytubefix.sabr.video_streaming.sabr_redirect import SabrRedirect
+from pytubefix.sabr.video_streaming.video_playback_abr_request import VideoPlaybackAbrRequest
+from tests.conftest import ump_part
+
+# Events that can be injected instead of a media response
+REDIRECT = 'redirect'
+SABR_ERROR = 'sabr_error'
+CONTEXT_UPDATE = 'context_update'
+RELOAD = 'reload'
+
+# Type of the SABR context the server asks the client to send back
+CONTEXT_TYPE = 5
+
+
+class SyntheticFormat:
+    """A format served by :class:`SabrTestServer`, with deterministic segments."""
+
+    def __init__(self, itag: int, mime_type: str, segment_count: int, segment_size: int,
+                 segment_duration_ms: int = 1000, last_modified: int = 1700000000000000):
+        """
+        :param int itag:
+            Itag of the format.
+        :param str mime_type:
+            Mime type of the format, ``video`` ones are the main format of a joint session.
+        :param int segment_count:
+            Number of media segments.
+        :param int segment_size:
+            Size of every media segment, in bytes.
+        :param int segment_duration_ms:
+            (Optional) Duration of every media segment.
+        :param int last_modified:
+            (Optional) Last modification time of the format, part of its id.
+        """
+        self.itag = itag
+        self.mime_type = mime_type
+        self.segment_count = segment_count
+        self.segment_duration_ms = segment_duration_ms
+        self.format_id = {'itag': itag, 'lastModified': last_modified, 'xtags': None}
+        self.init_segment = f'init {itag}'.encode()
+        self.segments = [
+            (bytes([itag % 256, number % 256]) * (segment_size // 2 + 1))[:segment_size]
+            for number in range(1, segment_count + 1)
+        ]
+
+    @property
+    def duration_ms(self) -> int:
+        return self.segment_count * self.segment_duration_ms
+
+    @property
+    def content(self) -> bytes:
+        """What a complete download of the format writes."""
+        return self.init_segment + b''.join(self.segments)
+
+    def stream(self, url: str):
+        """Build the :class:`Stream <pytubefix.streams.Stream>` attributes a SABR session reads."""
+        return SimpleNamespace(
+            po_token=None, url=url, itag=self.itag, video_playback_ustreamer_config='Cg',
+            durationMs=str(self.duration_ms), filesize=len(self.content),
+            type=self.mime_type.split('/')[0], last_Modified=str(self.format_id['lastModified']),
+            xtags=None, resolution='1080p', is_drc=False,
+        )
+
+    def __repr__(self):
+        return f'<SyntheticFormat itag={self.itag} segments={self.segment_count}>'
+
+
+class SabrTestServer:
+    """Serves synthetic formats over UMP, on a local port."""
+
+    def __init__(self, formats: List[SyntheticFormat], segments_per_response: int = 5,
+                 events: Optional[Dict[int, str]] = None):
+        """
+        :param list formats:
+            The formats the server can serve, the requests select some of them.
+        :param int segments_per_response:
+            (Optional) Number of segments of every format in a media response.
+        :param dict events:
+            (Optional) Event returned instead of media, by number of the request
+            (starting at 0): :data:`REDIRECT`, :data:`SABR_ERROR`,
+            :data:`CONTEXT_UPDATE` or :data:`RELOAD`.
+        """
+        self.formats = {fmt.itag: fmt for fmt in formats}
+        self.segments_per_response = segments_per_response
+        self.events = dict(events or {})
+        # Path, player time and SABR context types of every request received
+        self.requests = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._handler())
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_address[1]}/videoplayback?id=1'
+
+    def youtube(self):
+        """Build the YouTube attributes a SABR session reads when it reloads the stream."""
+        return SimpleNamespace(
+            refresh_vid_info=lambda: None, server_abr_streaming_url=self.url, video_playback_ustreamer_config='Cg'
+        )
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers['Content-Length']))
+                response = server.respond(self.path, body)
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/vnd.yt-ump')
+                self.send_header('Content-Length', str(len(response)))
+                self.end_headers()
+                self.wfile.write(response)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def respond(self, path: str, body: bytes) -> bytes:
+        """Build the UMP response to a request."""
+        request = VideoPlaybackAbrRequest.decode(body)
+        player_time_ms = request.client_abr_state['playerTimeMs']
+        contexts = [ctx.get('type') for ctx in request.streamer_context.sabrContexts]
+        with self._lock:
+            number = len(self.requests)
+            self.requests.append((path, player_time_ms, contexts))
+            event = self.events.pop(number, None)
+
+        if event == REDIRECT:
+            response = ump_part(PART.SABR_REDIRECT, SabrRedirect.encode({
+                'url': self.url.replace('/videoplayback', '/redirected/videoplayback')
+            }).finish())
+        elif event == SABR_ERROR:
+            response = ump_part(PART.SABR_ERROR, SabrError.encode({'type': 'sabr.malformed_config', 'code': 3}).finish())
+        elif event == RELOAD:
+            response = ump_part(PART.RELOAD_PLAYER_RESPONSE, b'')
+        elif event == CONTEXT_UPDATE:
+            response = ump_part(PART.SABR_CONTEXT_UPDATE, self.context_update())
+        else:
+            selected = request.selected_audio_format_ids + request.selected_video_format_ids
+            initialized = {fmt['itag'] for fmt in request.selected_format_ids}
+            response = self.media_response(
+                [self.formats[fmt['itag']] for fmt in selected], initialized, player_time_ms, number
+            )
+        with self._lock:
+            self.bytes_sent += len(response)
+        return response
+
+    @staticmethod
+    def context_update() -> bytes:
+        """Encode a SABR context update the client has to send with its next requests."""
+        value = BinaryWriter()
+        field1 = value.uint32(10).fork()
+        field1.uint32(8).int64(1700000000000)
+        field1.uint32(16).int32(0)
+        value.join()
+        writer = BinaryWriter()
+        writer.uint32(8).int32(CONTEXT_TYPE)
+        writer.uint32(26).bytes(value.finish())
+        writer.uint32(32).bool(True)
+        writer.uint32(40).int32(1)
+        return writer.finish()
+
+    def media_response(self, formats: List[SyntheticFormat], initialized, player_time_ms: int, number: int) -> bytes:
+        """Encode the metadata, the init segment if needed and the segments following the player time."""
+        parts = [ump_part(PART.NEXT_REQUEST_POLICY, NextRequestPolicy.encode({
+            'playbackCookie': {'field1': number + 1}
+        }).finish())]
+        header_id = 0
+        for fmt in formats:
+            metadata = FormatInitializationMetadata()
+            metadata.formatId = fmt.format_id
+            metadata.endSegmentNumber = fmt.segment_count
+            metadata.mimeType = fmt.mime_type
+            metadata.durationMs = fmt.duration_ms
+            parts.append(ump_part(PART.FORMAT_INITIALIZATION_METADATA, FormatInitializationMetadata.encode(metadata).finish()))
+
+            first = player_time_ms // fmt.segment_duration_ms + 1
+            numbers = range(first, min(first + self.segments_per_response, fmt.segment_count + 1))
+            if fmt.itag not in initialized:
+                header_id += 1
+                parts += self.segment_parts(fmt, header_id, None, fmt.init_segment)
+            for sequence_number in numbers:
+                header_id += 1
+                parts += self.segment_parts(fmt, header_id, sequence_number, fmt.segments[sequence_number - 1])
+        return b''.join(parts)
+
+    @staticmethod
+    def segment_parts(fmt: SyntheticFormat, header_id: int, sequence_number: Optional[int], segment: bytes):
+        header = MediaHeader.encode({
+            'headerId': header_id, 'itag': fmt.itag, 'lmt': fmt.format_id['lastModified'],
+            'isInitSeg': sequence_number is None, 'sequenceNumber': sequence_number,
+            'startMs': ((sequence_number or 1) - 1) * fmt.segment_duration_ms,
+            'durationMs': fmt.segment_duration_ms if sequence_number else 0,
+            'formatId': fmt.format_id, 'contentLength': len(segment),
+        }).finish()
+        return [
+            ump_part(PART.MEDIA_HEADER, header),
+            ump_part(PART.MEDIA, bytes([header_id]) + segment),
+            ump_part(PART.MEDIA_END, bytes([header_id])),
+        ]
+
+    def __repr__(self):
+        return f'<SabrTestServer url={self.url} formats={list(self.formats)}>'
@@ -0,0 +1,90 @@
+"""Unit tests for the :module:`batch <batch>` module."""
+import threading
+from unittest import mock
+
+import pytest
+
+from pytubefix import BatchFetcher, BatchResult, YouTube
+from pytubefix.exceptions import RegexMatchError, VideoUnavailable
+from pytubefix.innertube import InnerTube, _default_clients
+
+
+def _fake_player(calls, unavailable=()):
+    lock = threading.Lock()
+
+    def player(self, video_id):
+        with lock:
+            calls.append((self.client_name, video_id))
+        if video_id in unavailable:
+            status = {'status': 'ERROR', 'reason': 'Video unavailable'}
+        else:
+            status = {'status': 'OK'}
+        return {
+            'responseContext': {'visitorData': 'shared-visitor-data'},
+            'playabilityStatus': status,
+            'videoDetails': {'videoId': video_id},
+        }
+    return player
+
+
+def test_batch_yields_a_result_per_video():
+    calls = []
+    video_ids = ['2lAe1cqCOXo', 'QRS8MkLhQmM', 'WXxV9g7lsFE', '9bZkp7q19f0']
+    with mock.patch.object(InnerTube, 'player', _fake_player(calls)):
+        results = list(YouTube.batch(video_ids, workers=3))
+
+    assert sorted(r.video_id for r in results) == sorted(video_ids)
+    assert all(r.ok for r in results)
+    for result in results:
+        assert result.youtube.vid_info['videoDetails']['videoId'] == result.video_id
+        assert result.youtube._visitor_data == 'shared-visitor-data'
+
+    # The visitorData is requested once for the whole batch
+    assert len([c for c in calls if c[0] == 'WEB']) == 1
+    assert len([c for c in calls if c[0] != 'WEB']) == len(video_ids)
+
+
+def test_batch_reports_failures_per_video():
+    calls = []
+    video_ids = ['2lAe1cqCOXo', 'QRS8MkLhQmM', 'not a video']
+    player = _fake_player(calls, unavailable={'QRS8MkLhQmM'})
+    with mock.patch.object(InnerTube, 'player', player):
+        results = {r.video_id: r for r in BatchFetcher(video_ids, workers=2)}
+
+    assert results['2lAe1cqCOXo'].ok
+    assert isinstance(results['QRS8MkLhQmM'].error, VideoUnavailable)
+    assert results['QRS8MkLhQmM'].youtube is None
+    assert isinstance(results['not a video'].error, RegexMatchError)
+
+
+def test_batch_consumes_input_lazily():
+    calls = []
+    consumed = []
+
+    def video_ids():
+        for i in range(100):
+            consumed.append(i)
+            yield f'{i:011d}'
+
+    with mock.patch.object(InnerTube, 'player', _fake_player(calls)):
+        batch = BatchFetcher(video_ids(), workers=2)
+        for _ in batch:
+            break
+
+    assert len(consumed) < 100
+
+
+def test_batch_invalid_workers():
+    with pytest.raises(ValueError):
+        BatchFetcher([], workers=0)
+
+
+def test_batch_result_repr():
+    assert repr(BatchResult('2lAe1cqCOXo')) == '<pytubefix.batch.BatchResult: video_id=2lAe1cqCOXo>'
+
+
+def test_innertube_context_is_not_shared():
+    innertube = InnerTube('WEB')
+    innertube.insert_visitor_data('visitor-data')
+    assert 'visitorData' not in _default_clients['WEB']['innertube_context']['context']['client']
+    assert 'visitorData' not in InnerTube('WEB').innertube_context['context']['client']
@@ -1,3 +1,9 @@
+import subprocess
+import sys
+import threading
+import time
+from unittest import mock
+
 import pytest
 
 from pytubefix import cipher
@@ -40,3 +46,65 @@ def test_get_throttling_function_name(base_js):
         assert code_fragment['raw_code'] in base_js_file
         func_name = cipher.get_throttling_function_name(base_js_file, 'https://example.com')
         assert func_name == code_fragment['nfunc_name']
+
+
+def test_cipher_calls_are_serialized():
+    running = []
+    overlapped = []
+
+    def call(args):
+        running.append(args)
+        overlapped.append(len(running) > 1)
+        time.sleep(0.01)
+        running.remove(args)
+        return args[-1][::-1]
+
+    with mock.patch('pytubefix.cipher.Cipher.__init__', return_value=None):
+        player = cipher.Cipher(js='', js_url='')
+    player._sig_lock = threading.Lock()
+    player._sig_cache = {}
+    player._sig_param_val = None
+    player.runner_sig = mock.Mock(call=call)
+
+    threads = [threading.Thread(target=player.get_sig, args=(f'sig{i}',)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlapped == [False] * 4
+    assert player.get_sig('sig0') == '0gis'
+
+
+@mock.patch.object(cipher, 'JSInterpreter')
+@mock.patch.object(cipher, 'NodeRunner', side_effect=lambda js: mock.Mock())
+@mock.patch.object(cipher.Cipher, 'get_nsig_function_name', return_value='n')
+@mock.patch.object(cipher.Cipher, 'get_sig_function_name', return_value='s')
+def test_get_cipher_keeps_alternating_players(*_):
+    cipher.clear_cipher_cache()
+    first = cipher.get_cipher('js', 'https://youtube.com/s/player/a/base.js')
+    second = cipher.get_cipher('js', 'https://youtube.com/s/player/b/base.js')
+    assert cipher.get_cipher('js', 'https://youtube.com/s/player/a/base.js') is first
+
+    # An evicted cipher still in use keeps its node processes
+    for i in range(cipher._cipher_cache_size):
+        cipher.get_cipher('js', f'https://youtube.com/s/player/{i}/base.js')
+    assert first.js_url not in cipher._cipher_cache
+    first.runner_sig.close.assert_not_called()
+
+    runner = first.runner_sig
+    del first
+    runner.close.assert_called_once()
+    cipher.clear_cipher_cache()
+    second.close()
+    second.runner_nsig.close.assert_called_once()
+
+
+def test_node_paths_are_resolved_on_first_access():
+    script = (
+        'import sys; from pytubefix.botGuard import bot_guard; from pytubefix.sig_nsig import node_runner; '
+        'loaded = "nodejs_wheel" in sys.modules; '
+        'print(loaded, bot_guard.NODE_PATH.startswith(bot_guard.NODE_DIR), node_runner.NODE_DIR == bot_guard.NODE_DIR)'
+    )
+    output = subprocess.check_output([sys.executable, '-c', script], text=True)
+    assert output.split() == ['False', 'True', 'True']
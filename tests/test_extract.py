@@ -5,6 +5,7 @@ import re
 
 from pytubefix import extract
 from pytubefix.exceptions import RegexMatchError
+from tests.conftest import load_playback_file
 
 
 def test_extract_video_id():
@@ -100,3 +101,45 @@ def test_initial_data_missing():
 def test_initial_data(stream_dict):
     initial_data = extract.initial_data(stream_dict)
     assert 'contents' in initial_data
+
+
+@pytest.mark.parametrize("filename", [
+    "yt-video-2lAe1cqCOXo-html.json.gz",
+    "yt-video-QRS8MkLhQmM-html.json.gz",
+    "yt-video-WXxV9g7lsFE-html.json.gz",
+])
+def test_page_objects_match_extract_functions(filename):
+    html = load_playback_file(filename)['watch_html']
+    page_objects = extract.PageObjects(html)
+    assert page_objects.initial_data == extract.initial_data(html)
+    assert page_objects.initial_player_response == extract.initial_player_response(html)
+    assert page_objects.ytplayer_config == extract.get_ytplayer_config(html)
+    assert page_objects.ytcfg == extract.get_ytcfg(html)
+    assert page_objects.js_url == extract.js_url(html)
+
+
+def test_page_objects_ytcfg_precedence():
+    html = (
+        '<script>ytcfg.set({"STS": 1, "HL": "en"});</script>'
+        '<script>var ytcfg = {"STS": 2, "GL": "US"};</script>'
+    )
+    expected = {'STS': 1, 'HL': 'en', 'GL': 'US'}
+    assert extract.get_ytcfg(html) == expected
+    assert extract.PageObjects(html).ytcfg == expected
+
+
+def test_page_objects_are_cached(stream_dict):
+    page_objects = extract.PageObjects(stream_dict)
+    assert page_objects.initial_data is page_objects.initial_data
+
+
+def test_page_objects_missing():
+    page_objects = extract.PageObjects('')
+    with pytest.raises(RegexMatchError):
+        page_objects.initial_data
+    with pytest.raises(RegexMatchError):
+        page_objects.initial_player_response
+    with pytest.raises(RegexMatchError):
+        page_objects.ytcfg
+    with pytest.raises(RegexMatchError):
+        page_objects.js_url
@@ -0,0 +1,16 @@
+"""Unit tests for the public names of the :module:`pytubefix` package."""
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize('imports', [
+    'import pytubefix.info; from pytubefix import info',
+    'from pytubefix import info; import pytubefix.info',
+])
+def test_info_is_the_function_in_any_import_order(imports):
+    # A fresh interpreter, as the import order only matters on the first import
+    script = f'{imports}; import pytubefix; print(callable(info), callable(pytubefix.info))'
+    output = subprocess.check_output([sys.executable, '-c', script], text=True)
+    assert output.split() == ['True', 'True']
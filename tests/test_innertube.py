@@ -0,0 +1,94 @@
+"""Unit tests for the :module:`innertube <innertube>` module."""
+import json
+import threading
+from unittest import mock
+
+import pytest
+
+from pytubefix.innertube import InnerTube, _default_clients
+
+
+def _sent_body(execute_request):
+    return json.loads(execute_request.call_args[1]['data'])
+
+
+@pytest.fixture
+def execute_request():
+    with mock.patch('pytubefix.request._execute_request') as execute_request:
+        execute_request.return_value.read.return_value = b'{}'
+        yield execute_request
+
+
+def test_player_body(execute_request):
+    innertube = InnerTube('WEB', use_cache=False)
+    innertube.insert_visitor_data('visitor-data')
+    innertube.update_context({'playbackContext': {'contentPlaybackContext': {'signatureTimestamp': 1}}})
+    innertube.player('2lAe1cqCOXo')
+
+    expected_client = dict(_default_clients['WEB']['innertube_context']['context']['client'])
+    expected_client['visitorData'] = 'visitor-data'
+    assert _sent_body(execute_request) == {
+        'context': {'client': expected_client},
+        'playbackContext': {'contentPlaybackContext': {'signatureTimestamp': 1}},
+        'videoId': '2lAe1cqCOXo',
+        'contentCheckOk': 'true',
+    }
+
+
+def test_request_fields_are_not_kept(execute_request):
+    innertube = InnerTube('WEB', use_cache=False)
+    innertube.browse(continuation='token')
+    assert _sent_body(execute_request)['continuation'] == 'token'
+    innertube.browse()
+    assert 'continuation' not in _sent_body(execute_request)
+
+
+def test_innertube_context_changes_are_sent(execute_request):
+    innertube = InnerTube('WEB', use_cache=False)
+    innertube.insert_visitor_data('visitor-data')
+    innertube.innertube_context['context']['client']['hl'] = 'pt'
+    innertube.player('2lAe1cqCOXo')
+    body = _sent_body(execute_request)
+    assert body['context']['client']['hl'] == 'pt'
+    assert body['context']['client']['visitorData'] == 'visitor-data'
+
+    # A complete body is sent as is
+    innertube._call_api(f'{innertube.base_url}/player', innertube.base_params, {'context': {}})
+    assert _sent_body(execute_request) == {'context': {}}
+
+
+def test_templates_are_not_modified(execute_request):
+    template = json.dumps(_default_clients['IOS']['innertube_context'])
+    innertube = InnerTube('IOS', use_cache=False)
+    innertube.insert_po_token(visitor_data='visitor-data', po_token='po-token')
+    innertube.player('2lAe1cqCOXo')
+    assert json.dumps(_default_clients['IOS']['innertube_context']) == template
+    assert 'visitorData' not in InnerTube('IOS').innertube_context['context']['client']
+
+
+def test_parallel_requests_do_not_leak():
+    sent = []
+
+    def execute_request(url, method, headers, data):
+        sent.append(json.loads(data))
+        response = mock.Mock()
+        response.read.return_value = b'{}'
+        return response
+
+    def worker(i):
+        innertube = InnerTube('WEB', use_cache=False)
+        innertube.insert_visitor_data(f'visitor-{i}')
+        for _ in range(20):
+            innertube.player(f'video-{i:05d}')
+
+    with mock.patch('pytubefix.request._execute_request', side_effect=execute_request):
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(sent) == 160
+    for body in sent:
+        i = int(body['videoId'][-5:])
+        assert body['context']['client']['visitorData'] == f'visitor-{i}'
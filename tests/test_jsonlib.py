@@ -0,0 +1,44 @@
+"""Unit tests for the :module:`jsonlib <jsonlib>` module."""
+import json
+from unittest import mock
+
+import pytest
+
+from pytubefix import jsonlib
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def backend(request):
+    """Run a test with orjson, when installed, and with the standard library."""
+    if request.param == 'json':
+        with mock.patch.object(jsonlib, 'orjson', None):
+            yield request.param
+    elif jsonlib.orjson is None:
+        pytest.skip('orjson is not installed')
+    else:
+        yield request.param
+
+
+def test_loads_str_and_bytes(backend):
+    document = '{"videoId": "2lAe1cqCOXo", "title": "Café", "views": 12}'
+    expected = {'videoId': '2lAe1cqCOXo', 'title': 'Café', 'views': 12}
+    assert jsonlib.loads(document) == expected
+    assert jsonlib.loads(document.encode('utf-8')) == expected
+    assert jsonlib.loads(memoryview(document.encode('utf-8'))) == expected
+
+
+def test_loads_invalid_document(backend):
+    with pytest.raises(jsonlib.JSONDecodeError):
+        jsonlib.loads(b'{"videoId": ')
+
+
+def test_dumps_round_trip(backend):
+    obj = {'context': {'client': {'clientName': 'WEB'}}, 'videoId': 'Café', 1: [True, None]}
+    assert json.loads(jsonlib.dumps_bytes(obj)) == json.loads(json.dumps(obj))
+    assert json.loads(jsonlib.dumps(obj)) == json.loads(json.dumps(obj))
+    assert isinstance(jsonlib.dumps_bytes(obj), bytes)
+    assert isinstance(jsonlib.dumps(obj), str)
+
+
+def test_dumps_large_integer(backend):
+    assert json.loads(jsonlib.dumps_bytes({'n': 2 ** 70})) == {'n': 2 ** 70}
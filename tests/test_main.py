@@ -1,10 +1,13 @@
+import time
 from unittest import mock
 
 import pytest
 
 import pytubefix
-from pytubefix import YouTube
-from pytubefix.exceptions import RegexMatchError
+from pytubefix import YouTube, extract
+from pytubefix.exceptions import RegexMatchError, VideoUnavailable
+from pytubefix.innertube import InnerTube
+from tests.conftest import load_playback_file
 
 
 @mock.patch("urllib.request.install_opener")
@@ -58,3 +61,107 @@ def test_channel_id(cipher_signature):
 
 def test_channel_url(cipher_signature):
     assert cipher_signature.channel_url == 'https://www.youtube.com/channel/UCBR8-60-B28hp2BmDPdntcQ'  # noqa:E501
+
+
+def _race_player(responses, delays=None):
+    def player(self, video_id):
+        time.sleep((delays or {}).get(self.client_name, 0))
+        return responses[self.client_name]
+    return player
+
+
+_playable = {
+    'responseContext': {'visitorData': 'visitor-data'},
+    'playabilityStatus': {'status': 'OK'},
+    'streamingData': {'adaptiveFormats': []},
+}
+_unplayable = {
+    'responseContext': {'visitorData': 'visitor-data'},
+    'playabilityStatus': {'status': 'UNPLAYABLE', 'reason': 'This video is not available'},
+}
+
+
+def test_race_clients_first_usable_response_wins():
+    responses = {'ANDROID_VR': _unplayable, 'IOS': _playable, 'ANDROID_MUSIC': _playable, 'WEB': _playable}
+    player = _race_player(responses, delays={'ANDROID_MUSIC': 0.5})
+    with mock.patch.object(InnerTube, 'player', player):
+        youtube = YouTube(
+            "https://www.youtube.com/watch?v=9bZkp7q19f0",
+            client='ANDROID_VR', race_clients=['ANDROID_MUSIC', 'IOS']
+        )
+        start = time.time()
+        assert youtube.vid_info is _playable
+        assert time.time() - start < 0.5
+    assert youtube.client == 'IOS'
+
+
+def test_race_clients_without_streams_reports_main_client():
+    responses = {'ANDROID_VR': _unplayable, 'IOS': _unplayable, 'WEB': _playable}
+    with mock.patch.object(InnerTube, 'player', _race_player(responses)):
+        youtube = YouTube(
+            "https://www.youtube.com/watch?v=9bZkp7q19f0",
+            client='ANDROID_VR', race_clients=['IOS']
+        )
+        assert youtube.vid_info is _unplayable
+        assert youtube.client == 'ANDROID_VR'
+        with pytest.raises(VideoUnavailable):
+            youtube.check_availability()
+
+
+@pytest.mark.parametrize(('delays', 'winner', 'po_token'), [
+    ({'ANDROID': 0.2}, 'ANDROID_VR', None),
+    ({'ANDROID_VR': 0.2}, 'ANDROID', 'bot-guard-token'),
+])
+def test_race_clients_keep_the_winners_po_token(delays, winner, po_token):
+    responses = {'ANDROID_VR': _playable, 'ANDROID': _playable, 'WEB': _playable}
+    with mock.patch.object(InnerTube, 'player', _race_player(responses, delays)):
+        youtube = YouTube(
+            "https://www.youtube.com/watch?v=9bZkp7q19f0",
+            client='ANDROID_VR', race_clients=['ANDROID']
+        )
+        youtube._pot = 'bot-guard-token'
+        youtube.vid_info
+        # The losing request finishes after the race, it must not change the poToken
+        time.sleep(0.3)
+    assert youtube.client == winner
+    assert youtube.po_token == po_token
+
+
+@mock.patch("pytubefix.request.get")
+def test_lean_keeps_only_what_is_extracted_from_the_watch_html(get):
+    pb = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    get.return_value = pb['watch_html']
+    youtube = YouTube(pb['url'], lean=True)
+
+    assert not youtube.age_restricted
+    assert youtube.js_url.endswith('/base.js')
+    assert set(youtube.initial_data) <= {'contents', 'playerOverlays', 'frameworkUpdates', 'responseContext'}
+    assert youtube.publish_date == extract.publish_date(pb['watch_html'])
+    assert youtube.metadata is not None
+    assert youtube.page_objects.js_url == youtube.js_url
+    assert youtube.page_objects.initial_data is youtube.initial_data
+    get.assert_called_once_with(url=youtube.watch_url)
+    assert youtube._watch_html is None
+    assert youtube.page_objects.html == ''
+
+
+@mock.patch("pytubefix.request.get")
+def test_lean_js_is_not_kept_by_the_video(get):
+    youtube = YouTube("https://www.youtube.com/watch?v=2lAe1cqCOXo", lean=True)
+    youtube._js_url = 'https://youtube.com/s/player/lean/base.js'
+    get.return_value = 'var lean;'
+    assert youtube.js == 'var lean;'
+    assert youtube._js is None
+    assert pytubefix.__js__ == 'var lean;'
+
+
+def test_lean_vid_info_is_pruned():
+    pb = load_playback_file("yt-video-2lAe1cqCOXo-html.json.gz")
+    vid_info = pb['vid_info']
+    with mock.patch.object(InnerTube, 'player', return_value=vid_info):
+        youtube = YouTube(pb['url'], client='ANDROID_VR', lean=True)
+        assert set(youtube.vid_info) == {'playabilityStatus', 'streamingData', 'videoDetails', 'playerConfig'}
+    assert list(youtube.vid_info['playerConfig']) == ['mediaCommonConfig']
+    assert youtube.video_playback_ustreamer_config
+    assert youtube.title == vid_info['videoDetails']['title']
+    assert youtube.length == int(vid_info['videoDetails']['lengthSeconds'])
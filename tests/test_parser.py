@@ -56,3 +56,25 @@ def test_parse_object_requiring_ast():
     assert result == {
         'foo': 'bar'
     }
+
+
+def test_parse_object_with_trailing_javascript():
+    test_html = 'var test = {"foo": {"bar": [1, 2]}};var other = {"baz": 1};'
+    result = parse_for_object(test_html, r'test\s*=\s*')
+    assert result == {'foo': {'bar': [1, 2]}}
+
+
+def test_parse_object_requiring_scanner_fallback():
+    test_html = "test = {'foo': 'bar'};</script>"
+    result = parse_for_object(test_html, r'test\s*=\s*')
+    assert result == {'foo': 'bar'}
+
+
+def test_parse_object_invalid_start_point():
+    with pytest.raises(HTMLParseError):
+        parse_for_object('test = function() {}', r'test\s*=\s*')
+
+
+def test_parse_object_at_end_of_html():
+    with pytest.raises(HTMLParseError):
+        parse_for_object('test = ', r'test\s*=\s*')
@@ -0,0 +1,162 @@
+"""Unit tests for the :module:`profiler <profiler>` module."""
+import math
+from unittest import mock
+
+from pytubefix import YouTube
+from pytubefix.innertube import InnerTube
+from pytubefix.profiler import ClientProfiler, ClientStats, client_profiler
+
+_playable = {'playabilityStatus': {'status': 'OK'}, 'streamingData': {}}
+_unplayable = {'playabilityStatus': {'status': 'UNPLAYABLE', 'reason': 'This video is not available'}}
+_private = {'playabilityStatus': {'status': 'ERROR', 'reason': 'This video is private'}}
+_login_required = {'playabilityStatus': {'status': 'LOGIN_REQUIRED', 'reason': 'Sign in to confirm your age'}}
+_without_streams = {'playabilityStatus': {'status': 'OK'}}
+
+
+def test_client_stats():
+    stats = ClientStats(requests=5, successes=3, unavailable=1, latency=2.5, deciphers=2,
+                        decipher_time=1.0, downloaded_bytes=1000, download_time=2.0)
+    assert stats.success_rate == 0.75
+    assert stats.mean_latency == 0.5
+    assert stats.mean_decipher_time == 0.5
+    assert stats.throughput == 500
+    assert ClientStats.from_dict(stats.to_dict()).to_dict() == stats.to_dict()
+
+
+def test_choose_default_without_samples():
+    profiler = ClientProfiler()
+    assert profiler.choose() == 'ANDROID_VR'
+
+
+def test_choose_avoids_broken_client():
+    profiler = ClientProfiler(min_samples=2)
+    for _ in range(2):
+        profiler.record_request('ANDROID_VR', 0.1, False)
+    assert profiler.cost('ANDROID_VR') == math.inf
+    chosen = profiler.choose()
+    assert chosen != 'ANDROID_VR'
+    # clients that don't need the js player or a poToken are tried first
+    assert not InnerTube(chosen).require_js_player
+    assert not InnerTube(chosen).require_po_token
+
+
+def test_choose_cheapest_measured_client():
+    profiler = ClientProfiler(min_samples=1)
+    profiler.record_request('IOS', 0.2, True)
+    profiler.record_request('TV', 0.2, True)
+    profiler.record_decipher('TV', 0.5)
+    assert profiler.rank(['TV', 'IOS']) == ['IOS', 'TV']
+    assert profiler.choose(['TV', 'IOS'], default='TV') == 'IOS'
+
+
+def test_record_player_response_counts_video_errors_as_unavailable():
+    profiler = ClientProfiler()
+    for response in (_private, _unplayable, _login_required):
+        profiler.record_player_response('IOS', response, 0.1)
+    profiler.record_player_response('IOS', _without_streams, 0.1)
+    profiler.record_player_response('IOS', _playable, 0.1)
+    stats = profiler.stats()['IOS']
+    assert stats.requests == 5
+    assert stats.unavailable == 3
+    assert stats.success_rate == 0.5
+
+
+def test_client_without_available_responses_is_broken():
+    profiler = ClientProfiler(min_samples=2, explore_every=2)
+    profiler.record_request('TV', 0.5, True)
+    profiler.record_request('TV', 0.5, True)
+    for _ in range(2):
+        profiler.record_player_response('IOS', _login_required, 0.1)
+    assert profiler.cost('IOS') == math.inf
+    # It is measured, so it is no longer explored
+    assert [profiler.choose(['TV', 'IOS'], default='TV') for _ in range(4)] == ['TV'] * 4
+
+
+def test_exploration_is_opt_in():
+    profiler = ClientProfiler(min_samples=1)
+    profiler.record_request('TV', 0.5, True)
+    assert {profiler.choose(['TV', 'IOS'], default='TV') for _ in range(30)} == {'TV'}
+
+
+def test_unmeasured_clients_rank_after_measured_ones():
+    profiler = ClientProfiler(min_samples=2)
+    for _ in range(2):
+        profiler.record_request('TV', 5.0, True)
+    profiler.record_request('IOS', 0.1, True)
+    assert profiler.cost('IOS') is None
+    assert profiler.rank(['ANDROID_VR', 'IOS', 'TV']) == ['TV', 'ANDROID_VR', 'IOS']
+    assert profiler.choose(['IOS', 'TV'], default='IOS') == 'TV'
+
+
+def test_choose_explores_unmeasured_clients():
+    profiler = ClientProfiler(min_samples=1, explore_every=3)
+    profiler.record_request('TV', 0.5, True)
+    chosen = [profiler.choose(['TV', 'IOS'], default='TV') for _ in range(6)]
+    assert chosen == ['TV', 'TV', 'IOS', 'TV', 'TV', 'IOS']
+
+    profiler.record_request('IOS', 1.0, True)
+    chosen = [profiler.choose(['TV', 'IOS'], default='TV') for _ in range(3)]
+    assert chosen == ['TV', 'TV', 'TV']
+
+
+def test_rank_uses_throughput():
+    profiler = ClientProfiler(min_samples=1, download_size=1000)
+    profiler.record_request('IOS', 0.1, True)
+    profiler.record_request('TV', 0.5, True)
+    profiler.record_download('IOS', 1000, 10.0)
+    profiler.record_download('TV', 1000, 1.0)
+    assert profiler.cost('IOS') == 0.1 + 10.0
+    assert profiler.rank(['IOS', 'TV']) == ['TV', 'IOS']
+
+
+def test_save_and_load(tmp_path):
+    path = str(tmp_path / 'profile.json')
+    profiler = ClientProfiler()
+    profiler.record_request('IOS', 0.5, True)
+    profiler.record_download('IOS', 1000, 1.0)
+    profiler.save(path)
+
+    loaded = ClientProfiler()
+    loaded.record_request('IOS', 0.5, False)
+    loaded.load(path)
+    stats = loaded.stats()['IOS']
+    assert stats.requests == 2
+    assert stats.successes == 1
+    assert stats.downloaded_bytes == 1000
+
+
+def test_persist_loads_saved_stats(tmp_path):
+    path = str(tmp_path / 'profile.json')
+    saved = ClientProfiler()
+    saved.record_request('IOS', 0.5, True)
+    saved.save(path)
+
+    profiler = ClientProfiler()
+    with mock.patch('atexit.register') as register:
+        profiler.persist(path)
+        profiler.persist(path)
+    register.assert_called_once()
+    assert profiler.stats()['IOS'].requests == 1
+
+
+def test_youtube_records_player_requests():
+    with mock.patch.object(InnerTube, 'player', return_value=dict(_playable, responseContext={'visitorData': 'v'})):
+        youtube = YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS')
+        youtube.vid_info
+    stats = client_profiler.stats()
+    assert stats['IOS'].requests == 1
+    assert stats['IOS'].successes == 1
+
+
+def test_youtube_persists_the_profile_on_request():
+    with mock.patch.object(client_profiler, 'persist') as persist:
+        YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS')
+        persist.assert_not_called()
+        YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS', persist_client_profile=True)
+        persist.assert_called_once_with()
+
+
+def test_youtube_uses_profiler_client():
+    with mock.patch.object(client_profiler, 'choose', return_value='IOS'):
+        assert YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo').client == 'IOS'
+    assert YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='TV').client == 'TV'
@@ -1,6 +1,10 @@
 """Unit tests for the :class:`StreamQuery <StreamQuery>` class."""
+from unittest import mock
+
 import pytest
 
+from pytubefix import Stream
+
 
 @pytest.mark.parametrize(
     ("test_input", "expected"),
@@ -201,3 +205,36 @@ def test_repr(cipher_signature):
         'res="360p" fps="24fps" vcodec="avc1.42001E" '
         'acodec="mp4a.40.2" progressive="True" type="video">]'
     )
+
+
+def test_filter_resolution_list(cipher_signature):
+    streams = cipher_signature.streams.filter(progressive=True, res=["360p", "720p"])
+    assert [s.itag for s in streams] == [18, 22]
+
+
+def test_filter_keeps_order(cipher_signature):
+    streams = cipher_signature.streams.order_by("resolution").desc().filter(progressive=True)
+    assert [s.itag for s in streams] == [22, 18, 17]
+
+
+def test_derived_queries_share_index(cipher_signature):
+    streams = cipher_signature.streams
+    assert cipher_signature.streams is streams
+    filtered = streams.filter(type="video").order_by("resolution")
+    assert filtered._index is streams._index
+
+
+def test_order_by_only_reads_the_sorted_streams(cipher_signature):
+    streams = cipher_signature.streams
+    for stream in streams:
+        stream._decipher = mock.Mock(return_value=f'https://example.com/{stream.itag}')
+    audio = streams.filter(only_audio=True)
+
+    with mock.patch.object(Stream, 'filesize', new_callable=mock.PropertyMock, return_value=1) as filesize:
+        audio.order_by('filesize')
+        audio.order_by('filesize').desc()
+        assert filesize.call_count == len(audio)
+
+    assert [s.itag for s in audio.order_by('url')] == [139, 140, 249, 250, 251]
+    deciphered = [s for s in streams if s._decipher is None]
+    assert deciphered == list(audio)
@@ -0,0 +1,127 @@
+"""Unit tests for the :module:`response_cache <response_cache>` module."""
+import json
+import time
+from unittest import mock
+
+from pytubefix import YouTube
+from pytubefix.innertube import InnerTube
+from pytubefix.profiler import client_profiler
+from pytubefix.response_cache import MemoryBackend, ResponseCache, SQLiteBackend, response_cache
+
+
+def test_memory_backend_expires():
+    backend = MemoryBackend()
+    backend.set('expired', b'1', time.time() - 1)
+    backend.set('valid', b'2', time.time() + 60)
+    assert backend.get('expired') is None
+    assert backend.get('valid') == b'2'
+
+
+def test_memory_backend_evicts_least_recently_used():
+    backend = MemoryBackend(max_size=2)
+    expires = time.time() + 60
+    backend.set('a', b'a', expires)
+    backend.set('b', b'b', expires)
+    backend.get('a')
+    backend.set('c', b'c', expires)
+    assert backend.get('b') is None
+    assert backend.get('a') == b'a'
+    assert backend.get('c') == b'c'
+
+
+def test_sqlite_backend(tmp_path):
+    path = str(tmp_path / 'responses.sqlite')
+    backend = SQLiteBackend(path)
+    backend.set('valid', b'response', time.time() + 60)
+    backend.set('expired', b'response', time.time() - 1)
+    backend.close()
+
+    reopened = SQLiteBackend(path)
+    assert reopened.get('valid') == b'response'
+    assert reopened.get('expired') is None
+    reopened.clear()
+    assert reopened.get('valid') is None
+    reopened.close()
+
+
+def test_response_cache_ttls_and_hit_rate():
+    cache = ResponseCache(ttls={'next': 60})
+    key = cache.key('https://www.youtube.com/youtubei/v1/next', 'WEB', b'{}')
+    assert cache.get('next', key) is None
+    cache.set('next', key, b'{}')
+    assert cache.get('next', key) == b'{}'
+    assert cache.hit_rate('next') == 0.5
+
+    # Endpoints without a ttl are not stored
+    cache.set('verify_age', key + 'x', b'{}')
+    assert cache.get('verify_age', key + 'x') is None
+    assert cache.hit_rate() == 1 / 3
+
+
+def _response(content):
+    response = mock.Mock()
+    response.read.return_value = json.dumps(content).encode('utf-8')
+    return response
+
+
+@mock.patch('pytubefix.request._execute_request')
+def test_innertube_player_is_cached(execute_request):
+    execute_request.side_effect = lambda *args, **kwargs: _response({'playabilityStatus': {'status': 'OK'}})
+    assert InnerTube('IOS').player('2lAe1cqCOXo') == {'playabilityStatus': {'status': 'OK'}}
+    assert InnerTube('IOS').player('2lAe1cqCOXo') == {'playabilityStatus': {'status': 'OK'}}
+    assert execute_request.call_count == 1
+    assert response_cache.hits == {'player': 1}
+
+    # Another video, or another client, is a different request
+    InnerTube('IOS').player('QRS8MkLhQmM')
+    InnerTube('ANDROID_VR').player('2lAe1cqCOXo')
+    assert execute_request.call_count == 3
+
+
+@mock.patch('pytubefix.request._execute_request')
+def test_innertube_unplayable_is_not_cached(execute_request):
+    execute_request.side_effect = lambda *args, **kwargs: _response({'playabilityStatus': {'status': 'LOGIN_REQUIRED'}})
+    InnerTube('IOS').player('2lAe1cqCOXo')
+    InnerTube('IOS').player('2lAe1cqCOXo')
+    assert execute_request.call_count == 2
+
+
+@mock.patch('pytubefix.request._execute_request')
+def test_innertube_without_cache(execute_request):
+    execute_request.side_effect = lambda *args, **kwargs: _response({'contents': {}})
+    InnerTube('WEB', use_cache=False).next('2lAe1cqCOXo')
+    InnerTube('WEB', use_cache=False).next('2lAe1cqCOXo')
+    assert execute_request.call_count == 2
+
+
+@mock.patch.object(YouTube, 'visitor_data', new_callable=mock.PropertyMock, return_value='visitor-data')
+@mock.patch('pytubefix.request._execute_request')
+def test_refresh_vid_info_bypasses_the_cache(execute_request, visitor_data):
+    urls = iter(['https://first.googlevideo.com', 'https://second.googlevideo.com'])
+    execute_request.side_effect = lambda *args, **kwargs: _response({
+        'playabilityStatus': {'status': 'OK'},
+        'streamingData': {'serverAbrStreamingUrl': next(urls)},
+    })
+    youtube = YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS')
+    assert youtube.vid_info['streamingData']['serverAbrStreamingUrl'] == 'https://first.googlevideo.com'
+    youtube.refresh_vid_info()
+    assert youtube.vid_info['streamingData']['serverAbrStreamingUrl'] == 'https://second.googlevideo.com'
+    assert execute_request.call_count == 2
+
+
+@mock.patch.object(YouTube, 'visitor_data', new_callable=mock.PropertyMock, return_value='visitor-data')
+@mock.patch('pytubefix.request._execute_request')
+def test_youtube_without_cache(execute_request, visitor_data):
+    execute_request.side_effect = lambda *args, **kwargs: _response({'playabilityStatus': {'status': 'OK'}})
+    YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS', use_cache=False).vid_info
+    YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS', use_cache=False).vid_info
+    assert execute_request.call_count == 2
+
+
+@mock.patch.object(YouTube, 'visitor_data', new_callable=mock.PropertyMock, return_value='visitor-data')
+@mock.patch('pytubefix.request._execute_request')
+def test_cache_hits_are_not_profiled(execute_request, visitor_data):
+    execute_request.side_effect = lambda *args, **kwargs: _response({'playabilityStatus': {'status': 'OK'}})
+    YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS').vid_info
+    YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', client='IOS').vid_info
+    assert client_profiler.stats()['IOS'].requests == 1
@@ -6,7 +6,7 @@ from unittest import mock
 from unittest.mock import MagicMock, Mock
 from urllib.error import HTTPError
 
-from pytubefix import request, Stream
+from pytubefix import exceptions, request, Stream
 
 
 @mock.patch("pytubefix.streams.request")
@@ -387,3 +387,63 @@ def test_segmented_only_catches_404(cipher_signature):
         with mock.patch("pytubefix.streams.open", mock.mock_open(), create=True):
             with pytest.raises(HTTPError):
                 stream.download()
+
+
+def test_only_sabr_streams_can_be_clipped(cipher_signature):
+    stream = cipher_signature.streams.filter(adaptive=True)[0]
+    with mock.patch('pytubefix.request.stream') as mock_stream:
+        with pytest.raises(ValueError):
+            stream.download(start_ms=1000, end_ms=5000)
+    mock_stream.assert_not_called()
+
+
+def test_clip_must_not_be_empty(cipher_signature):
+    stream = cipher_signature.streams.filter(adaptive=True)[0]
+    stream.is_sabr = True
+    with mock.patch.object(Stream, '_sabr_download') as sabr_download:
+        for start_ms, end_ms in ((5000, 5000), (5000, 1000), (None, 0)):
+            with pytest.raises(ValueError):
+                stream.download(start_ms=start_ms, end_ms=end_ms)
+    sabr_download.assert_not_called()
+
+
+@mock.patch("pytubefix.__main__.get_cipher")
+def test_streams_are_deciphered_on_first_url_access(get_cipher, cipher_signature):
+    cipher = get_cipher.return_value
+    cipher.get_sig.return_value = "deciphered_sig"
+    cipher.get_nsig.return_value = "deciphered_n"
+    cipher_signature.client = 'WEB'
+    cipher_signature._js = 'js'
+    cipher_signature._js_url = 'https://youtube.com/s/player/id/player_ias.vflset/en_US/base.js'
+
+    streams = cipher_signature.fmt_streams
+    get_cipher.assert_not_called()
+
+    url = streams[0].url
+    assert url == streams[0].url
+    get_cipher.assert_called_once_with(js='js', js_url=cipher_signature._js_url)
+
+
+def test_stream_without_url_is_a_live_stream(cipher_signature):
+    cipher_signature.client = 'WEB'
+    cipher_signature._fmt_streams = None
+    streaming_data = cipher_signature.vid_info['streamingData']
+    streaming_data['adaptiveFormats'][0].pop('url', None)
+    streaming_data['adaptiveFormats'][0].pop('signatureCipher', None)
+
+    with pytest.raises(exceptions.LiveStreamError):
+        cipher_signature.fmt_streams
+
+
+def test_stream_url_setter_skips_decipher(cipher_signature):
+    decipher = Mock()
+    stream = Stream(
+        stream=dict(cipher_signature.streaming_data['formats'][0], is_otf=False),
+        monostate=cipher_signature.stream_monostate,
+        po_token=None,
+        video_playback_ustreamer_config=None,
+        decipher=decipher
+    )
+    stream.url = 'https://example.com/videoplayback'
+    assert stream.url == 'https://example.com/videoplayback'
+    decipher.assert_not_called()
@@ -0,0 +1,102 @@
+"""Unit tests for the :module:`token_store <token_store>` module."""
+import json
+import os
+import threading
+import time
+from unittest import mock
+
+from pytubefix.innertube import InnerTube
+from pytubefix.token_store import TokenStore, token_store
+
+
+def test_token_store_is_shared_per_file(tmp_path):
+    path = str(tmp_path / 'tokens.json')
+    assert token_store(path) is token_store(path)
+    assert token_store(path) is not token_store(str(tmp_path / 'other.json'))
+
+
+def test_read_missing_file(tmp_path):
+    assert TokenStore(str(tmp_path / 'tokens.json')).read() == {}
+
+
+def test_write_and_read(tmp_path):
+    path = str(tmp_path / 'cache' / 'tokens.json')
+    store = TokenStore(path)
+    store.write({'access_token': 'token'})
+    assert store.read() == {'access_token': 'token'}
+    with open(path) as f:
+        assert json.load(f) == {'access_token': 'token'}
+    assert not [name for name in os.listdir(tmp_path / 'cache') if name.endswith('.tmp')]
+
+
+def test_read_only_when_changed(tmp_path):
+    path = tmp_path / 'tokens.json'
+    path.write_text(json.dumps({'access_token': 'first'}))
+    store = TokenStore(str(path))
+    assert store.read() == {'access_token': 'first'}
+
+    with mock.patch('builtins.open') as open_:
+        assert store.read() == {'access_token': 'first'}
+    open_.assert_not_called()
+
+    path.write_text(json.dumps({'access_token': 'second, written by another process'}))
+    assert store.read() == {'access_token': 'second, written by another process'}
+
+
+def test_lock_is_reentrant(tmp_path):
+    store = TokenStore(str(tmp_path / 'tokens.json'))
+    with store.lock():
+        with store.lock():
+            store.write({'access_token': 'token'})
+    assert store.read() == {'access_token': 'token'}
+
+
+def test_concurrent_writes(tmp_path):
+    store = TokenStore(str(tmp_path / 'tokens.json'))
+
+    def worker(i):
+        for _ in range(20):
+            store.write({'access_token': f'token-{i}'})
+            assert store.read()['access_token'].startswith('token-')
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _oauth_response(content):
+    response = mock.Mock()
+    response.read.return_value = json.dumps(content).encode('utf-8')
+    return response
+
+
+@mock.patch('pytubefix.request._execute_request')
+def test_innertube_shares_oauth_tokens(execute_request, tmp_path):
+    path = str(tmp_path / 'tokens.json')
+    token_store(path).write({
+        'access_token': 'valid', 'refresh_token': 'refresh', 'expires': time.time() + 3600,
+        'visitorData': None, 'po_token': None
+    })
+    first = InnerTube('TV', use_oauth=True, token_file=path)
+    second = InnerTube('TV', use_oauth=True, token_file=path)
+    assert first.access_token == second.access_token == 'valid'
+    execute_request.assert_not_called()
+
+
+@mock.patch('pytubefix.request._execute_request')
+def test_innertube_refreshes_before_expiry(execute_request, tmp_path):
+    path = str(tmp_path / 'tokens.json')
+    token_store(path).write({
+        'access_token': 'expiring', 'refresh_token': 'refresh', 'expires': time.time() + 60,
+        'visitorData': None, 'po_token': None
+    })
+    execute_request.return_value = _oauth_response({'access_token': 'refreshed', 'expires_in': 3600})
+
+    first = InnerTube('TV', use_oauth=True, token_file=path)
+    second = InnerTube('TV', use_oauth=True, token_file=path)
+    assert first.access_token == second.access_token == 'refreshed'
+    # The second instance picks the token refreshed by the first one
+    assert execute_request.call_count == 1
+    assert token_store(path).read()['access_token'] == 'refreshed'
@@ -0,0 +1,118 @@
+"""Unit tests for the :module:`visitor_pool <visitor_pool>` module."""
+import time
+from unittest import mock
+
+from pytubefix import YouTube
+from pytubefix.innertube import InnerTube
+from pytubefix.visitor_pool import VisitorDataPool, is_rejected, visitor_data_pool
+
+
+def test_pool_get_put():
+    pool = VisitorDataPool()
+    assert pool.get() is None
+    pool.put('first')
+    assert pool.get() == 'first'
+    pool.put('second')
+    assert {pool.get(), pool.get()} == {'first', 'second'}
+
+
+def test_pool_ttl():
+    pool = VisitorDataPool(ttl=60)
+    pool.put('expired', created=time.time() - 120)
+    pool.put('valid')
+    assert len(pool) == 1
+    assert pool.get() == 'valid'
+
+
+def test_pool_max_size():
+    pool = VisitorDataPool(max_size=2)
+    for visitor_data in ('a', 'b', 'c'):
+        pool.put(visitor_data)
+    assert len(pool) == 2
+    assert 'a' not in {pool.get(), pool.get()}
+
+
+def test_pool_reject():
+    pool = VisitorDataPool()
+    pool.put('rejected')
+    pool.reject('rejected')
+    assert pool.get() is None
+
+
+def test_pool_save_and_load(tmp_path):
+    path = str(tmp_path / 'visitor_data.txt')
+    pool = VisitorDataPool()
+    pool.put('saved')
+    pool.save(path)
+
+    seeded = VisitorDataPool()
+    seeded.load(path)
+    assert seeded.get() == 'saved'
+
+
+def test_pool_load_without_time(tmp_path):
+    path = tmp_path / 'visitor_data.txt'
+    path.write_text('seeded\n\n')
+    pool = VisitorDataPool(ttl=60)
+    pool.load(str(path))
+    assert pool.get() == 'seeded'
+
+
+def test_is_rejected():
+    assert is_rejected({'playabilityStatus': {
+        'status': 'LOGIN_REQUIRED', 'reason': 'Sign in to confirm you’re not a bot'
+    }})
+    assert not is_rejected({'playabilityStatus': {'status': 'OK'}})
+    assert not is_rejected({})
+
+
+def _player_response(visitor_data, status='OK', reason=None):
+    playability_status = {'status': status}
+    if reason:
+        playability_status['reason'] = reason
+    return {
+        'responseContext': {'visitorData': visitor_data},
+        'playabilityStatus': playability_status,
+    }
+
+
+def test_pool_is_full():
+    pool = VisitorDataPool(max_size=2)
+    pool.put('a')
+    assert not pool.is_full()
+    pool.put('b')
+    assert pool.is_full()
+
+
+def test_youtube_fills_the_pool_then_rotates():
+    responses = [_player_response(f'fetched{i}') for i in range(3)]
+    with mock.patch.object(visitor_data_pool, 'max_size', 2), \
+            mock.patch.object(InnerTube, 'player', side_effect=responses) as player:
+        fetched = [YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo').visitor_data for _ in range(2)]
+        reused = [YouTube('https://www.youtube.com/watch?v=QRS8MkLhQmM').visitor_data for _ in range(2)]
+    assert fetched == ['fetched0', 'fetched1']
+    assert sorted(reused) == fetched
+    assert player.call_count == 2
+
+
+def test_youtube_without_visitor_data_pool():
+    visitor_data_pool.put('pooled')
+    with mock.patch.object(InnerTube, 'player', return_value=_player_response('fetched')):
+        youtube = YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo', use_visitor_data_pool=False)
+        assert youtube.visitor_data == 'fetched'
+    assert visitor_data_pool.get() == 'pooled'
+
+
+def test_youtube_replaces_rejected_visitor_data():
+    visitor_data_pool.put('flagged')
+    responses = [
+        _player_response('flagged', 'LOGIN_REQUIRED', 'Sign in to confirm you’re not a bot'),
+        _player_response('fresh'),
+        _player_response('fresh'),
+    ]
+    with mock.patch.object(visitor_data_pool, 'max_size', 1), \
+            mock.patch.object(InnerTube, 'player', side_effect=responses):
+        youtube = YouTube('https://www.youtube.com/watch?v=2lAe1cqCOXo')
+        assert youtube.vid_info['playabilityStatus']['status'] == 'OK'
+    assert youtube.visitor_data == 'fresh'
+    assert visitor_data_pool.get() == 'fresh'